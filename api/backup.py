@@ -1,35 +1,203 @@
+import argparse
+import hashlib
+import json
 import os
 import shutil
+import stat
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def backup_files(source_dir='.'):
-    """Backup .py and .json files with timestamped copies"""
-    # Create backup directory name
-    timestamp = datetime.now().strftime("%d%m%Y_%H%M")
-    backup_dir = os.path.join(source_dir, f'backup_{timestamp}')
-    
-    # Create backup directory
-    os.makedirs(backup_dir, exist_ok=True)
-    
-    # Walk through directory tree
+BACKUP_EXTENSIONS = ('.py', '.json')
+STORE_DIR = 'backup_store'  # Content-addressed objects and the latest manifest for incremental backups
+
+
+def iter_backup_sources(source_dir='.'):
+    """Yield (src_path, rel_path) of files to back up, pruning backup directories before walking into them"""
     for root, dirs, files in os.walk(source_dir):
-        # Skip directories containing 'backup'
-        if 'backup' in root.lower():
-            continue
-            
+        dirs[:] = [d for d in dirs if 'backup' not in d.lower()]
         for file in files:
-            if file.endswith(('.py', '.json')):
+            if file.endswith(BACKUP_EXTENSIONS):
                 src_path = os.path.join(root, file)
-                
-                # Create relative path for destination
-                rel_path = os.path.relpath(root, source_dir)
-                dest_dir = os.path.join(backup_dir, rel_path)
-                os.makedirs(dest_dir, exist_ok=True)
-                
-                # Copy file with timestamp
-                dest_path = os.path.join(dest_dir, f"{os.path.splitext(file)[0]}_{timestamp}{os.path.splitext(file)[1]}")
-                shutil.copy2(src_path, dest_path)
-                print(f"Backed up: {src_path} -> {dest_path}")
+                yield src_path, os.path.relpath(src_path, source_dir)
+
+
+def timestamped_path(rel_path, timestamp):
+    """data/x.json -> data/x_<timestamp>.json"""
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}_{timestamp}{ext}"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(src, dest):
+    """Hard link src to dest, falling back to a copy where links are unsupported"""
+    if os.path.lexists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _store_object(src_path, object_path):
+    """Copy a file into the object store atomically and make it read-only (backups hard link to it)"""
+    if os.path.exists(object_path):
+        return
+    object_dir = os.path.dirname(object_path)
+    os.makedirs(object_dir, exist_ok=True)
+    # A private temp name per call, so concurrent writers of one object never share it
+    fd, tmp_path = tempfile.mkstemp(dir=object_dir, suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copy2(src_path, tmp_path)
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, object_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _write_archive(archive_path, members, manifest=None):
+    """Stream (src_path, arcname) members and an optional manifest into a single tar.gz"""
+    with tarfile.open(archive_path, 'w|gz') as tar:
+        for src_path, arcname in members:
+            tar.add(src_path, arcname=arcname)
+            print(f"Backed up: {src_path} -> {archive_path}:{arcname}")
+        if manifest is not None:
+            manifest_path = f"{archive_path}.manifest.json"
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            tar.add(manifest_path, arcname='manifest.json')
+            os.remove(manifest_path)
+
+
+def _full_backup(source_dir, timestamp, archive, workers):
+    sources = list(iter_backup_sources(source_dir))
+    if archive:
+        archive_path = os.path.join(source_dir, f'backup_{timestamp}.tar.gz')
+        _write_archive(archive_path, [(src, timestamped_path(rel, timestamp)) for src, rel in sources])
+        return archive_path
+
+    backup_dir = os.path.join(source_dir, f'backup_{timestamp}')
+    os.makedirs(backup_dir, exist_ok=True)
+
+    def copy(item):
+        src_path, rel_path = item
+        dest_path = os.path.join(backup_dir, timestamped_path(rel_path, timestamp))
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copy2(src_path, dest_path)
+        print(f"Backed up: {src_path} -> {dest_path}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(copy, sources))
+    return backup_dir
+
+
+def _incremental_backup(source_dir, timestamp, archive, workers):
+    store_dir = os.path.join(source_dir, STORE_DIR)
+    objects_dir = os.path.join(store_dir, 'objects')
+    latest_path = os.path.join(store_dir, 'manifest.json')
+    previous = _load_manifest(latest_path)
+
+    # Reuse the previous hash when size and mtime are unchanged, hash everything else in the pool
+    entries = {}
+    to_hash = []
+    for src_path, rel_path in iter_backup_sources(source_dir):
+        st = os.stat(src_path)
+        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        old = previous.get(rel_path)
+        if old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']:
+            entry['hash'] = old['hash']
+        else:
+            to_hash.append((src_path, rel_path))
+        entries[rel_path] = (src_path, entry)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (src_path, rel_path), digest in zip(to_hash, pool.map(lambda item: file_hash(item[0]), to_hash)):
+            entries[rel_path][1]['hash'] = digest
+
+        def object_path(rel_path):
+            digest = entries[rel_path][1]['hash']
+            return os.path.join(objects_dir, digest[:2], digest)
+
+        # Unchanged files are stored again if their object was pruned from the store
+        changed = [(src_path, rel_path) for rel_path, (src_path, entry) in entries.items()
+                   if previous.get(rel_path, {}).get('hash') != entry['hash']
+                   or not os.path.exists(object_path(rel_path))]
+
+        # Files with identical content share one object; store each digest once
+        unique = {entries[rel_path][1]['hash']: (src_path, rel_path) for src_path, rel_path in changed}
+        list(pool.map(lambda item: _store_object(item[0], object_path(item[1])), unique.values()))
+
+    manifest = {rel_path: entry for rel_path, (_, entry) in entries.items()}
+    if archive:
+        # Only changed files travel in the archive; the manifest resolves the rest from the store
+        output = os.path.join(source_dir, f'backup_{timestamp}.tar.gz')
+        _write_archive(output, [(src, timestamped_path(rel, timestamp)) for src, rel in changed], manifest)
+    else:
+        output = os.path.join(source_dir, f'backup_{timestamp}')
+        os.makedirs(output, exist_ok=True)
+        changed_paths = {rel_path for _, rel_path in changed}
+        for rel_path in manifest:
+            dest_path = os.path.join(output, timestamped_path(rel_path, timestamp))
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            link_or_copy(object_path(rel_path), dest_path)
+            if rel_path in changed_paths:
+                print(f"Backed up: {entries[rel_path][0]} -> {dest_path}")
+        with open(os.path.join(output, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+
+    os.makedirs(store_dir, exist_ok=True)
+    tmp_path = f"{latest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, latest_path)
+    print(f"Backup {output}: {len(changed)} changed of {len(manifest)} files")
+    return output
+
+
+def backup_files(source_dir='.', incremental=False, archive=False, workers=8):
+    """Backup .py and .json files with timestamped copies
+
+    Args:
+        source_dir: Tree to back up; directories with 'backup' in their name are skipped.
+        incremental: Deduplicate through a content-hash manifest and a shared object
+            store in backup_store/; unchanged files are hard links to stored objects,
+            and only new or modified files are hashed and copied.
+        archive: Write a single streaming backup_<timestamp>.tar.gz instead of a directory.
+        workers: Threads used for hashing and copying.
+
+    Returns:
+        Path of the backup directory or archive.
+    """
+    timestamp = datetime.now().strftime("%d%m%Y_%H%M")
+    if incremental:
+        return _incremental_backup(source_dir, timestamp, archive, workers)
+    return _full_backup(source_dir, timestamp, archive, workers)
+
 
 if __name__ == '__main__':
-    backup_files()
+    parser = argparse.ArgumentParser(description=backup_files.__doc__.splitlines()[0])
+    parser.add_argument('source_dir', nargs='?', default='.')
+    parser.add_argument('--incremental', action='store_true', help='deduplicate against the backup store')
+    parser.add_argument('--archive', action='store_true', help='write a single tar.gz')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    backup_files(args.source_dir, args.incremental, args.archive, args.workers)
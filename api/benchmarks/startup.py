@@ -0,0 +1,93 @@
+"""Startup benchmark: module import time and construct-to-first-tick latency.
+
+Each measurement runs in a fresh interpreter so import caches do not hide cold
+start cost. Run from the project root:
+
+    python -m api.benchmarks.startup --rows 10 --cols 10 --import-budget 300 --first-tick-budget 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'scipy': 'scipy' in sys.modules, 'tkinter': 'tkinter' in sys.modules}}))
+"""
+
+FIRST_TICK_SNIPPET = """
+import contextlib, io, json, time
+from api.core.swarm import Swarm
+with contextlib.redirect_stdout(io.StringIO()):
+    start = time.perf_counter()
+    swarm = Swarm(rows={rows}, cols={cols})
+    constructed = time.perf_counter()
+    swarm.update()
+    first_tick = time.perf_counter()
+print(json.dumps({{'construct': constructed - start, 'first_tick': first_tick - start}}))
+"""
+
+
+def _run(snippet, cwd):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run([sys.executable, '-c', snippet], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_import(module, repeat=3):
+    """Best-of-N cold import time of a module in seconds, plus which heavy modules it pulled in"""
+    runs = [_run(IMPORT_SNIPPET.format(module=module), PROJECT_ROOT) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r['seconds'])
+    return best
+
+
+def measure_first_tick(rows, cols, repeat=3):
+    """Best-of-N latency from Swarm construction to the end of its first update, in seconds"""
+    runs = []
+    for _ in range(repeat):
+        # Swarm persists patterns to ../ui relative to the working directory
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'ui'))
+            os.makedirs(os.path.join(tmp, 'core'))
+            runs.append(_run(FIRST_TICK_SNIPPET.format(rows=rows, cols=cols), os.path.join(tmp, 'core')))
+    return min(runs, key=lambda r: r['first_tick'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5)
+    parser.add_argument('--cols', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--import-budget', type=float, default=None, help='Max import time in ms')
+    parser.add_argument('--first-tick-budget', type=float, default=None, help='Max construct-to-first-tick time in ms')
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    for module in ('api.core.hopfield_control', 'api.core.swarm', 'api.ui.app'):
+        result = measure_import(module, args.repeat)
+        ms = result['seconds'] * 1e3
+        print(f"[BENCH] import {module:<28} {ms:8.1f} ms  scipy={result['scipy']} tkinter={result['tkinter']}")
+        if args.import_budget is not None and ms > args.import_budget:
+            print(f"[BENCH] import {module} exceeds budget of {args.import_budget} ms")
+            over_budget = True
+
+    result = measure_first_tick(args.rows, args.cols, args.repeat)
+    print(f"[BENCH] Swarm({args.rows}x{args.cols}) construct {result['construct'] * 1e3:8.1f} ms"
+          f"  first tick {result['first_tick'] * 1e3:8.1f} ms")
+    if args.first_tick_budget is not None and result['first_tick'] * 1e3 > args.first_tick_budget:
+        print(f"[BENCH] first tick exceeds budget of {args.first_tick_budget} ms")
+        over_budget = True
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import json
+import os
+import struct
+import numpy as np
+
+MAGIC = b'SWCKPT01'
+PREAMBLE = struct.Struct('<8sQ')  # magic, header length
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_checkpoint(path, kind, meta, arrays):
+    """
+    Write a checkpoint: a small JSON header followed by raw, 64-byte aligned arrays.
+
+    Args:
+        path: Output file, replaced atomically.
+        kind: Name of the checkpointed class, checked on restore.
+        meta: JSON-serializable scalars and settings.
+        arrays: Mapping of name to numpy array.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({'kind': kind, 'meta': meta, 'arrays': layout}).encode()
+    data_start = _align(PREAMBLE.size + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path, mode='c', kind=None):
+    """
+    Map a checkpoint without reading its arrays.
+
+    Args:
+        mode: np.memmap mode: 'c' (default) gives private copy-on-write arrays, so many
+            variants can be forked from one file; 'r' read-only; 'r+' writes through.
+        kind: Expected class name, or None to accept any.
+
+    Returns:
+        (meta, dict of name -> memory-mapped array)
+    """
+    with open(path, 'rb') as f:
+        magic, header_length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a swarm checkpoint")
+        header = json.loads(f.read(header_length))
+    if kind is not None and header['kind'] != kind:
+        raise ValueError(f"{path} holds a {header['kind']} checkpoint, expected {kind}")
+
+    data_start = _align(PREAMBLE.size + header_length)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if np.prod(shape) == 0:
+            arrays[name] = np.zeros(shape, dtype=spec['dtype'])
+            continue
+        arrays[name] = np.memmap(path, dtype=spec['dtype'], mode=mode, shape=shape,
+                                 offset=data_start + spec['offset'])
+    return header['meta'], arrays
+
+
+def prefixed(arrays, prefix):
+    """Namespace a component's arrays inside a larger checkpoint"""
+    return {f"{prefix}{name}": array for name, array in arrays.items()}
+
+
+def unprefixed(arrays, prefix):
+    """Inverse of prefixed: the arrays under prefix, with the prefix removed"""
+    return {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+NEURONS_PER_ROBOT = 4
+CHUNK_WEIGHTS = np.array([8, 4, 2, 1])  # [forward, backward, left, right] -> 4-bit code
+ALL_CHUNKS = ((np.arange(16)[:, None] >> np.array([3, 2, 1, 0])) & 1) * 2 - 1  # (16, 4) of -1/1
+
+
+def chunk_codes(state):
+    """Map every 4-neuron chunk of a state to its 4-bit code (positive neuron = 1)"""
+    chunks = np.asarray(state).reshape(-1, NEURONS_PER_ROBOT)
+    return (chunks > 0) @ CHUNK_WEIGHTS
+
+
+def rigid_body_lut():
+    """(linear, angular) commands per chunk for a robot with unit max speed.
+
+    Matches DifferentialRobot.set_velocity_from_chunk:
+    linear = 0.5 * (forward - backward), angular = 0.25 * (right - left).
+    """
+    forward, backward, left, right = ALL_CHUNKS.T
+    return np.stack([0.5 * (forward - backward), 0.25 * (right - left)], axis=1).astype(np.float64)
+
+
+def binary_lut(speed, angular_speed):
+    """(vx, vy) commands per chunk as used by SwarmHopfieldControl.get_velocity_from_binary"""
+    forward, backward, left, right = ALL_CHUNKS.T
+    vx = np.where(forward > backward, speed, -speed)
+    vy = np.where(left > right, angular_speed, -angular_speed)
+    return np.stack([vx, vy], axis=1).astype(np.float64)
+
+
+class ChunkDecoder:
+    """Decode whole states through a 16-entry command lookup table in one gather
+
+    Decoded command arrays for stored patterns are memoized per pattern index
+    until a different pattern set is passed in.
+    """
+
+    def __init__(self, lut):
+        self.lut = np.asarray(lut, dtype=np.float64)
+        if self.lut.shape[0] != 16:
+            raise ValueError(f"Lookup table must have 16 entries, got {self.lut.shape[0]}")
+        self._source = None
+        self._cache = {}
+
+    def decode(self, state):
+        """Return an (N, 2) array of commands, one row per robot"""
+        state = np.asarray(state)
+        if state.shape[-1] % NEURONS_PER_ROBOT != 0:
+            raise ValueError(f"State length {state.shape[-1]} is not a multiple of {NEURONS_PER_ROBOT}")
+        return self.lut[chunk_codes(state)]
+
+    def pattern_commands(self, patterns, pattern_idx):
+        """Memoized decode of patterns[pattern_idx]; the cache resets when patterns is replaced"""
+        if patterns is not self._source:
+            self._source = patterns
+            self._cache = {}
+        commands = self._cache.get(pattern_idx)
+        if commands is None:
+            commands = self.decode(patterns[pattern_idx])
+            commands.setflags(write=False)
+            self._cache[pattern_idx] = commands
+        return commands
+
+    def invalidate(self):
+        """Drop all memoized pattern commands"""
+        self._source = None
+        self._cache = {}
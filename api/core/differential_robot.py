@@ -43,7 +43,7 @@ class DifferentialRobot:
             target_velocity = target_velocity / speed * self.max_speed
             print(f"[DEBUG] Robot {self.robot_id} speed limited to {self.max_speed}")
 
-        self.velocity = target_velocity
+        self.velocity[:] = target_velocity  # In place: the swarm may hold a view of this array
         print(f"[DEBUG] Robot {self.robot_id} final velocity: {self.velocity}")
 
     def set_velocity_from_chunk(self, velocity_chunk, center_position, angular_velocity):
@@ -0,0 +1,183 @@
+import numpy as np
+from .hopfield_control import SwarmHopfieldControl
+from .profiling import StageProfiler
+from .chunk_decoder import ChunkDecoder, rigid_body_lut
+
+
+class SwarmFleet:
+    """Many independent swarms of equal size advanced in one vectorized call per tick
+
+    State lives in (M, N, 2) position and velocity tensors; every swarm has its
+    own current pattern index into a pattern set shared by the fleet (all
+    swarms use the same grid, so they share patterns and Hopfield weights).
+    Individual swarms are addressed through FleetSwarm handles.
+    """
+
+    def __init__(self, num_swarms, rows=5, cols=3, speed=0.2, angular_speed=0.1, backend='classic', beta=1.0):
+        """
+        Args:
+            num_swarms: Number of swarms M.
+            rows: Number of rows in each swarm's grid.
+            cols: Number of columns in each swarm's grid.
+            speed: Fixed speed of each swarm's center.
+            angular_speed: Angular speed for turning.
+            backend: Recall backend of the shared Hopfield control, 'classic' or 'modern'.
+            beta: Inverse temperature of the modern backend.
+        """
+        from .hopfield import create_grid_positions
+
+        self.num_swarms = num_swarms
+        self.rows = rows
+        self.cols = cols
+        self.speed = speed
+        self.angular_speed = angular_speed
+        self.tick = 0                                       # Fleet-wide updates
+        self.ticks = np.zeros(num_swarms, dtype=np.int64)   # Updates seen by each swarm
+        self.profiler = StageProfiler()
+        self.decoder = ChunkDecoder(rigid_body_lut())
+
+        grid_positions = create_grid_positions(rows, cols)
+        grid = np.array(grid_positions, dtype=np.float64).reshape(-1, 2)
+        self.num_robots = grid.shape[0]
+        self.positions = np.repeat(grid[None], num_swarms, axis=0)
+        self.velocities = np.zeros_like(self.positions)
+        self.max_speeds = np.ones((num_swarms, self.num_robots), dtype=np.float64)
+        self.current_pattern = np.zeros(num_swarms, dtype=np.intp)
+        self.recall_state = np.full(num_swarms, -1, dtype=np.intp)
+
+        self.hopfield = SwarmHopfieldControl(
+            robot_positions=grid_positions,
+            speed=speed,
+            angular_speed=angular_speed,
+            backend=backend,
+            beta=beta
+        )
+        self._source = None
+        self._commands = None
+        self._handles = [FleetSwarm(self, i) for i in range(num_swarms)]
+
+    def __len__(self):
+        return self.num_swarms
+
+    def __getitem__(self, index):
+        return self._handles[index]
+
+    def __iter__(self):
+        return iter(self._handles)
+
+    @property
+    def commands(self):
+        """(P, N, 2) unit (linear, angular) commands per stored pattern, rebuilt when the patterns change"""
+        patterns = self.hopfield.velocity_patterns
+        if patterns is not self._source:
+            self._source = patterns
+            self._commands = self.decoder.decode(patterns).reshape(len(patterns), self.num_robots, 2)
+            self._commands.setflags(write=False)
+        return self._commands
+
+    def set_pattern(self, swarm_idx, pattern_idx):
+        """Set the movement pattern of one swarm (or an index array of swarms)"""
+        pattern_idx = np.asarray(pattern_idx)
+        valid = (pattern_idx >= 0) & (pattern_idx < len(self.hopfield.velocity_patterns))
+        if not np.all(valid):
+            print(f"[ERROR] Invalid pattern index {pattern_idx[~valid] if pattern_idx.ndim else pattern_idx}, resetting to 0")
+            pattern_idx = np.where(valid, pattern_idx, 0)
+        self.current_pattern[swarm_idx] = pattern_idx
+
+    def update(self, dt: float = 0.05, swarms=None):
+        """
+        Advance all swarms (or only the given index array of swarms) by dt.
+
+        Matches Swarm.update applied to every swarm independently. Each advanced
+        swarm's entry in ticks is incremented; tick counts fleet-wide updates only.
+        """
+        index = slice(None) if swarms is None else np.asarray(swarms, dtype=np.intp)
+        with self.profiler.stage('pattern_lookup'):
+            commands = self.commands[self.current_pattern[index]]
+
+        with self.profiler.stage('velocity_mapping'):
+            positions = self.positions[index]
+            max_speeds = self.max_speeds[index]
+            linear_speed = commands[..., 0] * max_speeds
+            angular_speed = commands[..., 1] * max_speeds
+            r = positions - positions.mean(axis=1, keepdims=True)
+            velocities = np.empty_like(positions)
+            velocities[..., 0] = linear_speed - angular_speed * r[..., 1]
+            velocities[..., 1] = angular_speed * r[..., 0]
+
+            # Speed limiting
+            speed = np.linalg.norm(velocities, axis=2)
+            scale = np.minimum(1.0, max_speeds / np.where(speed > 0, speed, 1.0))
+            velocities *= scale[..., None]
+
+        with self.profiler.stage('integration'):
+            self.velocities[index] = velocities
+            self.positions[index] = positions + velocities * dt
+
+        self.ticks[index] += 1
+        if swarms is None:
+            self.tick += 1
+
+    def recall_pattern(self, swarm_idx, input_pattern, max_iter=10):
+        """Recall through the shared Hopfield control and record the match for one swarm"""
+        with self.profiler.stage('recall'):
+            recalled = self.hopfield.recall_pattern(input_pattern, max_iter)
+        self.recall_state[swarm_idx], _ = self.hopfield.pattern_index.best(recalled)
+        return recalled
+
+    def stats(self):
+        """Per-stage timing histograms (count, total, mean, p50, p99, max in seconds)"""
+        return self.profiler.stats()
+
+
+class FleetSwarm:
+    """Swarm-like handle onto one swarm of a SwarmFleet; positions and velocities are views"""
+
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+        self.rows = fleet.rows
+        self.cols = fleet.cols
+        self.speed = fleet.speed
+        self.angular_speed = fleet.angular_speed
+        self.hopfield = fleet.hopfield
+
+    @property
+    def positions(self):
+        return self.fleet.positions[self.index]
+
+    @property
+    def velocities(self):
+        return self.fleet.velocities[self.index]
+
+    @property
+    def current_pattern(self):
+        return int(self.fleet.current_pattern[self.index])
+
+    @property
+    def recall_state(self):
+        return int(self.fleet.recall_state[self.index])
+
+    @property
+    def tick(self):
+        return int(self.fleet.ticks[self.index])
+
+    def set_pattern(self, pattern_idx: int):
+        """Set movement pattern (0 for left turn, 1 for right turn)"""
+        self.fleet.set_pattern(self.index, pattern_idx)
+
+    def update(self, dt: float = 0.05):
+        """Advance only this swarm; prefer SwarmFleet.update to advance all of them at once"""
+        self.fleet.update(dt, swarms=[self.index])
+
+    def get_positions(self) -> np.ndarray:
+        """Get current positions of all robots"""
+        return self.positions.copy()
+
+    def get_velocities(self) -> np.ndarray:
+        """Get current velocities of all robots"""
+        return self.velocities.copy()
+
+    def recall_pattern(self, input_pattern, max_iter=10):
+        """Recall closest stored pattern using the fleet's Hopfield network"""
+        return self.fleet.recall_pattern(self.index, input_pattern, max_iter)
@@ -1,38 +1,103 @@
+import os
 import numpy as np
+from .async_engine import AsyncRecallEngine
+from .streaming_trainer import HebbianAccumulator
+from .checkpoint import write_checkpoint, read_checkpoint
+from .recall_cache import RecallCache, probe_key
+from .recall_sharding import ShardedRecallMixin
 
 
-class HopfieldNetwork:
+class HopfieldNetwork(ShardedRecallMixin):
     def __init__(self, num_neurons, pattern_size=None):
         self.num_neurons = num_neurons
-        self.weights = np.zeros((num_neurons, num_neurons))
         self.pattern_size = pattern_size
+        self.recall_shards = 0  # Worker processes for recall, 0 for single-process
+        self._recall_engine = None
+        self.recall_cache = None  # Opt-in RecallCache, see use_recall_cache
+        self.weights = np.zeros((num_neurons, num_neurons))
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        # Assignment (including +=, -=, ...) drops the sharded engine and cached recalls
+        self._weights = weights
+        self._close_recall_engine()
+
+    def use_sharded_recall(self, num_shards=None):
+        """
+        Split recall across worker processes that share the weight matrix.
+        The engine snapshots the weights; assigning them restarts it, but call this again
+        after element edits like `network.weights[i, j] = w`.
+
+        Args:
+            num_shards: Number of worker processes, None for the CPU count, 0 to disable.
+        """
+        self._set_recall_shards(num_shards)
+
+    def use_recall_cache(self, maxsize=256):
+        """
+        Memoize recall() results in a bounded LRU keyed on the bit-packed probe and step count.
+        Training or assigning the weights (including augmented assignment such as
+        `network.weights += delta`) clears it. Element edits like `network.weights[i, j] = w`
+        bypass that, so follow them with `network.recall_cache.invalidate()`.
+
+        Args:
+            maxsize: Number of cached probes, 0 or None to disable.
+        """
+        self.recall_cache = RecallCache(maxsize) if maxsize else None
 
     def train(self, patterns):
         """
         Train the Hopfield network using the Hebbian learning rule.
         Patterns are now represented using -1 and 1.
         """
-        if not patterns:
+        if len(patterns) == 0:
             return
 
-        # Ensure pattern size is set
-        if self.pattern_size is None:
-            self.pattern_size = len(patterns[0])
+        accumulator = HebbianAccumulator(self.num_neurons, self.pattern_size)
+        accumulator.update(patterns)
+        self._add_weights(accumulator)
+
+    def train_stream(self, source, chunk_size=4096, checkpoint=None, checkpoint_every=None):
+        """
+        Train from a pattern stream in bounded memory: an iterator of patterns or chunks,
+        a 2D array, or a .npy/.npz file (see iter_pattern_chunks).
 
-        # Check if all patterns have the same size
-        for p in patterns:
-            if len(p) != self.pattern_size:
-                raise ValueError(f"All patterns must have {self.pattern_size} elements. Got {len(p)}")
+        Args:
+            chunk_size: Patterns per Pᵀ·P product.
+            checkpoint: Accumulator checkpoint path; when it exists, training resumes from it
+                and skips the patterns it already holds.
+            checkpoint_every: Save the checkpoint every this many chunks.
+
+        Returns:
+            The HebbianAccumulator holding this call's contribution to the weights.
+        """
+        if checkpoint and os.path.exists(checkpoint):
+            accumulator = HebbianAccumulator.load(checkpoint)
+            if accumulator.num_neurons != self.num_neurons:
+                raise ValueError(f"Checkpoint is for {accumulator.num_neurons} neurons, network has {self.num_neurons}")
+            print(f"[INFO] Resuming training after {accumulator.count} patterns")
+        else:
+            accumulator = HebbianAccumulator(self.num_neurons, self.pattern_size)
+        accumulator.update(source, chunk_size, skip=accumulator.count,
+                           checkpoint=checkpoint, checkpoint_every=checkpoint_every)
+        self._add_weights(accumulator)
+        return accumulator
+
+    def _add_weights(self, accumulator):
+        if self.pattern_size is None:
+            self.pattern_size = accumulator.pattern_size
 
         # Initialize weights matrix based on num_neurons
         if self.weights.shape != (self.num_neurons, self.num_neurons):
             self.weights = np.zeros((self.num_neurons, self.num_neurons))
 
-        # Hebbian learning rule with -1 and 1 representation
-        for p in patterns:
-            p_resized = np.pad(p, (0, self.num_neurons - self.pattern_size), 'constant', constant_values=-1)
-            self.weights += np.outer(p_resized, p_resized)
+        self.weights += accumulator.gram
         np.fill_diagonal(self.weights, 0)
+        self._close_recall_engine()
 
     def recall(self, input_pattern, steps=5):
         """
@@ -43,10 +108,49 @@ class HopfieldNetwork:
         if len(input_pattern) < self.num_neurons:
             input_pattern = np.pad(input_pattern, (0, self.num_neurons - len(input_pattern)), 'constant', constant_values=-1)
 
+        if self.recall_cache is not None:
+            result = self.recall_cache.lookup(probe_key(input_pattern, steps), (self.weights,),
+                                              lambda: np.array(self._recall(input_pattern, steps)))
+            return result.copy()
+        return self._recall(input_pattern, steps)
+
+    def _recall(self, input_pattern, steps):
+        if self.recall_shards:
+            return self._sharded_engine(self.weights).recall(input_pattern, steps)[:self.pattern_size]
+
         for _ in range(steps):
             input_pattern = np.sign(self.weights @ input_pattern)
         return input_pattern[:self.pattern_size]
 
+    def recall_async(self, input_pattern, max_flips=None, order='greedy'):
+        """
+        Recall with asynchronous single-neuron updates, flipping only unstable neurons.
+
+        Returns:
+            The settled pattern and whether it reached a stable state.
+        """
+        if len(input_pattern) < self.num_neurons:
+            input_pattern = np.pad(input_pattern, (0, self.num_neurons - len(input_pattern)), 'constant', constant_values=-1)
+
+        state, _, converged = AsyncRecallEngine(self.weights, order=order).run(input_pattern, max_flips)
+        return state[:self.pattern_size], converged
+
+
+    def checkpoint(self, path):
+        """Save the trained weights to a memory-mappable checkpoint"""
+        meta = {'num_neurons': self.num_neurons, 'pattern_size': self.pattern_size,
+                'recall_shards': self.recall_shards}
+        write_checkpoint(path, type(self).__name__, meta, {'weights': self.weights})
+
+    @classmethod
+    def restore(cls, path, mode='c'):
+        """Restore from checkpoint(); the weights stay memory-mapped copy-on-write by default"""
+        meta, arrays = read_checkpoint(path, mode, kind=cls.__name__)
+        network = cls(meta['num_neurons'], meta['pattern_size'])
+        network.weights = arrays['weights']
+        network.recall_shards = meta['recall_shards']
+        return network
+
 
 def create_grid_positions(rows=5, cols=3):
     return [(2 * i - rows + 1, 2 * j - cols + 1)
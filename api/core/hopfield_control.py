@@ -1,11 +1,29 @@
 import numpy as np
-from scipy.special import expit
+from .pattern_index import PatternIndex
+from .chunk_decoder import ChunkDecoder, binary_lut
+from .modern_hopfield import ModernHopfieldNetwork
+from .async_engine import AsyncRecallEngine
+from .tiled_weights import TiledWeights
+from .checkpoint import write_checkpoint, read_checkpoint
+from .recall_cache import RecallCache, probe_key
+from .recall_sharding import ShardedRecallMixin
 
 
-class SwarmHopfieldControl:
+class SwarmHopfieldControl(ShardedRecallMixin):
     """Enhanced Hopfield network integration for swarm control with angular velocity encoding"""
 
-    def __init__(self, robot_positions, speed=0.2, angular_speed=0.1):
+    def __init__(self, robot_positions, speed=0.2, angular_speed=0.1, backend='classic', beta=1.0):
+        """
+        Args:
+            robot_positions: Initial (x, y) position of every robot.
+            speed: Linear speed used when decoding patterns.
+            angular_speed: Angular speed used when decoding patterns.
+            backend: 'classic' sign dynamics over Hebbian weights, or 'modern'
+                softmax attention over the stored patterns.
+            beta: Inverse temperature of the modern backend.
+        """
+        if backend not in ('classic', 'modern'):
+            raise ValueError(f"Unknown recall backend {backend}, expected 'classic' or 'modern'")
         self.robot_positions = np.array(robot_positions)
         self.num_robots = len(robot_positions)
         print(f"[INIT] Creating Hopfield control with {self.num_robots} robots")
@@ -13,6 +31,17 @@ class SwarmHopfieldControl:
         print(f"[DEBUG] Using speed={speed}, angular_speed={angular_speed}")
         self.speed = speed
         self.angular_speed = angular_speed
+        self.backend = backend
+        self.beta = beta
+        self.last_attention = None
+        self._pattern_index = None
+        self._hopfield_weights = None
+        self.recall_shards = 0  # Worker processes for classic recall, 0 for single-process
+        self._recall_engine = None
+        self.connectivity = None  # {'radius': r} or {'k': k} for sparse CSR weights, None for fully connected
+        self.tiled_weights = False  # Factor tiled per-robot motifs instead of storing dense weights
+        self.recall_cache = None  # Opt-in RecallCache, see use_recall_cache
+        self.velocity_decoder = ChunkDecoder(binary_lut(speed, angular_speed))
         self._initialize_patterns()
 
     def _initialize_patterns(self):
@@ -30,7 +59,87 @@ class SwarmHopfieldControl:
         print("[DEBUG] Left turn pattern:", self.encoded_patterns[0])
         print("[DEBUG] Right turn pattern:", self.encoded_patterns[1])
 
-        self.hopfield_weights = self.train_hopfield_network()
+        self.hopfield_weights = None  # Trained lazily on first use
+
+    @property
+    def hopfield_weights(self):
+        """Hebbian weights, trained on first use after the patterns change"""
+        if self._hopfield_weights is None:
+            self._hopfield_weights = self.train_hopfield_network()
+        return self._hopfield_weights
+
+    @hopfield_weights.setter
+    def hopfield_weights(self, weights):
+        self._hopfield_weights = weights
+        self._close_recall_engine()
+
+    def use_sharded_recall(self, num_shards=None):
+        """
+        Run classic recall across worker processes sharing the weights.
+
+        Args:
+            num_shards: Number of worker processes, None for the CPU count, 0 to disable.
+        """
+        self._set_recall_shards(num_shards)
+        if self.recall_shards and (self.connectivity is not None or self.tiled_weights):
+            print("[INFO] Sharded recall uses dense weights, disabling structured weights")
+            self.connectivity = None
+            self.tiled_weights = False
+            self.hopfield_weights = None
+
+    def use_sparse_weights(self, radius=None, k=None):
+        """
+        Connect each robot's neurons only to robots within `radius` grid steps or to its
+        `k` nearest robots. Weights are stored as a CSR matrix and recall uses sparse
+        matrix-vector products, so memory and recall cost grow linearly with the swarm.
+        Pass neither argument to go back to full connectivity.
+        """
+        if radius is None and k is None:
+            self.connectivity = None
+        elif radius is not None and k is not None:
+            raise ValueError("Give exactly one of radius or k")
+        else:
+            self.connectivity = {'radius': radius} if radius is not None else {'k': k}
+            self.recall_shards = 0  # The sharded engine needs dense weights
+            self.tiled_weights = False
+        self.hopfield_weights = None  # Retrained on first use
+
+    def use_tiled_weights(self, enabled=True):
+        """
+        Store the weights of patterns built from a per-robot motif (as generate_velocity_patterns
+        does) as motif blocks plus robot couplings, O(N) instead of O(N²), and recall through
+        structured products. Falls back to dense weights if the patterns are not tiled.
+        """
+        self.tiled_weights = enabled
+        if enabled:
+            self.connectivity = None
+            self.recall_shards = 0  # The sharded engine needs dense weights
+        self.hopfield_weights = None  # Retrained on first use
+
+    def use_recall_cache(self, maxsize=256):
+        """
+        Memoize recall results (recall_pattern and everything built on it, such as
+        infer_direction) in a bounded LRU keyed on the bit-packed probe and settings.
+        Entries are dropped whenever the weights or encoded patterns change.
+
+        Args:
+            maxsize: Number of cached probes, 0 or None to disable.
+        """
+        self.recall_cache = RecallCache(maxsize) if maxsize else None
+
+    @property
+    def recall_engine(self):
+        """Sharded recall engine over the current weights, started on first use"""
+        if not self.recall_shards:
+            return None
+        return self._sharded_engine(self.hopfield_weights)
+
+    @property
+    def pattern_index(self):
+        """Nearest-pattern index over encoded_patterns, rebuilt when they are replaced"""
+        if self._pattern_index is None or self._pattern_index.source is not self.encoded_patterns:
+            self._pattern_index = PatternIndex(self.encoded_patterns)
+        return self._pattern_index
 
     def generate_velocity_patterns(self):
         """Generate velocity patterns for left and right turns with 4 neurons per robot."""
@@ -59,14 +168,28 @@ class SwarmHopfieldControl:
         """Patterns are already encoded using -1 and 1."""
         patterns = self.velocity_patterns.copy()
         print("[DEBUG] Verifying pattern values are -1 or 1")
-        for i, pattern in enumerate(patterns):
-            for j, value in enumerate(pattern):
-                if value not in [-1, 1]:
-                    raise ValueError(f"Invalid pattern value {value} at pattern {i}, position {j}")
+        invalid = np.argwhere((patterns != -1) & (patterns != 1))
+        if len(invalid):
+            i, j = invalid[0]
+            raise ValueError(f"Invalid pattern value {patterns[i, j]} at pattern {i}, position {j}")
         return patterns
 
     def train_hopfield_network(self):
         """Train the Hopfield network using Hebbian learning rule."""
+        if self.tiled_weights:
+            weights = TiledWeights.from_patterns(self.encoded_patterns)
+            if weights is not None:
+                print(f"[DEBUG] Trained tiled Hopfield network: {weights.num_patterns} motifs over {weights.num_robots} robots")
+                return weights
+            print("[WARNING] Patterns are not tiled per-robot motifs, training dense weights")
+
+        if self.connectivity is not None:
+            from .sparse_hopfield import robot_neighbours, sparse_hebbian_weights
+            pairs = robot_neighbours(self.robot_positions, **self.connectivity)
+            weights = sparse_hebbian_weights(self.encoded_patterns, pairs)
+            print(f"[DEBUG] Trained sparse Hopfield network: {weights.nnz} of {weights.shape[0] ** 2} weights")
+            return weights
+
         pattern_size = 4 * self.num_robots  # 4 neurons per robot
         weights = np.zeros((pattern_size, pattern_size))
         print("[DEBUG] Training Hopfield network with pattern_size:", pattern_size)
@@ -82,53 +205,82 @@ class SwarmHopfieldControl:
         self.direction_angles = np.linspace(0, 360, num_directions, endpoint=False)
         self.velocity_patterns = self.generate_velocity_patterns()
         self.encoded_patterns = self.encode_patterns()
-        self.hopfield_weights = self.train_hopfield_network()
+        self.hopfield_weights = None
+
+    def retrieve(self, input_pattern, max_iter=1):
+        """
+        One-step modern Hopfield retrieval.
+
+        Returns:
+            The retrieved continuous pattern and the attention weights over stored patterns.
+        """
+        network = ModernHopfieldNetwork(self.pattern_index, beta=self.beta)
+        retrieved, attention = network.retrieve(input_pattern, max_iter=max_iter)
+        self.last_attention = attention
+        return retrieved, attention
 
     def recall_pattern(self, input_pattern, max_iter=10):
         """Recall the closest pattern using the Hopfield network."""
         pattern = np.array(input_pattern)
-        if pattern.shape[0] != self.hopfield_weights.shape[0]:
+        expected = self.encoded_patterns.shape[1]
+        if pattern.shape[0] != expected:
             raise ValueError(
-                f"Pattern dimension mismatch: Expected {self.hopfield_weights.shape[0]}, "
+                f"Pattern dimension mismatch: Expected {expected}, "
                 f"got {pattern.shape[0]}. Verify robot count matches Hopfield network initialization."
             )
 
+        if self.recall_cache is None:
+            return self._recall(pattern, max_iter)
+
+        if self.backend == 'modern':
+            key = probe_key(pattern, 'modern', max_iter, self.beta)
+            result, attention = self.recall_cache.lookup(
+                key, (self.encoded_patterns,), lambda: (self._recall(pattern, max_iter), self.last_attention))
+            self.last_attention = attention
+            return result.copy()
+
+        key = probe_key(pattern, 'classic', max_iter)
+        result = self.recall_cache.lookup(key, (self.encoded_patterns, self.hopfield_weights),
+                                          lambda: self._recall(pattern, max_iter))
+        return result.copy()
+
+    def _recall(self, pattern, max_iter):
+        if self.backend == 'modern':
+            retrieved, _ = self.retrieve(pattern, max_iter=max_iter)
+            return np.where(retrieved < 0, -1.0, 1.0)
+
         print(f"[DEBUG] Recalling pattern with dim {pattern.shape}, weights dim {self.hopfield_weights.shape}")
 
+        if self.recall_shards:
+            return self.recall_engine.recall(pattern, max_iter)
+
         for _ in range(max_iter):
             pattern = np.sign(self.hopfield_weights @ pattern)
         return pattern
 
+    def recall_pattern_async(self, input_pattern, max_flips=None, order='greedy'):
+        """
+        Recall with event-driven asynchronous updates over an incrementally kept local field.
+
+        Returns:
+            The settled pattern and whether no unstable neurons remain.
+        """
+        state, flips, converged = AsyncRecallEngine(self.hopfield_weights, order=order).run(input_pattern, max_flips)
+        print(f"[DEBUG] Async recall settled after {flips} flips (converged={converged})")
+        return state, converged
+
     def get_velocity_from_binary(self, encoded_pattern):
         """Convert 4-neuron encoding to robot velocities."""
         print(f"[DEBUG] Processing pattern of shape: {encoded_pattern.shape}")
 
         # Find closest matching pattern
-        similarities = [np.sum(encoded_pattern == encoded) for encoded in self.encoded_patterns]
-        best_match_idx = np.argmax(similarities)
-        pattern = self.encoded_patterns[best_match_idx]
+        best_match_idx, _ = self.pattern_index.best(encoded_pattern)
         print(f"[DEBUG] Best matching pattern index: {best_match_idx}")
 
-        # Convert pattern to velocities
-        velocities = []
-        for i in range(0, len(pattern), 4):
-            neuron_chunk = pattern[i:i + 4]
-            print(f"[DEBUG] Processing neuron chunk {i // 4}: {neuron_chunk}")
-
-            # Forward/backward velocity (first two neurons)
-            forward = neuron_chunk[0]  # 1 for forward, -1 for not forward
-            backward = neuron_chunk[1]  # 1 for backward, -1 for not backward
-            vx = self.speed if forward > backward else -self.speed
+        # Convert pattern to velocities, one lookup per 4-neuron chunk
+        velocities = self.velocity_decoder.pattern_commands(self.encoded_patterns, best_match_idx)
 
-            # Left/right velocity (last two neurons)
-            left = neuron_chunk[2]  # 1 for left, -1 for not left
-            right = neuron_chunk[3]  # 1 for right, -1 for not right
-            vy = self.angular_speed if left > right else -self.angular_speed
-
-            velocities.extend([vx, vy])
-            print(f"[DEBUG] Robot {i // 4} velocities: vx={vx}, vy={vy}")
-
-        result = np.array(velocities)
+        result = velocities.ravel().copy()
         print(f"[DEBUG] Generated velocities shape: {result.shape}")
         return result
 
@@ -138,8 +290,7 @@ class SwarmHopfieldControl:
         completed = self.recall_pattern(partial_pattern)
 
         # Find best matching direction
-        similarities = [np.sum(completed == encoded) for encoded in self.encoded_patterns]
-        best_match_idx = np.argmax(similarities)
+        best_match_idx, _ = self.pattern_index.best(completed)
         return best_match_idx, self.direction_angles[best_match_idx]
 
     def assess_recall(self, input_pattern):
@@ -153,12 +304,54 @@ class SwarmHopfieldControl:
             A similarity score between the recalled pattern and the closest stored pattern.
         """
         recalled_pattern = self.recall_pattern(input_pattern)
-        similarities = [np.dot(recalled_pattern, encoded) / (np.linalg.norm(recalled_pattern) * np.linalg.norm(encoded))
-                        for encoded in self.encoded_patterns]
-        best_match_idx = np.argmax(similarities)
-        similarity_score = similarities[best_match_idx]
+        best_match_idx, similarity_score = self.pattern_index.best(recalled_pattern, metric='cosine')
         return similarity_score, best_match_idx
 
+    def checkpoint_state(self):
+        """
+        (meta, arrays) describing this controller. Dense trained weights are included;
+        sparse and tiled weights are rebuilt on first use, which is linear in swarm size.
+        """
+        meta = {
+            'speed': self.speed,
+            'angular_speed': self.angular_speed,
+            'backend': self.backend,
+            'beta': self.beta,
+            'recall_shards': self.recall_shards,
+            'connectivity': self.connectivity,
+            'tiled_weights': self.tiled_weights,
+        }
+        arrays = {
+            'robot_positions': self.robot_positions,
+            'velocity_patterns': self.velocity_patterns,
+            'encoded_patterns': self.encoded_patterns,
+        }
+        if isinstance(self._hopfield_weights, np.ndarray):
+            arrays['hopfield_weights'] = self._hopfield_weights
+        return meta, arrays
+
+    @classmethod
+    def from_checkpoint_state(cls, meta, arrays):
+        control = cls(arrays['robot_positions'], meta['speed'], meta['angular_speed'], meta['backend'], meta['beta'])
+        control.velocity_patterns = arrays['velocity_patterns']
+        control.encoded_patterns = arrays['encoded_patterns']
+        control.connectivity = meta['connectivity']
+        control.tiled_weights = meta['tiled_weights']
+        control.recall_shards = meta['recall_shards']
+        control.hopfield_weights = arrays.get('hopfield_weights')  # None: retrained on first use
+        return control
+
+    def checkpoint(self, path):
+        """Save patterns, trained weights and settings to a memory-mappable checkpoint"""
+        meta, arrays = self.checkpoint_state()
+        write_checkpoint(path, type(self).__name__, meta, arrays)
+
+    @classmethod
+    def restore(cls, path, mode='c'):
+        """Restore from checkpoint(); arrays stay memory-mapped copy-on-write by default"""
+        meta, arrays = read_checkpoint(path, mode, kind=cls.__name__)
+        return cls.from_checkpoint_state(meta, arrays)
+
     def visualize_patterns(self):
         """Display stored patterns and network weights."""
         print("Velocity Patterns:")
@@ -0,0 +1,133 @@
+import numpy as np
+
+METRICS = ('centroid_drift', 'dispersion', 'rotation', 'distortion')
+
+
+class FormationMetrics:
+    """Formation-quality statistics maintained online from Swarm.update hooks
+
+    Each tick costs O(N) vectorized work against the initial layout:
+
+    - centroid_drift: distance of the centroid from the layout's centroid
+    - dispersion: RMS distance of robots from the centroid
+    - rotation: least-squares rotation of the formation w.r.t. the layout (radians), unwrapped
+      across ticks (assuming less than half a turn per tick) so a continuously turning
+      swarm accumulates past +-pi
+    - distortion: RMS residual after the best rigid alignment (0 for a perfectly rigid formation)
+
+    Running aggregates (count, mean, std, min, max) cover the whole run, and a ring
+    buffer keeps the last `window` ticks, so no second pass over trajectories is needed.
+    """
+
+    def __init__(self, reference, window=256):
+        """
+        Args:
+            reference: (N, 2) initial layout, e.g. create_grid_positions(rows, cols).
+            window: Number of recent ticks kept in the history.
+        """
+        reference = np.asarray(reference, dtype=np.float64).reshape(-1, 2)
+        self.reference_centroid = reference.mean(axis=0)
+        self.reference = reference - self.reference_centroid
+        self._reference_spread = np.mean(np.einsum('ij,ij->i', self.reference, self.reference))
+        self.window = window
+        self._history = np.zeros((window, len(METRICS)))
+        self._ticks = np.zeros(window, dtype=np.int64)
+        self._head = 0
+        self.count = 0
+        self._mean = np.zeros(len(METRICS))
+        self._m2 = np.zeros(len(METRICS))
+        self._min = np.full(len(METRICS), np.inf)
+        self._max = np.full(len(METRICS), -np.inf)
+        self._latest = None
+        self._heading = None  # Wrapped rotation of the previous tick, for unwrapping
+
+    @classmethod
+    def from_swarm(cls, swarm, window=256):
+        """Metrics against the grid layout the swarm was created with"""
+        from .hopfield import create_grid_positions
+        return cls(create_grid_positions(swarm.rows, swarm.cols), window)
+
+    def attach(self, swarm):
+        """Observe swarm after every update; returns self"""
+        swarm.add_update_hook(self)
+        return self
+
+    def detach(self, swarm):
+        swarm.remove_update_hook(self)
+
+    def __call__(self, swarm, dt):
+        self.observe(swarm.positions, swarm.tick)
+
+    def observe(self, positions, tick=None):
+        """Fold one tick of (N, 2) positions into the statistics; returns the tick's values"""
+        positions = np.asarray(positions, dtype=np.float64)
+        centroid = positions.mean(axis=0)
+        centered = positions - centroid
+
+        # 2D Procrustes: the rotation best aligning the layout onto the formation. The
+        # residual after that alignment follows from the same sums, without building it.
+        count = len(positions)
+        dot = np.einsum('ij,ij->', self.reference, centered)
+        cross = np.einsum('i,i->', self.reference[:, 0], centered[:, 1]) - \
+            np.einsum('i,i->', self.reference[:, 1], centered[:, 0])
+        spread = np.einsum('ij,ij->', centered, centered) / count
+        residual = spread + self._reference_spread - 2.0 * np.hypot(dot, cross) / count
+
+        # Unwrap: accumulate the wrapped change since the previous tick
+        heading = np.arctan2(cross, dot)
+        if self._heading is None:
+            rotation = heading
+        else:
+            rotation = self._latest['rotation'] + (heading - self._heading + np.pi) % (2 * np.pi) - np.pi
+        self._heading = heading
+
+        values = np.array([
+            np.hypot(*(centroid - self.reference_centroid)),
+            np.sqrt(spread),
+            rotation,
+            np.sqrt(max(residual, 0.0)),
+        ])
+
+        # Welford running mean / variance
+        self.count += 1
+        delta = values - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (values - self._mean)
+        np.minimum(self._min, values, out=self._min)
+        np.maximum(self._max, values, out=self._max)
+
+        tick = self.count if tick is None else tick
+        self._history[self._head] = values
+        self._ticks[self._head] = tick
+        self._head = (self._head + 1) % self.window
+
+        latest = dict(zip(METRICS, values.tolist()))
+        latest['tick'] = int(tick)
+        latest['centroid'] = centroid
+        self._latest = latest
+        return latest
+
+    def latest(self):
+        """Values of the most recent tick (plus 'tick' and 'centroid'), None before the first"""
+        return self._latest
+
+    def summary(self):
+        """Running aggregates per metric over every observed tick"""
+        std = np.sqrt(self._m2 / self.count) if self.count else np.zeros(len(METRICS))
+        return {name: {'count': self.count, 'mean': float(self._mean[i]), 'std': float(std[i]),
+                       'min': float(self._min[i]), 'max': float(self._max[i])}
+                for i, name in enumerate(METRICS)}
+
+    def history(self):
+        """(ticks, {metric: values}) for the last `window` ticks, oldest first"""
+        size = min(self.count, self.window)
+        order = (np.arange(self._head - size, self._head)) % self.window
+        return self._ticks[order].copy(), {name: self._history[order, i].copy() for i, name in enumerate(METRICS)}
+
+    def format(self):
+        """One-line text for display"""
+        if self._latest is None:
+            return "No ticks yet"
+        m = self._latest
+        return (f"Drift {m['centroid_drift']:.2f}  Dispersion {m['dispersion']:.2f}  "
+                f"Rotation {np.degrees(m['rotation']):.1f}°  Distortion {m['distortion']:.3f}")
@@ -0,0 +1,59 @@
+import numpy as np
+from .pattern_index import PatternIndex
+
+
+def softmax(x, axis=-1):
+    """Numerically stable softmax"""
+    shifted = np.exp(x - np.max(x, axis=axis, keepdims=True))
+    return shifted / np.sum(shifted, axis=axis, keepdims=True)
+
+
+class ModernHopfieldNetwork:
+    """Continuous modern (dense associative memory) Hopfield network
+
+    The update rule is ξ ← Xᵀ softmax(β X ξ) over the stored pattern matrix X.
+    For well separated patterns a single step lands on the stored pattern, and
+    one step costs O(KN) for K patterns of N neurons.
+    """
+
+    def __init__(self, patterns, beta=1.0):
+        """
+        Args:
+            patterns: (K, N) matrix or PatternIndex of stored ±1 patterns.
+            beta: Inverse temperature; higher values give sharper attention.
+        """
+        if beta <= 0:
+            raise ValueError(f"beta must be positive, got {beta}")
+        self.index = patterns if isinstance(patterns, PatternIndex) else PatternIndex(patterns)
+        self.beta = beta
+
+    @property
+    def num_neurons(self):
+        return self.index.num_neurons
+
+    def attention(self, state):
+        """Attention weights softmax(β X ξ) over stored patterns for one state or a batch"""
+        return softmax(self.beta * self.index.dot(state))
+
+    def retrieve(self, state, max_iter=1, tol=1e-9):
+        """
+        Retrieve the stored pattern closest to a (partial or noisy) state.
+
+        Args:
+            state: (N,) state or (B, N) batch of states.
+            max_iter: Maximum number of update steps; one is usually enough.
+            tol: Stop early once the state changes by less than this.
+
+        Returns:
+            (retrieved continuous state, attention weights of the last step)
+        """
+        state = np.asarray(state, dtype=np.float64)
+        weights = None
+        for _ in range(max(max_iter, 1)):
+            weights = self.attention(state)
+            retrieved = weights @ self.index.matrix
+            converged = np.max(np.abs(retrieved - state)) < tol
+            state = retrieved
+            if converged:
+                break
+        return state, weights
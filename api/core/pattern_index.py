@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class PatternIndex:
+    """Nearest-pattern index over a library of stored ±1 patterns
+
+    Patterns are kept as one contiguous (K, N) matrix with precomputed norms so
+    that scoring one probe or a whole batch of probes is a single matrix product.
+    """
+
+    def __init__(self, patterns):
+        patterns = np.asarray(patterns)
+        if patterns.ndim != 2:
+            raise ValueError(f"Expected a 2D pattern matrix, got shape {patterns.shape}")
+        self.source = patterns
+        self.matrix = np.ascontiguousarray(patterns, dtype=np.float64)
+        self.norms = np.linalg.norm(self.matrix, axis=1)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def num_neurons(self):
+        return self.matrix.shape[1]
+
+    def _as_batch(self, probes):
+        probes = np.asarray(probes, dtype=np.float64)
+        single = probes.ndim == 1
+        probes = np.atleast_2d(probes)
+        if probes.shape[1] != self.num_neurons:
+            raise ValueError(f"Probe dimension mismatch: expected {self.num_neurons}, got {probes.shape[1]}")
+        return probes, single
+
+    def dot(self, probes):
+        """Raw overlaps probe · pattern for every stored pattern, shape (K,) or (B, K)"""
+        probes, single = self._as_batch(probes)
+        scores = probes @ self.matrix.T
+        return scores[0] if single else scores
+
+    def matches(self, probes):
+        """
+        Number of neurons each probe shares with each stored pattern.
+
+        Equivalent to np.sum(probe == pattern) for probes with values in {-1, 0, 1}:
+        zeros never match, and every non-zero entry matches when its product is +1.
+        """
+        probes, single = self._as_batch(probes)
+        nonzero = np.count_nonzero(probes, axis=1)[:, None]
+        scores = (nonzero + probes @ self.matrix.T) / 2
+        return scores[0] if single else scores
+
+    def cosine(self, probes):
+        """Cosine similarity between each probe and each stored pattern"""
+        probes, single = self._as_batch(probes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (probes @ self.matrix.T) / (np.linalg.norm(probes, axis=1)[:, None] * self.norms)
+        return scores[0] if single else scores
+
+    def topk(self, probes, k=1, metric='matches'):
+        """
+        Find the k best stored patterns for one probe or a batch of probes.
+
+        Args:
+            probes: (N,) probe or (B, N) batch of probes.
+            k: Number of patterns to return per probe.
+            metric: 'matches', 'dot' or 'cosine'.
+
+        Returns:
+            (indices, scores) ordered from best to worst, shaped (k,) or (B, k).
+        """
+        if metric not in ('matches', 'dot', 'cosine'):
+            raise ValueError(f"Unknown metric {metric}")
+        scores = np.atleast_2d(getattr(self, metric)(probes))
+        single = np.asarray(probes).ndim == 1
+        k = min(k, len(self))
+
+        if k < len(self):
+            candidates = np.sort(np.argpartition(-scores, k - 1, axis=1)[:, :k], axis=1)
+        else:
+            candidates = np.broadcast_to(np.arange(len(self)), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        # Stable sort keeps the lowest index first on ties, like np.argmax
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+        indices = np.take_along_axis(candidates, order, axis=1)
+        top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        return (indices[0], top_scores[0]) if single else (indices, top_scores)
+
+    def best(self, probe, metric='matches'):
+        """Index and score of the single best stored pattern for one probe"""
+        scores = getattr(self, metric)(probe)
+        idx = int(np.argmax(scores))
+        return idx, scores[idx]
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class StageProfiler:
+    """Low-overhead per-stage timing counters based on the monotonic clock
+
+    Every stage keeps an exact count and total plus a bounded window of recent
+    samples from which percentiles are computed on demand. Safe to share between
+    threads, e.g. a simulation worker and the UI thread recording 'render'.
+    """
+
+    def __init__(self, window=4096, dump_interval=None, dump_fn=print, enabled=True):
+        """
+        Args:
+            window: Number of recent samples kept per stage for percentiles.
+            dump_interval: Seconds between automatic dumps, None to disable.
+            dump_fn: Callable receiving the formatted report on each dump.
+            enabled: When False, stages are not timed at all.
+        """
+        self.window = window
+        self.dump_interval = dump_interval
+        self.dump_fn = dump_fn
+        self.enabled = enabled
+        self._counts = {}
+        self._totals = {}
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+
+    def record(self, name, elapsed_ns):
+        """Add one sample (in nanoseconds) to a stage"""
+        with self._lock:
+            if name not in self._counts:
+                self._counts[name] = 0
+                self._totals[name] = 0
+                self._samples[name] = deque(maxlen=self.window)
+            self._counts[name] += 1
+            self._totals[name] += elapsed_ns
+            self._samples[name].append(elapsed_ns)
+
+        if self.dump_interval is not None and time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one sample of the given stage"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def wrap(self, name, fn):
+        """Return fn wrapped so that every call is timed as the given stage"""
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter_ns() - start)
+        return timed
+
+    def stats(self):
+        """
+        Aggregate timings per stage.
+
+        Returns:
+            Dict mapping stage name to count, total, mean, p50, p99 and max in seconds.
+        """
+        with self._lock:
+            snapshot = [(name, count, self._totals[name], np.fromiter(self._samples[name], dtype=np.int64))
+                        for name, count in self._counts.items()]
+        result = {}
+        for name, count, total, samples in snapshot:
+            p50, p99 = np.percentile(samples, [50, 99]) if len(samples) else (0.0, 0.0)
+            result[name] = {
+                'count': count,
+                'total': total / 1e9,
+                'mean': total / count / 1e9,
+                'p50': p50 / 1e9,
+                'p99': p99 / 1e9,
+                'max': samples.max() / 1e9 if len(samples) else 0.0,
+            }
+        return result
+
+    def report(self):
+        """Format current stats as a fixed-width text table"""
+        lines = [f"{'stage':<28}{'count':>10}{'mean ms':>12}{'p50 ms':>12}{'p99 ms':>12}"]
+        for name, s in sorted(self.stats().items()):
+            lines.append(f"{name:<28}{s['count']:>10}{s['mean'] * 1e3:>12.4f}"
+                         f"{s['p50'] * 1e3:>12.4f}{s['p99'] * 1e3:>12.4f}")
+        return "\n".join(lines)
+
+    def dump(self):
+        """Send the current report to dump_fn"""
+        self._last_dump = time.monotonic()
+        self.dump_fn(f"[STATS]\n{self.report()}")
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+            self._samples.clear()
+
+
+class ProfiledProxy:
+    """Proxy that times every method call of a remote API object (e.g. CoppeliaSim's sim)"""
+
+    def __init__(self, target, profiler, prefix='rpc.'):
+        self._target = target
+        self._profiler = profiler
+        self._prefix = prefix
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        if name not in self._wrapped:
+            self._wrapped[name] = self._profiler.wrap(self._prefix + name, attr)
+        return self._wrapped[name]
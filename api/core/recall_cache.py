@@ -0,0 +1,72 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+def probe_key(probe, *settings):
+    """
+    Compact key for a probe: a 128-bit hash of its bit-packed signs plus the settings.
+    Probes with entries other than -1/1 hash their raw bytes instead.
+    """
+    probe = np.asarray(probe)
+    if np.all(np.abs(probe) == 1):
+        payload = np.packbits(probe > 0).tobytes()
+    else:
+        payload = np.ascontiguousarray(probe, dtype=np.float64).tobytes() + b'raw'
+    return hashlib.blake2b(payload, digest_size=16).digest(), len(probe), settings
+
+
+class RecallCache:
+    """Bounded LRU memo of recall results
+
+    Entries are tied to the objects the result depends on (weights, patterns):
+    when any of them is replaced, the cache empties itself on the next lookup.
+    Owners also call invalidate() after editing such objects in place.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._sources = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def invalidate(self):
+        """Drop every entry"""
+        self.entries.clear()
+        self._sources = None
+
+    def lookup(self, key, sources, compute):
+        """
+        Return the cached value for key, or compute(), store and return it.
+
+        Args:
+            key: Hashable key, see probe_key.
+            sources: Tuple of objects the result depends on, compared by identity.
+            compute: Zero-argument callable producing the value on a miss.
+        """
+        if self._sources is None or len(sources) != len(self._sources) or \
+                any(a is not b for a, b in zip(sources, self._sources)):
+            self.entries.clear()
+            self._sources = tuple(sources)
+
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries),
+                'hit_rate': self.hits / total if total else 0.0}
@@ -0,0 +1,30 @@
+import os
+
+
+class ShardedRecallMixin:
+    """Opt-in sharded recall shared by the Hopfield classes
+
+    Owners set `recall_shards = 0` and `_recall_engine = None` in __init__ and call
+    _close_recall_engine() whenever their weights change. ShardedRecallEngine is
+    imported on first use, so single-process users never load multiprocessing.
+    """
+
+    def _set_recall_shards(self, num_shards):
+        """Stop the running engine and set the worker count (None for the CPU count, 0 to disable)"""
+        self._close_recall_engine()
+        self.recall_shards = os.cpu_count() or 1 if num_shards is None else num_shards
+
+    def _sharded_engine(self, weights):
+        """Engine over weights, started on first use"""
+        if self._recall_engine is None:
+            from .sharded_recall import ShardedRecallEngine
+            self._recall_engine = ShardedRecallEngine(weights, self.recall_shards)
+        return self._recall_engine
+
+    def _close_recall_engine(self):
+        """Stop the engine and drop cached recalls; both snapshot the old weights"""
+        if self._recall_engine is not None:
+            self._recall_engine.close()
+            self._recall_engine = None
+        if getattr(self, 'recall_cache', None) is not None:
+            self.recall_cache.invalidate()
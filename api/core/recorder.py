@@ -0,0 +1,196 @@
+import os
+import struct
+import numpy as np
+
+
+MAGIC = b'HSTR'
+VERSION = 1
+HEADER_FORMAT = '<4sHHIIIf8x'  # magic, version, mode, robots, chunk_size, reserved, dt
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+MODES = {'float64': 0, 'float32': 1, 'float16': 2, 'delta': 3}
+MODE_DTYPES = {0: np.float64, 1: np.float32, 2: np.float16, 3: np.float16}
+
+
+def record_dtype(num_robots, mode):
+    """Numpy structured dtype of one tick record for the given storage mode"""
+    value_dtype = MODE_DTYPES[MODES[mode] if isinstance(mode, str) else mode]
+    return np.dtype([
+        ('positions', value_dtype, (num_robots, 2)),
+        ('velocities', value_dtype, (num_robots, 2)),
+        ('pattern', '<i4'),
+        ('recall', '<i4'),
+    ])
+
+
+def anchor_size(num_robots, mode):
+    """Bytes of the absolute position anchor stored at the start of each chunk"""
+    return num_robots * 2 * 8 if mode == MODES['delta'] else 0
+
+
+class TrajectoryRecorder:
+    """Append-only, chunked binary log of swarm state written from Swarm.update
+
+    Layout: a fixed header followed by chunks of `chunk_size` fixed-size records.
+    In 'delta' mode every chunk starts with a float64 anchor of absolute positions
+    and its records hold float16 offsets from that anchor, so errors never
+    accumulate past one chunk and any tick can still be located arithmetically.
+    """
+
+    def __init__(self, filename, num_robots, mode='float32', chunk_size=256, dt=0.05):
+        if mode not in MODES:
+            raise ValueError(f"Unknown recording mode {mode}, expected one of {list(MODES)}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        self.filename = filename
+        self.num_robots = num_robots
+        self.mode = MODES[mode]
+        self.chunk_size = chunk_size
+        self.dt = dt
+        self.dtype = record_dtype(num_robots, self.mode)
+        self.ticks = 0
+
+        self._buffer = np.zeros(chunk_size, dtype=self.dtype)
+        self._buffered = 0
+        self._flushed = 0
+        self._anchor = None
+        self._swarm = None
+
+        self._file = open(filename, 'wb')
+        self._file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.mode,
+                                     num_robots, chunk_size, 0, dt))
+
+    def attach(self, swarm):
+        """Start recording every update of the given swarm"""
+        if len(swarm.robots) != self.num_robots:
+            raise ValueError(f"Recorder expects {self.num_robots} robots, swarm has {len(swarm.robots)}")
+        self._swarm = swarm
+        swarm.add_update_hook(self._on_update)
+
+    def detach(self):
+        """Stop recording and flush buffered ticks"""
+        if self._swarm is not None:
+            self._swarm.remove_update_hook(self._on_update)
+            self._swarm = None
+        self.flush()
+
+    def _on_update(self, swarm, dt):
+        self.append(swarm.get_positions(), swarm.get_velocities(),
+                    swarm.current_pattern, swarm.recall_state)
+
+    def append(self, positions, velocities, pattern, recall=-1):
+        """Append a single tick to the log"""
+        positions = np.asarray(positions, dtype=np.float64)
+        if self._buffered == 0 and self.mode == MODES['delta']:
+            self._anchor = positions.copy()
+
+        record = self._buffer[self._buffered]
+        record['positions'] = positions - self._anchor if self.mode == MODES['delta'] else positions
+        record['velocities'] = velocities
+        record['pattern'] = pattern
+        record['recall'] = recall
+        self._buffered += 1
+        self.ticks += 1
+
+        if self._buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered ticks to disk.
+
+        A partially filled chunk is written as-is and later appends continue
+        it, so the file is always a valid prefix of the full log.
+        """
+        if self._file.closed:
+            return
+        if self._buffered > self._flushed:
+            if self._flushed == 0 and self._anchor is not None:
+                self._file.write(self._anchor.astype('<f8').tobytes())
+            self._file.write(self._buffer[self._flushed:self._buffered].tobytes())
+            self._flushed = self._buffered
+        if self._buffered == self.chunk_size:
+            self._buffered = 0
+            self._flushed = 0
+        self._file.flush()
+
+    def close(self):
+        """Detach, flush and close the log file"""
+        self.detach()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryLog:
+    """Memory-mapped reader for logs produced by TrajectoryRecorder"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{filename} is too short to be a trajectory log")
+
+        magic, version, mode, num_robots, chunk_size, _, dt = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a trajectory log")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trajectory log version {version}")
+
+        self.mode = mode
+        self.num_robots = num_robots
+        self.chunk_size = chunk_size
+        self.dt = dt
+        self.dtype = record_dtype(num_robots, mode)
+        self.anchor_bytes = anchor_size(num_robots, mode)
+        self.chunk_bytes = self.anchor_bytes + chunk_size * self.dtype.itemsize
+
+        size = os.path.getsize(filename) - HEADER_SIZE
+        full_chunks, remainder = divmod(size, self.chunk_bytes)
+        partial = max(remainder - self.anchor_bytes, 0) // self.dtype.itemsize if remainder else 0
+        self.num_ticks = full_chunks * chunk_size + partial
+
+        self._data = np.memmap(filename, dtype=np.uint8, mode='r', offset=HEADER_SIZE) if size else None
+
+    def __len__(self):
+        return self.num_ticks
+
+    def _offset(self, tick):
+        chunk, index = divmod(tick, self.chunk_size)
+        return chunk * self.chunk_bytes + self.anchor_bytes + index * self.dtype.itemsize
+
+    def record(self, tick):
+        """Return the raw structured record for a tick"""
+        if tick < 0:
+            tick += self.num_ticks
+        if not 0 <= tick < self.num_ticks:
+            raise IndexError(f"Tick {tick} out of range for log with {self.num_ticks} ticks")
+        offset = self._offset(tick)
+        return self._data[offset:offset + self.dtype.itemsize].view(self.dtype)[0]
+
+    def positions(self, tick):
+        """Absolute robot positions at a tick as an (N, 2) float64 array"""
+        record = self.record(tick)
+        positions = record['positions'].astype(np.float64)
+        if self.anchor_bytes:
+            chunk_offset = (tick % self.num_ticks) // self.chunk_size * self.chunk_bytes
+            anchor = self._data[chunk_offset:chunk_offset + self.anchor_bytes].view('<f8')
+            positions += anchor.reshape(self.num_robots, 2)
+        return positions
+
+    def velocities(self, tick):
+        """Robot velocities at a tick as an (N, 2) float64 array"""
+        return self.record(tick)['velocities'].astype(np.float64)
+
+    def pattern(self, tick):
+        """Active pattern index at a tick"""
+        return int(self.record(tick)['pattern'])
+
+    def recall(self, tick):
+        """Recall state (matched pattern index, -1 if none) at a tick"""
+        return int(self.record(tick)['recall'])
@@ -0,0 +1,135 @@
+import time
+from .profiling import StageProfiler
+
+
+class TickScheduler:
+    """Fixed-period control loop with decimated, deadline-aware recall
+
+    Every tick runs `step(dt, decision)`. Every `recall_every` ticks it also runs
+    `recall()` to produce a new decision, but only if the recall is expected
+    to finish within the tick's deadline. If it would not, the last decision
+    is reused and the recall is retried on the next tick. Ticks are scheduled
+    on a fixed grid (start + n * period), so a slow tick never shifts later
+    ones. Slots that were missed entirely are dropped rather than replayed in a
+    burst.
+
+    Start jitter, step and recall durations go to a StageProfiler. Overruns,
+    dropped slots and skipped recalls are counted.
+    """
+
+    def __init__(self, step, recall=None, period=0.05, recall_every=1, decision=None,
+                 clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            step: Callable step(dt, decision) run every tick (kinematics, actuation).
+            recall: Callable returning a new decision (Hopfield recall), or None.
+            period: Tick period in seconds; also the dt passed to step.
+            recall_every: Run recall once every this many ticks.
+            decision: Initial decision used until the first recall.
+            clock: Monotonic clock in seconds.
+            sleep: Sleep function, used by run().
+        """
+        self.step = step
+        self.recall = recall
+        self.period = period
+        self.recall_every = recall_every
+        self.decision = decision
+        self.clock = clock
+        self.sleep = sleep
+        self.profiler = StageProfiler()
+
+        self.tick_count = 0
+        self.overruns = 0          # Ticks that finished after their deadline
+        self.dropped_slots = 0     # Whole periods skipped because a tick ran long
+        self.skipped_recalls = 0   # Due recalls deferred for lack of time
+        self.recall_pending = True
+        self.recall_estimate = 0.0  # Decaying max of recent recall durations
+        self.step_estimate = 0.0
+        self._next_start = None
+
+    def _estimate(self, previous, elapsed):
+        return max(elapsed, previous * 0.95)
+
+    def tick(self):
+        """
+        Run the current tick now.
+
+        Returns:
+            Seconds until the next tick is due (0 if it is already late).
+        """
+        now = self.clock()
+        if self._next_start is None:
+            self._next_start = now
+        scheduled = self._next_start
+        deadline = scheduled + self.period
+        self.profiler.record('jitter', int(max(now - scheduled, 0.0) * 1e9))
+
+        if self.recall is not None and self.tick_count % self.recall_every == 0:
+            self.recall_pending = True
+        if self.recall is not None and self.recall_pending:
+            if now + self.recall_estimate + self.step_estimate <= deadline:
+                start = self.clock()
+                self.decision = self.recall()
+                elapsed = self.clock() - start
+                self.profiler.record('recall', int(elapsed * 1e9))
+                self.recall_estimate = self._estimate(self.recall_estimate, elapsed)
+                self.recall_pending = False
+            else:
+                self.skipped_recalls += 1
+                # Let the estimate decay so one slow recall can't starve recall forever
+                self.recall_estimate *= 0.95
+
+        start = self.clock()
+        self.step(self.period, self.decision)
+        end = self.clock()
+        self.profiler.record('step', int((end - start) * 1e9))
+        self.step_estimate = self._estimate(self.step_estimate, end - start)
+
+        self.tick_count += 1
+        if end > deadline:
+            self.overruns += 1
+        # Next slot on the fixed grid; slots already in the past are dropped
+        self._next_start = deadline
+        if end > self._next_start:
+            missed = int((end - self._next_start) // self.period)
+            self.dropped_slots += missed
+            self._next_start += missed * self.period
+        return max(self._next_start - end, 0.0)
+
+    def restart(self):
+        """Re-anchor the tick grid at the next tick, e.g. after the loop was paused"""
+        self._next_start = None
+
+    def time_to_next(self):
+        """Seconds until the next tick is due (0 if it is already late)"""
+        if self._next_start is None:
+            return 0.0
+        return max(self._next_start - self.clock(), 0.0)
+
+    def run(self, ticks=None, stop=None):
+        """
+        Run ticks on the fixed period, sleeping between them.
+
+        Args:
+            ticks: Number of ticks to run, None for no limit.
+            stop: Optional callable; the loop ends once it returns True.
+        """
+        done = 0
+        while ticks is None or done < ticks:
+            if stop is not None and stop():
+                break
+            delay = self.tick()
+            done += 1
+            if delay > 0 and (ticks is None or done < ticks):
+                self.sleep(delay)
+
+    def stats(self):
+        """Profiler stages (jitter, recall, step) plus overrun, dropped-slot and skipped-recall counters"""
+        stats = self.profiler.stats()
+        stats['counters'] = {
+            'ticks': self.tick_count,
+            'overruns': self.overruns,
+            'dropped_slots': self.dropped_slots,
+            'skipped_recalls': self.skipped_recalls,
+        }
+        return stats
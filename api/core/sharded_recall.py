@@ -0,0 +1,125 @@
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def _shard_worker(conn, weights_name, state_name, field_name, shape, lo, hi):
+    """Worker loop: on every request compute field[lo:hi] = W[lo:hi] @ state in place"""
+    weights_shm = shared_memory.SharedMemory(name=weights_name)
+    state_shm = shared_memory.SharedMemory(name=state_name)
+    field_shm = shared_memory.SharedMemory(name=field_name)
+    try:
+        weights = np.ndarray(shape, dtype=np.float64, buffer=weights_shm.buf)[lo:hi]
+        state = np.ndarray(shape[1], dtype=np.float64, buffer=state_shm.buf)
+        field = np.ndarray(shape[0], dtype=np.float64, buffer=field_shm.buf)[lo:hi]
+        while True:
+            if conn.recv() is None:
+                break
+            np.matmul(weights, state, out=field)
+            conn.send(True)
+    finally:
+        del weights, state, field
+        weights_shm.close()
+        state_shm.close()
+        field_shm.close()
+        conn.close()
+
+
+class ShardedRecallEngine:
+    """Sign-dynamics recall with weight rows split across worker processes
+
+    Weights are copied once into multiprocessing.shared_memory; each step the
+    state is written to a shared buffer, every worker fills its rows of the
+    local field, and the sign is taken in the parent. Fields agree with the
+    single-process W @ state up to floating-point rounding (BLAS may block the
+    row slices differently), so a neuron whose field is within rounding of zero
+    can take a different sign; elsewhere the updates are the same.
+    """
+
+    def __init__(self, weights, num_shards=None, start_method=None):
+        """
+        Args:
+            weights: (N, N) weight matrix.
+            num_shards: Number of worker processes, defaults to the CPU count.
+            start_method: multiprocessing start method, defaults to the platform default.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 2 or weights.shape[0] != weights.shape[1]:
+            raise ValueError(f"Expected a square weight matrix, got shape {weights.shape}")
+        num_neurons = weights.shape[0]
+        num_shards = max(1, min(num_shards or os.cpu_count() or 1, num_neurons))
+
+        self.shape = weights.shape
+        self.num_shards = num_shards
+        self._weights_shm = shared_memory.SharedMemory(create=True, size=weights.nbytes)
+        self._state_shm = shared_memory.SharedMemory(create=True, size=num_neurons * 8)
+        self._field_shm = shared_memory.SharedMemory(create=True, size=num_neurons * 8)
+        np.ndarray(self.shape, dtype=np.float64, buffer=self._weights_shm.buf)[:] = weights
+        self._state = np.ndarray(num_neurons, dtype=np.float64, buffer=self._state_shm.buf)
+        self._field = np.ndarray(num_neurons, dtype=np.float64, buffer=self._field_shm.buf)
+
+        ctx = mp.get_context(start_method)
+        bounds = np.linspace(0, num_neurons, num_shards + 1).astype(int)
+        self._conns = []
+        self._workers = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(target=_shard_worker, daemon=True,
+                                 args=(child_conn, self._weights_shm.name, self._state_shm.name,
+                                       self._field_shm.name, self.shape, int(lo), int(hi)))
+            worker.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._workers.append(worker)
+        self.closed = False
+
+    def local_field(self, state):
+        """Compute W @ state across all shards"""
+        if self.closed:
+            raise RuntimeError("Sharded recall engine is closed")
+        self._state[:] = state
+        for conn in self._conns:
+            conn.send(True)
+        for conn in self._conns:
+            conn.recv()
+        return self._field.copy()
+
+    def recall(self, pattern, steps=10):
+        """Run `steps` synchronous sign updates starting from pattern"""
+        pattern = np.asarray(pattern, dtype=np.float64)
+        if pattern.shape[0] != self.shape[0]:
+            raise ValueError(f"Pattern dimension mismatch: expected {self.shape[0]}, got {pattern.shape[0]}")
+        for _ in range(steps):
+            pattern = np.sign(self.local_field(pattern))
+        return pattern
+
+    def close(self):
+        """Stop workers and release shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        del self._state, self._field
+        for shm in (self._weights_shm, self._state_shm, self._field_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
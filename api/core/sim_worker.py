@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+
+class SwarmSnapshot:
+    """Immutable view of one tick: read-only positions plus tick and pattern"""
+    __slots__ = ('tick', 'positions', 'current_pattern')
+
+    def __init__(self, tick, positions, current_pattern):
+        self.tick = tick
+        self.positions = positions
+        self.current_pattern = current_pattern
+
+
+class SwarmWorker:
+    """Runs Swarm.update on a background thread at a fixed rate
+
+    Each tick is copied into the back buffer, frozen and swapped to the front,
+    so readers always get a complete snapshot without locking the simulation.
+    Everything that touches the swarm (pattern changes, resets, training) is
+    submitted as a callable and executed on the worker thread between ticks.
+    """
+
+    def __init__(self, swarm, tick_rate=20.0, dt=None, running=False):
+        """
+        Args:
+            swarm: Swarm to drive; owned by the worker thread once started.
+            tick_rate: Simulation ticks per second.
+            dt: Simulated seconds per tick, defaults to 1 / tick_rate.
+            running: Whether to start ticking immediately or wait for resume().
+        """
+        self.swarm = swarm
+        self.tick_rate = tick_rate
+        self.dt = dt if dt is not None else 1.0 / tick_rate
+        self.running = running
+        self.commands = queue.Queue()
+        self.late_ticks = 0  # Ticks that overran their period
+        self._front = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='swarm-worker', daemon=True)
+        self._publish()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Stop the thread after the current tick"""
+        self._stopped.set()
+        self.commands.put(None)  # Wake a paused worker
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def resume(self):
+        self.submit(lambda swarm: setattr(self, 'running', True))
+
+    def pause(self):
+        self.submit(lambda swarm: setattr(self, 'running', False))
+
+    def submit(self, fn):
+        """Run fn(swarm) on the worker thread; returns a Future with its result"""
+        future = Future()
+        self.commands.put((fn, future))
+        return future
+
+    def call(self, fn, timeout=None):
+        """Submit fn(swarm) and wait for its result"""
+        return self.submit(fn).result(timeout)
+
+    def replace_swarm(self, factory):
+        """Build a new swarm with factory() on the worker thread and switch to it"""
+        def replace(_):
+            self.swarm = factory()
+            self._publish()
+            return self.swarm
+        return self.submit(replace)
+
+    def latest(self):
+        """Most recently published snapshot"""
+        with self._lock:
+            return self._front
+
+    def _publish(self):
+        back = np.array(self.swarm.positions, dtype=np.float64)
+        back.setflags(write=False)
+        snapshot = SwarmSnapshot(self.swarm.tick, back, self.swarm.current_pattern)
+        with self._lock:
+            self._front = snapshot
+
+    def _execute(self, item):
+        if item is None:
+            return
+        fn, future = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(self.swarm))
+        except Exception as e:
+            future.set_exception(e)
+        self._publish()
+
+    def _drain(self, timeout):
+        """Execute queued commands; blocks up to timeout for the first one"""
+        try:
+            item = self.commands.get(timeout=timeout) if timeout else self.commands.get_nowait()
+        except queue.Empty:
+            return
+        self._execute(item)
+        while True:
+            try:
+                item = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            self._execute(item)
+
+    def _run(self):
+        period = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        while not self._stopped.is_set():
+            if not self.running:
+                self._drain(period)
+                next_tick = time.perf_counter()
+                continue
+
+            self._drain(0)
+            if self._stopped.is_set() or not self.running:
+                continue
+            self.swarm.update(self.dt)
+            self._publish()
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._drain(delay)
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                self.late_ticks += 1
+                next_tick = time.perf_counter()  # Don't burst to catch up
@@ -0,0 +1,64 @@
+import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+NEURONS_PER_ROBOT = 4
+GRID_SPACING = 2.0  # Distance between lattice neighbours in create_grid_positions
+
+
+def robot_neighbours(positions, radius=None, k=None, spacing=GRID_SPACING):
+    """
+    Robot pairs that may share weights, from a KD-tree so the cost stays near-linear.
+
+    Args:
+        positions: (R, 2) robot positions.
+        radius: Connect robots within this many grid steps (Chebyshev, so 1 is the
+            8-neighbourhood).
+        k: Connect every robot to its k nearest robots (made symmetric).
+
+    Returns:
+        (M, 2) array of robot index pairs (i, j), containing both (i, j) and (j, i)
+        and every (i, i).
+    """
+    if (radius is None) == (k is None):
+        raise ValueError("Give exactly one of radius or k")
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    num_robots = len(positions)
+    tree = cKDTree(positions)
+
+    if radius is not None:
+        pairs = tree.query_pairs(radius * spacing + 1e-9, p=np.inf, output_type='ndarray')
+    else:
+        k = min(k, num_robots - 1)
+        if k > 0:
+            _, nearest = tree.query(positions, k=k + 1)
+            pairs = np.stack([np.repeat(np.arange(num_robots), k), nearest[:, 1:].ravel()], axis=1)
+        else:
+            pairs = np.empty((0, 2), dtype=np.intp)
+
+    self_pairs = np.repeat(np.arange(num_robots)[:, None], 2, axis=1)
+    pairs = np.concatenate([pairs, pairs[:, ::-1], self_pairs]).astype(np.intp)
+    return np.unique(pairs, axis=0)
+
+
+def sparse_hebbian_weights(patterns, pairs, neurons_per_robot=NEURONS_PER_ROBOT):
+    """
+    Hebbian weights restricted to the neuron blocks of connected robot pairs, in CSR form.
+
+    Every kept entry equals the dense rule's mean_k p_k[a] p_k[b] (zero diagonal), so with
+    all robots connected the result matches the dense weights exactly.
+    """
+    patterns = np.asarray(patterns, dtype=np.float64)
+    num_neurons = patterns.shape[1]
+    offsets = np.arange(neurons_per_robot)
+    rows = (pairs[:, 0, None, None] * neurons_per_robot + offsets[:, None]).repeat(neurons_per_robot, axis=2)
+    cols = (pairs[:, 1, None, None] * neurons_per_robot + offsets[None, :]).repeat(neurons_per_robot, axis=1)
+    rows, cols = rows.ravel(), cols.ravel()
+    off_diagonal = rows != cols
+    rows, cols = rows[off_diagonal], cols[off_diagonal]
+
+    data = np.zeros(len(rows))
+    for pattern in patterns:                # K is small; each pass is O(nnz)
+        data += pattern[rows] * pattern[cols]
+    data /= len(patterns)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(num_neurons, num_neurons))
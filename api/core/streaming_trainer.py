@@ -0,0 +1,159 @@
+import os
+import zipfile
+import numpy as np
+
+
+def _iter_npz_chunks(path, chunk_size):
+    """Stream the members of a .npz archive row chunk by row chunk, never loading a member whole"""
+    with zipfile.ZipFile(path) as archive:
+        members = sorted(name for name in archive.namelist() if name.endswith('.npy'))
+        for name in members:
+            with archive.open(name) as f:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                if dtype.hasobject:
+                    raise ValueError(f"{path}:{name} holds objects, expected numeric patterns")
+                if fortran_order or len(shape) < 2:
+                    # Column-major data can't be read by rows; single patterns are small anyway
+                    data = np.frombuffer(f.read(), dtype=dtype).reshape(shape, order='F' if fortran_order else 'C')
+                    yield from iter_pattern_chunks(data, chunk_size)
+                    continue
+                row_shape = shape[1:]
+                row_bytes = dtype.itemsize * int(np.prod(row_shape))
+                for start in range(0, shape[0], chunk_size):
+                    count = min(chunk_size, shape[0] - start)
+                    yield np.frombuffer(f.read(count * row_bytes), dtype=dtype).reshape(count, *row_shape)
+
+
+def iter_pattern_chunks(source, chunk_size=4096):
+    """
+    Yield 2D chunks of at most chunk_size patterns from any pattern source.
+
+    Args:
+        source: A path to a .npy file (memory-mapped) or a .npz file (every member
+            array in name order, streamed in row chunks), a 2D array, or an iterable
+            of patterns or 2D chunks.
+        chunk_size: Maximum rows per yielded chunk.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith('.npz'):
+            yield from _iter_npz_chunks(path, chunk_size)
+            return
+        source = np.load(path, mmap_mode='r')
+
+    if isinstance(source, np.ndarray):
+        if source.ndim == 1:
+            source = source[None]
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+
+    rows = []
+    for item in source:
+        if isinstance(item, np.ndarray) and item.ndim == 2:
+            if rows:
+                yield rows
+                rows = []
+            yield from iter_pattern_chunks(item, chunk_size)
+            continue
+        rows.append(item)
+        if len(rows) == chunk_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+
+class HebbianAccumulator:
+    """Bounded-memory Hebbian training: W = Σ p pᵀ accumulated as chunked Pᵀ·P products
+
+    Memory is one (N, N) accumulator plus one chunk, independent of the corpus size,
+    and each chunk costs a single BLAS matrix product. The accumulator can be saved
+    and restored to resume training part-way through a corpus.
+    """
+
+    def __init__(self, num_neurons, pattern_size=None):
+        """
+        Args:
+            num_neurons: Network size N; shorter patterns are padded with -1 as in HopfieldNetwork.
+            pattern_size: Expected pattern length, taken from the first chunk when None.
+        """
+        self.num_neurons = num_neurons
+        self.pattern_size = pattern_size
+        self.gram = np.zeros((num_neurons, num_neurons))
+        self.count = 0  # Patterns accumulated so far
+
+    def add_chunk(self, chunk):
+        """Validate a (K, pattern_size) chunk and add its Pᵀ·P to the accumulator"""
+        if len(chunk) == 0:
+            return
+        try:
+            chunk = np.asarray(chunk, dtype=np.float64)
+        except ValueError:
+            # Ragged chunk: report the first offending pattern (only on this error path)
+            expected = self.pattern_size or len(chunk[0])
+            bad = next(len(p) for p in chunk if len(p) != expected)
+            raise ValueError(f"All patterns must have {expected} elements. Got {bad}")
+        if chunk.ndim != 2:
+            raise ValueError(f"Expected a 2D chunk of patterns, got shape {chunk.shape}")
+        if self.pattern_size is None:
+            self.pattern_size = chunk.shape[1]
+        if chunk.shape[1] != self.pattern_size:
+            raise ValueError(f"All patterns must have {self.pattern_size} elements. Got {chunk.shape[1]}")
+        if self.pattern_size > self.num_neurons:
+            raise ValueError(f"Patterns of {self.pattern_size} elements do not fit {self.num_neurons} neurons")
+
+        if self.pattern_size < self.num_neurons:
+            padded = np.full((len(chunk), self.num_neurons), -1.0)
+            padded[:, :self.pattern_size] = chunk
+            chunk = padded
+        self.gram += chunk.T @ chunk
+        self.count += len(chunk)
+
+    def update(self, source, chunk_size=4096, skip=0, checkpoint=None, checkpoint_every=None):
+        """
+        Accumulate every pattern of a source (see iter_pattern_chunks).
+
+        Args:
+            skip: Leading patterns to skip, e.g. those already in a resumed accumulator.
+            checkpoint: Path the accumulator is saved to every checkpoint_every chunks and at the end.
+        """
+        chunks = 0
+        for chunk in iter_pattern_chunks(source, chunk_size):
+            if skip:
+                dropped = min(skip, len(chunk))
+                chunk, skip = chunk[dropped:], skip - dropped
+            self.add_chunk(chunk)
+            chunks += 1
+            if checkpoint and checkpoint_every and chunks % checkpoint_every == 0:
+                self.save(checkpoint)
+        if checkpoint:
+            self.save(checkpoint)
+        return self
+
+    def weights(self):
+        """Accumulated weights with a zero diagonal"""
+        weights = self.gram.copy()
+        np.fill_diagonal(weights, 0)
+        return weights
+
+    def save(self, path):
+        """Atomically write the accumulator to a .npz checkpoint"""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, gram=self.gram, count=self.count, num_neurons=self.num_neurons,
+                 pattern_size=-1 if self.pattern_size is None else self.pattern_size)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restore an accumulator saved with save()"""
+        with np.load(path) as data:
+            pattern_size = int(data['pattern_size'])
+            accumulator = cls(int(data['num_neurons']), None if pattern_size < 0 else pattern_size)
+            accumulator.gram = data['gram'].copy()
+            accumulator.count = int(data['count'])
+        return accumulator
@@ -1,10 +1,13 @@
 import numpy as np
 from .differential_robot import DifferentialRobot
 from .hopfield_control import SwarmHopfieldControl
+from .profiling import StageProfiler
+from .chunk_decoder import ChunkDecoder, rigid_body_lut
+from .checkpoint import write_checkpoint, read_checkpoint, prefixed, unprefixed
 
 class Swarm:
     """Manages a swarm of robots with integrated Hopfield pattern control"""
-    def __init__(self, rows=5, cols=3, speed=0.2, angular_speed=0.1):
+    def __init__(self, rows=5, cols=3, speed=0.2, angular_speed=0.1, backend='classic', beta=1.0):
         """
         Initialize swarm with Hopfield network integration.
 
@@ -13,34 +16,58 @@ class Swarm:
             cols: Number of columns in the grid.
             speed: Fixed speed of the swarm's center.
             angular_speed: Angular speed for turning.
+            backend: Recall backend of the Hopfield control, 'classic' or 'modern'.
+            beta: Inverse temperature of the modern backend.
         """
-        from .hopfield import create_grid_positions
+        self._init_runtime(rows, cols, speed, angular_speed, backend, beta)
+
+        # Create robot instances and Hopfield control
+        self._create_robots(rows, cols)
+        self._initialize_patterns()
 
-        # Store initialization parameters
+    def _init_runtime(self, rows, cols, speed, angular_speed, backend, beta):
+        """Settings and runtime state; everything __init__ sets up except robots and patterns, shared with restore"""
         self.rows = rows
         self.cols = cols
         self.speed = speed
         self.angular_speed = angular_speed
+        self.backend = backend
+        self.beta = beta
+        self.tick = 0
+        self.recall_state = -1  # Stored pattern index matched by the last recall, -1 if none
+        self.current_pattern = 0  # 0 for left turn, 1 for right turn
+        self.update_hooks = []
+        self.profiler = StageProfiler()
+        self.decoder = ChunkDecoder(rigid_body_lut())
 
-        # Create robot instances and Hopfield control
-        self._create_robots(rows, cols)
-        self._initialize_patterns()
+    def _bind_robots(self, positions, velocities, max_speeds=None):
+        """Robot state lives in shared arrays; each robot holds views into its row"""
+        self.positions = positions
+        self.velocities = velocities
+        self.robots = [DifferentialRobot(i) for i in range(len(positions))]
+        for i, robot in enumerate(self.robots):
+            robot.position = positions[i]
+            robot.velocity = velocities[i]
+            if max_speeds is not None:
+                robot.max_speed = float(max_speeds[i])
+        self.max_speeds = np.array([robot.max_speed for robot in self.robots], dtype=np.float64)
 
     def _create_robots(self, rows, cols):
         """Initialize robot positions in grid pattern"""
         from .hopfield import create_grid_positions
         grid_positions = create_grid_positions(rows, cols)
-        self.robots = [DifferentialRobot(i, (x, y)) for i, (x, y) in enumerate(grid_positions)]
+        positions = np.array(grid_positions, dtype=np.float64).reshape(-1, 2)
+        self._bind_robots(positions, np.zeros_like(positions))
 
         # Initialize Hopfield control system
         self.hopfield = SwarmHopfieldControl(
             robot_positions=grid_positions,
             speed=self.speed,
-            angular_speed=self.angular_speed
+            angular_speed=self.angular_speed,
+            backend=self.backend,
+            beta=self.beta
         )
 
-        self.current_pattern = 0  # 0 for left turn, 1 for right turn
-
     def set_pattern(self, pattern_idx: int):
         """Set movement pattern (0 for left turn, 1 for right turn)"""
         if not hasattr(self.hopfield, 'velocity_patterns'):
@@ -64,36 +91,58 @@ class Swarm:
             print(f"[WARNING] Invalid pattern index {self.current_pattern}, resetting to 0")
             self.current_pattern = 0
             
-        # Get the pattern from Hopfield control
-        pattern = self.hopfield.velocity_patterns[self.current_pattern]
-        
-        # Update each robot's velocity based on its chunk of the pattern
-        for i, robot in enumerate(self.robots):
-            # Extract the 4 neurons for this robot
-            start_idx = i * 4
-            neuron_chunk = pattern[start_idx:start_idx + 4]
-            
-            # Get swarm center and angular velocity
-            center = np.mean([r.position for r in self.robots], axis=0)
-            angular_velocity = 0.1 * (1 if self.current_pattern == 1 else -1)
-            
-            # Set velocity using rigid body transformation
-            robot.set_velocity_from_chunk(
-                neuron_chunk,
-                center_position=center,
-                angular_velocity=angular_velocity
-            )
-            
-            # Update position
-            robot.update_position(dt)
+        # Decode the current pattern into per-robot (linear, angular) commands
+        with self.profiler.stage('pattern_lookup'):
+            commands = self.decoder.pattern_commands(self.hopfield.velocity_patterns, self.current_pattern)
+
+        # Rigid body transformation around the swarm center, all robots at once
+        with self.profiler.stage('velocity_mapping'):
+            linear_speed = commands[:, 0] * self.max_speeds
+            angular_speed = commands[:, 1] * self.max_speeds
+            r = self.positions - self.positions.mean(axis=0)
+            self.velocities[:, 0] = linear_speed - angular_speed * r[:, 1]
+            self.velocities[:, 1] = angular_speed * r[:, 0]
+
+            # Speed limiting
+            speed = np.linalg.norm(self.velocities, axis=1)
+            limited = speed > self.max_speeds
+            self.velocities[limited] *= (self.max_speeds[limited] / speed[limited])[:, None]
+
+        with self.profiler.stage('integration'):
+            self.positions += self.velocities * dt
+
+        self.tick += 1
+        for hook in self.update_hooks:
+            hook(self, dt)
+
+    def stats(self):
+        """Per-stage timing histograms (count, total, mean, p50, p99, max in seconds)"""
+        return self.profiler.stats()
+
+    def add_update_hook(self, hook):
+        """Register a callable invoked as hook(swarm, dt) after every update"""
+        if hook not in self.update_hooks:
+            self.update_hooks.append(hook)
+
+    def remove_update_hook(self, hook):
+        """Unregister a previously added update hook"""
+        if hook in self.update_hooks:
+            self.update_hooks.remove(hook)
 
     def get_positions(self) -> np.ndarray:
         """Get current positions of all robots"""
-        return np.array([robot.position for robot in self.robots])
+        return self.positions.copy()
+
+    def get_velocities(self) -> np.ndarray:
+        """Get current velocities of all robots"""
+        return self.velocities.copy()
 
     def recall_pattern(self, input_pattern, max_iter=10):
         """Recall closest stored pattern using Hopfield network"""
-        return self.hopfield.recall_pattern(input_pattern, max_iter)
+        with self.profiler.stage('recall'):
+            recalled = self.hopfield.recall_pattern(input_pattern, max_iter)
+        self.recall_state, _ = self.hopfield.pattern_index.best(recalled)
+        return recalled
 
     def save_patterns(self, filename: str):
         """Save current velocity patterns to file"""
@@ -106,7 +155,45 @@ class Swarm:
         data = np.load(filename)
         self.hopfield.velocity_patterns = data['patterns']
         self.hopfield.encoded_patterns = data['encodings']
-        self.hopfield.hopfield_weights = self.hopfield.train_hopfield_network()
+        self.hopfield.hopfield_weights = None  # Retrained on first recall
+
+    def checkpoint(self, path):
+        """Save robot state, current pattern and the Hopfield control (with trained weights)"""
+        hopfield_meta, hopfield_arrays = self.hopfield.checkpoint_state()
+        meta = {
+            'rows': self.rows,
+            'cols': self.cols,
+            'speed': self.speed,
+            'angular_speed': self.angular_speed,
+            'backend': self.backend,
+            'beta': self.beta,
+            'tick': self.tick,
+            'recall_state': int(self.recall_state),
+            'current_pattern': int(self.current_pattern),
+            'hopfield': hopfield_meta,
+        }
+        arrays = {'positions': self.positions, 'velocities': self.velocities, 'max_speeds': self.max_speeds}
+        arrays.update(prefixed(hopfield_arrays, 'hopfield.'))
+        write_checkpoint(path, type(self).__name__, meta, arrays)
+
+    @classmethod
+    def restore(cls, path, mode='c'):
+        """
+        Warm-start a swarm from checkpoint() without touching the pattern file or retraining.
+        Large arrays (weights, patterns) stay memory-mapped copy-on-write by default, so
+        many variants can be forked from one checkpoint.
+        """
+        meta, arrays = read_checkpoint(path, mode, kind=cls.__name__)
+        swarm = cls.__new__(cls)
+        swarm._init_runtime(meta['rows'], meta['cols'], meta['speed'], meta['angular_speed'],
+                            meta['backend'], meta['beta'])
+        swarm.tick = meta['tick']
+        swarm.recall_state = meta['recall_state']
+        swarm.current_pattern = meta['current_pattern']
+
+        swarm.hopfield = SwarmHopfieldControl.from_checkpoint_state(meta['hopfield'], unprefixed(arrays, 'hopfield.'))
+        swarm._bind_robots(np.array(arrays['positions']), np.array(arrays['velocities']), arrays['max_speeds'])
+        return swarm
 
     def _initialize_patterns(self):
         """Initialize movement patterns for left and right turns"""
@@ -0,0 +1,82 @@
+import numpy as np
+
+NEURONS_PER_ROBOT = 4
+
+
+class TiledWeights:
+    """Hebbian weights of patterns made of one per-robot motif, stored without expansion
+
+    Every stored pattern must have the form p_k = u_k ⊗ m_k: a motif m_k of one
+    robot's neurons repeated over the robots, with a per-robot sign u_k (all ones
+    for plain tiling such as [1, -1, 1, -1] * num_robots). Then
+
+        W = (1/K) Σ_k (u_k u_kᵀ) ⊗ (m_k m_kᵀ)  with the diagonal zeroed,
+
+    which needs only the K motifs, the K robot coupling vectors and the diagonal:
+    O(K·N) memory instead of O(N²). W @ x is evaluated through those factors in
+    O(K·N) as well. The object supports `@`, `shape`, `column`, and `toarray`.
+    """
+
+    def __init__(self, motifs, couplings):
+        """
+        Args:
+            motifs: (K, B) per-robot neuron motifs.
+            couplings: (K, R) robot-level coefficient of each pattern's motif.
+        """
+        self.motifs = np.asarray(motifs, dtype=np.float64)
+        self.couplings = np.asarray(couplings, dtype=np.float64)
+        if self.motifs.shape[0] != self.couplings.shape[0]:
+            raise ValueError(f"Got {self.motifs.shape[0]} motifs for {self.couplings.shape[0]} coupling vectors")
+        self.num_patterns, self.block = self.motifs.shape
+        self.num_robots = self.couplings.shape[1]
+        size = self.num_robots * self.block
+        self.shape = (size, size)
+        self.dtype = np.dtype(np.float64)
+        # Diagonal of the un-zeroed sum, subtracted in every product
+        self.diagonal = ((self.couplings ** 2).T @ (self.motifs ** 2)).ravel() / self.num_patterns
+
+    @classmethod
+    def from_patterns(cls, patterns, neurons_per_robot=NEURONS_PER_ROBOT):
+        """Factor patterns into motifs and robot couplings; None if they are not tiled"""
+        patterns = np.asarray(patterns, dtype=np.float64)
+        if patterns.ndim != 2 or patterns.shape[1] % neurons_per_robot != 0:
+            return None
+        blocks = patterns.reshape(len(patterns), -1, neurons_per_robot)    # (K, R, B)
+        motifs = blocks[:, 0, :]
+        norms = np.einsum('kb,kb->k', motifs, motifs)
+        if np.any(norms == 0):
+            return None
+        couplings = np.einsum('krb,kb->kr', blocks, motifs) / norms[:, None]
+        if not np.allclose(blocks, couplings[:, :, None] * motifs[:, None, :]):
+            return None
+        return cls(motifs, couplings)
+
+    @property
+    def nbytes(self):
+        return self.motifs.nbytes + self.couplings.nbytes + self.diagonal.nbytes
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        blocks = x.reshape(self.num_robots, self.block)
+        # Projection of the state on every pattern: p_kᵀ x = u_kᵀ (X m_k)
+        overlaps = np.einsum('kr,rb,kb->k', self.couplings, blocks, self.motifs)
+        out = np.einsum('k,kr,kb->rb', overlaps, self.couplings, self.motifs).ravel()
+        return out / self.num_patterns - self.diagonal * x
+
+    def column(self, j):
+        """Column j (= row j, W is symmetric) in O(N)"""
+        r, b = divmod(j, self.block)
+        weights = self.couplings[:, r] * self.motifs[:, b] / self.num_patterns
+        column = np.einsum('k,kr,kc->rc', weights, self.couplings, self.motifs).ravel()
+        column[j] = 0.0
+        return column
+
+    def toarray(self):
+        """Expand to the dense (N, N) matrix, for inspection and tests"""
+        dense = sum(np.outer(p, p) for p in self.patterns()) / self.num_patterns
+        np.fill_diagonal(dense, 0)
+        return dense
+
+    def patterns(self):
+        """The (K, N) patterns this structure was built from"""
+        return (self.couplings[:, :, None] * self.motifs[:, None, :]).reshape(self.num_patterns, -1)
@@ -0,0 +1,386 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import sys
+import os
+import time
+import numpy as np
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+# Binary snapshot frame: header followed by float32 (x, y) per robot
+FRAME_HEADER = struct.Struct('<QIi')  # tick, num_robots, current pattern
+
+MAX_STEPS = 100  # Largest step batch per command; steps run on the event loop
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+def encode_snapshot(swarm):
+    """Pack the swarm's tick, pattern and positions into a compact binary frame"""
+    positions = swarm.positions.astype('<f4')
+    return FRAME_HEADER.pack(swarm.tick, len(positions), swarm.current_pattern) + positions.tobytes()
+
+
+def decode_snapshot(frame):
+    """Inverse of encode_snapshot: returns (tick, pattern, (N, 2) float32 positions)"""
+    tick, num_robots, pattern = FRAME_HEADER.unpack_from(frame)
+    positions = np.frombuffer(frame, dtype='<f4', offset=FRAME_HEADER.size).reshape(num_robots, 2)
+    return tick, pattern, positions
+
+
+class ClientStream:
+    """One attached WebSocket client with a single-slot mailbox.
+
+    Publishing overwrites the pending frame, so a slow consumer always receives
+    the latest snapshot and intermediate frames are dropped instead of queued.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = None
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+    def publish(self, frame):
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = frame
+        self.ready.set()
+
+    async def run(self):
+        while not self.closed:
+            await self.ready.wait()
+            self.ready.clear()
+            frame, self.pending = self.pending, None
+            if frame is None:
+                continue
+            self.writer.write(ws_frame(OP_BINARY, frame))
+            await self.writer.drain()
+            self.sent += 1
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+
+class HostedSwarm:
+    """A Swarm driven by its own tick loop, publishing snapshots to attached clients"""
+
+    def __init__(self, name, swarm, tick_rate=20.0, frame_rate=10.0, running=True):
+        self.name = name
+        self.swarm = swarm
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate
+        self.running = running
+        self.clients = set()
+        self.late_ticks = 0  # Ticks that started after their slot; missed slots are dropped
+        self.error = None    # Last exception from the tick loop, which pauses the swarm
+        self._last_frame = 0.0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._tick_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for client in list(self.clients):
+            client.close()
+
+    async def _tick_loop(self):
+        period = 1.0 / self.tick_rate
+        next_tick = time.monotonic()
+        while True:
+            if self.running:
+                try:
+                    self.step(1, period)
+                except Exception as e:
+                    print(f"[ERROR] Swarm {self.name} tick failed, pausing: {e!r}")
+                    self.error = repr(e)
+                    self.running = False
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                self.late_ticks += 1
+                next_tick = time.monotonic()  # Don't burst to catch up
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def step(self, steps=1, dt=None):
+        """Advance the swarm and publish a snapshot if the frame interval has elapsed"""
+        dt = dt if dt is not None else 1.0 / self.tick_rate
+        for _ in range(steps):
+            self.swarm.update(dt)
+        now = time.monotonic()
+        if now - self._last_frame >= 1.0 / self.frame_rate:
+            self.broadcast()
+            self._last_frame = now
+
+    def broadcast(self):
+        if not self.clients:
+            return
+        frame = encode_snapshot(self.swarm)
+        for client in self.clients:
+            client.publish(frame)
+
+    def set_pattern(self, pattern_idx):
+        self.swarm.set_pattern(int(pattern_idx))
+        return self.swarm.current_pattern
+
+    def describe(self):
+        return {
+            'name': self.name,
+            'robots': len(self.swarm.robots),
+            'rows': self.swarm.rows,
+            'cols': self.swarm.cols,
+            'tick': self.swarm.tick,
+            'pattern': self.swarm.current_pattern,
+            'running': self.running,
+            'clients': len(self.clients),
+            'error': self.error,
+        }
+
+    def command(self, message):
+        """Apply a JSON command dict: pattern, step, run or pause"""
+        cmd = message.get('cmd')
+        if cmd == 'pattern':
+            self.set_pattern(message['pattern'])
+        elif cmd == 'step':
+            steps = int(message.get('steps', 1))
+            if not 1 <= steps <= MAX_STEPS:
+                raise ValueError(f"steps must be between 1 and {MAX_STEPS}, got {steps}")
+            self.step(steps)
+        elif cmd == 'run':
+            self.error = None
+            self.running = True
+        elif cmd == 'pause':
+            self.running = False
+        else:
+            raise ValueError(f"Unknown command {cmd}")
+        return self.describe()
+
+
+def ws_accept_key(key):
+    return base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+
+
+def ws_frame(opcode, payload):
+    """Build a single unmasked server-to-client WebSocket frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def ws_read_frame(reader):
+    """Read one client frame, returning (opcode, unmasked payload)"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = (np.frombuffer(payload, dtype=np.uint8) ^ np.resize(np.frombuffer(mask, dtype=np.uint8), length)).tobytes()
+    return opcode, payload
+
+
+class SwarmServer:
+    """Local asyncio HTTP/WebSocket server hosting one or more Swarm instances
+
+    HTTP (JSON):
+        GET  /swarms                    list hosted swarms
+        GET  /swarms/<name>             describe one swarm
+        POST /swarms/<name>/pattern     {"pattern": idx}
+        POST /swarms/<name>/step        {"steps": n}, 1 <= n <= MAX_STEPS
+        POST /swarms/<name>/run         {"running": true|false}
+    WebSocket:
+        GET  /swarms/<name>/stream      binary snapshot frames; accepts JSON text commands
+                                        with the same fields plus "cmd": {"cmd": "pattern", "pattern": idx},
+                                        {"cmd": "step", "steps": n}, {"cmd": "run"}, {"cmd": "pause"}
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765):
+        self.host = host
+        self.port = port
+        self.swarms = {}
+        self._server = None
+
+    def add_swarm(self, name, swarm, tick_rate=20.0, frame_rate=10.0, running=True):
+        """Host a swarm under the given name; its tick loop starts with the server"""
+        if name in self.swarms:
+            raise ValueError(f"Swarm {name} is already hosted")
+        hosted = HostedSwarm(name, swarm, tick_rate, frame_rate, running)
+        self.swarms[name] = hosted
+        if self._server is not None:
+            hosted.start()
+        return hosted
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        for hosted in self.swarms.values():
+            hosted.start()
+        print(f"[INFO] Swarm server listening on http://{self.host}:{self.port}")
+
+    async def stop(self):
+        for hosted in self.swarms.values():
+            await hosted.stop()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            if headers.get('upgrade', '').lower() == 'websocket':
+                await self._handle_websocket(path, headers, reader, writer)
+                return
+
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+            status, payload = self._route(method, path, body)
+            data = json.dumps(payload).encode()
+            writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                         f"Connection: close\r\n\r\n".encode() + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            print(f"[WARNING] Dropping connection: {e}")
+        finally:
+            writer.close()
+
+    def _route(self, method, path, body):
+        parts = [p for p in path.split('?')[0].split('/') if p]
+        if parts == ['swarms'] and method == 'GET':
+            return 200, [hosted.describe() for hosted in self.swarms.values()]
+        if len(parts) < 2 or parts[0] != 'swarms':
+            return 404, {'error': f"Unknown path {path}"}
+        hosted = self.swarms.get(parts[1])
+        if hosted is None:
+            return 404, {'error': f"Unknown swarm {parts[1]}"}
+        if len(parts) == 2:
+            return (200, hosted.describe()) if method == 'GET' else (405, {'error': 'Use GET'})
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}
+
+        try:
+            message = json.loads(body or b'{}')
+            action = parts[2]
+            if action == 'pattern':
+                return 200, hosted.command({'cmd': 'pattern', 'pattern': message['pattern']})
+            if action == 'step':
+                return 200, hosted.command({'cmd': 'step', 'steps': message.get('steps', 1)})
+            if action == 'run':
+                return 200, hosted.command({'cmd': 'run' if message.get('running', True) else 'pause'})
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {'error': str(e)}
+        return 404, {'error': f"Unknown action {parts[2]}"}
+
+    async def _handle_websocket(self, path, headers, reader, writer):
+        parts = [p for p in path.split('?')[0].split('/') if p]
+        hosted = self.swarms.get(parts[1]) if len(parts) == 3 and parts[0] == 'swarms' and parts[2] == 'stream' else None
+        if hosted is None or 'sec-websocket-key' not in headers:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            return
+
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {ws_accept_key(headers['sec-websocket-key'])}\r\n\r\n").encode())
+        await writer.drain()
+
+        client = ClientStream(writer)
+        hosted.clients.add(client)
+        client.publish(encode_snapshot(hosted.swarm))
+        sender = asyncio.get_running_loop().create_task(client.run())
+
+        def sender_done(task):
+            # A failed send (peer reset) detaches the client right away and ends the reader
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                print(f"[WARNING] Dropping stream client: {task.exception()!r}")
+            hosted.clients.discard(client)
+            client.close()
+            writer.close()
+        sender.add_done_callback(sender_done)
+        try:
+            while not client.closed:
+                opcode, payload = await ws_read_frame(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(ws_frame(OP_CLOSE, payload[:2]))
+                    break
+                if opcode == OP_PING:
+                    writer.write(ws_frame(OP_PONG, payload))
+                elif opcode == OP_TEXT:
+                    try:
+                        reply = hosted.command(json.loads(payload))
+                    except (KeyError, TypeError, ValueError) as e:
+                        reply = {'error': str(e)}
+                    writer.write(ws_frame(OP_TEXT, json.dumps(reply).encode()))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            hosted.clients.discard(client)
+            client.close()
+            sender.cancel()
+
+
+if __name__ == '__main__':
+    import argparse
+    from api.core.swarm import Swarm
+
+    parser = argparse.ArgumentParser(description="Serve Swarm simulations over HTTP/WebSocket")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rows', type=int, default=5)
+    parser.add_argument('--cols', type=int, default=3)
+    parser.add_argument('--tick-rate', type=float, default=20.0)
+    parser.add_argument('--frame-rate', type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = SwarmServer(args.host, args.port)
+    server.add_swarm('default', Swarm(rows=args.rows, cols=args.cols),
+                     tick_rate=args.tick_rate, frame_rate=args.frame_rate)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
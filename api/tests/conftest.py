@@ -0,0 +1,19 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.swarm import Swarm
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Swarm stores its patterns in ../ui relative to the working directory
+    (tmp_path / 'ui').mkdir()
+    (tmp_path / 'core').mkdir()
+    monkeypatch.chdir(tmp_path / 'core')
+    return tmp_path
+
+@pytest.fixture
+def swarm(workdir):
+    return Swarm(rows=2, cols=2)
@@ -0,0 +1,43 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.async_engine import AsyncRecallEngine
+from api.core.hopfield import HopfieldNetwork
+
+def hebbian(patterns):
+    weights = patterns.T @ patterns
+    np.fill_diagonal(weights, 0)
+    return weights.astype(np.float64)
+
+def test_incremental_field_stays_exact():
+    """The maintained field equals W·s after every flip"""
+    rng = np.random.default_rng(5)
+    patterns = rng.choice([-1, 1], size=(4, 60))
+    engine = AsyncRecallEngine(hebbian(patterns), order='random', seed=0)
+    engine.reset(rng.choice([-1, 1], size=60))
+    while engine.step() is not None:
+        assert np.allclose(engine.field, engine.weights @ engine.state)
+    assert len(engine.unstable()) == 0
+
+def test_settles_noisy_pattern_with_few_flips():
+    """A lightly corrupted pattern is restored by flipping only the corrupted neurons"""
+    rng = np.random.default_rng(6)
+    patterns = rng.choice([-1, 1], size=(3, 100))
+    probe = patterns[1].copy()
+    probe[:5] *= -1
+    state, flips, converged = AsyncRecallEngine(hebbian(patterns)).run(probe)
+    assert converged
+    assert flips == 5
+    assert np.array_equal(state, patterns[1])
+
+def test_network_recall_async():
+    """HopfieldNetwork exposes asynchronous recall with a convergence flag"""
+    patterns = [np.array([1, -1, 1, -1, 1, -1, 1, -1]), np.array([1, 1, 1, 1, -1, -1, -1, -1])]
+    network = HopfieldNetwork(8)
+    network.train(patterns)
+    recalled, converged = network.recall_async(np.array([1, -1, 1, -1, 1, -1, 1, 1]))
+    assert converged
+    assert np.array_equal(recalled, patterns[0])
@@ -0,0 +1,91 @@
+import json
+import os
+import tarfile
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api import backup
+from api.backup import backup_files, iter_backup_sources
+
+def make_tree(root):
+    (root / 'core').mkdir()
+    (root / 'core' / 'a.py').write_text('a = 1\n')
+    (root / 'b.json').write_text('{}')
+    (root / 'notes.txt').write_text('skip')
+    (root / 'backup_old').mkdir()
+    (root / 'backup_old' / 'c.py').write_text('old')
+
+def test_walk_prunes_backup_dirs(tmp_path):
+    make_tree(tmp_path)
+    rels = sorted(rel for _, rel in iter_backup_sources(tmp_path))
+    assert rels == ['b.json', os.path.join('core', 'a.py')]
+
+def test_full_backup_keeps_timestamped_copies(tmp_path):
+    make_tree(tmp_path)
+    out = Path(backup_files(tmp_path))
+    files = sorted(p.relative_to(out).as_posix() for p in out.rglob('*') if p.is_file())
+    stamp = out.name[len('backup_'):]
+    assert files == [f'b_{stamp}.json', f'core/a_{stamp}.py']
+
+def test_incremental_dedups_unchanged_files(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    first = Path(backup_files(tmp_path, incremental=True))
+
+    hashed = []
+    original = backup.file_hash
+    monkeypatch.setattr(backup, 'file_hash', lambda path: hashed.append(path) or original(path))
+    (tmp_path / 'b.json').write_text('{"x": 1}')
+    os.rename(first, tmp_path / 'backup_first')  # Same-minute runs share a timestamp
+    second = Path(backup_files(tmp_path, incremental=True))
+
+    assert [Path(p).name for p in hashed] == ['b.json']  # Unchanged file reused its manifest hash
+    manifest = json.loads((second / 'manifest.json').read_text())
+    stamp = second.name[len('backup_'):]
+    a_copy = second / 'core' / f'a_{stamp}.py'
+    assert a_copy.read_text() == 'a = 1\n'
+    assert os.stat(a_copy).st_nlink >= 2                 # Linked to the shared object
+    objects = [p for p in (tmp_path / 'backup_store' / 'objects').rglob('*') if p.is_file()]
+    assert len(objects) == 3 and len(manifest) == 2
+
+def test_incremental_archive_holds_changed_files(tmp_path):
+    make_tree(tmp_path)
+    backup_files(tmp_path, incremental=True)
+    (tmp_path / 'core' / 'a.py').write_text('a = 2\n')
+    out = backup_files(tmp_path, incremental=True, archive=True)
+    with tarfile.open(out) as tar:
+        names = sorted(tar.getnames())
+        manifest = json.load(tar.extractfile('manifest.json'))
+    assert len(names) == 2 and names[1] == 'manifest.json' and names[0].startswith('core/a_')
+    assert sorted(manifest) == ['b.json', os.path.join('core', 'a.py')]
+
+def test_incremental_restores_pruned_objects(tmp_path):
+    make_tree(tmp_path)
+    first = Path(backup_files(tmp_path, incremental=True))
+    os.rename(first, tmp_path / 'backup_first')
+    objects = tmp_path / 'backup_store' / 'objects'
+    for path in list(objects.rglob('*')):
+        if path.is_file():
+            path.unlink()                            # Store pruned, manifest kept
+    second = Path(backup_files(tmp_path, incremental=True))
+    stamp = second.name[len('backup_'):]
+    assert (second / 'core' / f'a_{stamp}.py').read_text() == 'a = 1\n'
+    assert len([p for p in objects.rglob('*') if p.is_file()]) == 2
+
+def test_incremental_stores_identical_files_once(tmp_path, monkeypatch):
+    for i in range(32):
+        package = tmp_path / f'pkg{i}'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+    stored = []
+    original = backup._store_object
+    monkeypatch.setattr(backup, '_store_object', lambda src, dst: stored.append(dst) or original(src, dst))
+    out = Path(backup_files(tmp_path, incremental=True, workers=16))
+
+    assert len(stored) == 1                          # One write per digest, not per file
+    objects = [p for p in (tmp_path / 'backup_store' / 'objects').rglob('*') if p.is_file()]
+    assert [p.name for p in objects] == [Path(stored[0]).name]   # No temp files left behind
+    assert len(json.loads((out / 'manifest.json').read_text())) == 32
+    copies = list(out.rglob('__init__*.py'))
+    assert len(copies) == 32 and all(p.read_text() == '' for p in copies)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.swarm import Swarm
+from api.core.hopfield import HopfieldNetwork
+from api.core.hopfield_control import SwarmHopfieldControl
+from api.core.checkpoint import write_checkpoint, read_checkpoint
+from phase2.hopfield import Hopfield
+
+def test_layout_roundtrip_and_copy_on_write(tmp_path):
+    path = tmp_path / 'x.ckpt'
+    arrays = {'a': np.arange(10.0), 'b': np.ones((3, 5), dtype=np.int8), 'empty': np.zeros((0, 4))}
+    write_checkpoint(path, 'Thing', {'k': 1}, arrays)
+    meta, loaded = read_checkpoint(path)
+    assert meta == {'k': 1}
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+        assert loaded[name].dtype == array.dtype
+    loaded['a'][0] = 99                                     # Private copy-on-write page
+    assert read_checkpoint(path)[1]['a'][0] == 0
+    with pytest.raises(ValueError, match="expected Other"):
+        read_checkpoint(path, kind='Other')
+
+def test_swarm_warm_start_continues_identically(workdir):
+    swarm = Swarm(rows=3, cols=2)
+    swarm.set_pattern(1)
+    for _ in range(7):
+        swarm.update()
+    swarm.hopfield.hopfield_weights                         # Train before checkpointing
+    swarm.checkpoint(workdir / 'swarm.ckpt')
+
+    restored = Swarm.restore(workdir / 'swarm.ckpt')
+    assert set(vars(restored)) == set(vars(swarm))           # Same attributes as a constructed swarm
+    assert (restored.tick, restored.current_pattern) == (7, 1)
+    np.testing.assert_array_equal(restored.hopfield.hopfield_weights, swarm.hopfield.hopfield_weights)
+    for _ in range(5):
+        swarm.update()
+        restored.update()
+    np.testing.assert_array_equal(restored.get_positions(), swarm.get_positions())
+    np.testing.assert_array_equal(restored.robots[2].position, restored.positions[2])
+
+    forked = Swarm.restore(workdir / 'swarm.ckpt')          # Variants don't affect each other
+    forked.set_pattern(0)
+    forked.update()
+    assert Swarm.restore(workdir / 'swarm.ckpt').tick == 7
+
+def test_hopfield_networks_roundtrip(tmp_path):
+    network = HopfieldNetwork(400)
+    network.train(np.random.default_rng(0).choice([-1, 1], size=(5, 400)))
+    network.checkpoint(tmp_path / 'net.ckpt')
+    restored = HopfieldNetwork.restore(tmp_path / 'net.ckpt')
+    assert isinstance(restored.weights, np.memmap)        # Mapped, not read
+    np.testing.assert_array_equal(restored.weights, network.weights)
+    probe = np.random.default_rng(1).choice([-1, 1], size=400)
+    np.testing.assert_array_equal(restored.recall(probe), network.recall(probe))
+
+    control = SwarmHopfieldControl(robot_positions=[[0, 0], [1, 1]])
+    control.use_sparse_weights(radius=1)
+    control.checkpoint(tmp_path / 'control.ckpt')
+    assert SwarmHopfieldControl.restore(tmp_path / 'control.ckpt').connectivity == {'radius': 1}
+
+    hop = Hopfield(3, 3, 0.05, 4)
+    hop.update()
+    hop.checkpoint(tmp_path / 'hop.ckpt')
+    warm = Hopfield.restore(tmp_path / 'hop.ckpt')
+    assert set(vars(warm)) == set(vars(hop))
+    np.testing.assert_array_equal(warm.neurons, hop.neurons)
+    assert warm.patterns == hop.patterns and warm.get_speed_mat() == hop.get_speed_mat()
@@ -0,0 +1,39 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.chunk_decoder import ChunkDecoder, ALL_CHUNKS, binary_lut, rigid_body_lut
+from api.core.differential_robot import DifferentialRobot
+
+def test_rigid_body_lut_matches_robot():
+    """Every table entry agrees with the scalar DifferentialRobot decode at the swarm center"""
+    decoder = ChunkDecoder(rigid_body_lut())
+    commands = decoder.decode(ALL_CHUNKS.ravel())
+    for chunk, (linear, angular) in zip(ALL_CHUNKS, commands):
+        robot = DifferentialRobot(0, (0.5, 1.0))
+        robot.set_velocity_from_chunk(chunk, center_position=np.zeros(2), angular_velocity=0.1)
+        expected = np.array([linear - angular, 0.5 * angular])
+        expected /= max(np.linalg.norm(expected), 1.0)
+        assert np.allclose(robot.velocity, expected)
+
+def test_binary_lut_matches_loop():
+    """Decoded velocities equal the original per-chunk comparisons"""
+    decoder = ChunkDecoder(binary_lut(0.2, 0.1))
+    state = np.array([1, -1, 1, -1, -1, 1, -1, 1, 1, 1, 1, 1])
+    expected = []
+    for i in range(0, len(state), 4):
+        f, b, l, r = state[i:i + 4]
+        expected.append([0.2 if f > b else -0.2, 0.1 if l > r else -0.1])
+    assert np.allclose(decoder.decode(state), expected)
+
+def test_pattern_commands_memoized_until_patterns_change():
+    """Commands are cached per pattern index and rebuilt for a new pattern set"""
+    decoder = ChunkDecoder(rigid_body_lut())
+    patterns = np.array([[1, -1, 1, -1] * 3, [1, -1, -1, 1] * 3])
+    first = decoder.pattern_commands(patterns, 1)
+    assert decoder.pattern_commands(patterns, 1) is first
+
+    replaced = patterns[::-1].copy()
+    assert not np.array_equal(decoder.pattern_commands(replaced, 1), first)
@@ -0,0 +1,55 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.swarm import Swarm
+from api.core.fleet import SwarmFleet
+
+def test_fleet_matches_independent_swarms(workdir):
+    """One fleet tick equals updating every Swarm separately"""
+    fleet = SwarmFleet(3, rows=3, cols=2)
+    swarms = [Swarm(rows=3, cols=2) for _ in range(3)]
+    for i, pattern in enumerate([0, 1, 1]):
+        fleet[i].set_pattern(pattern)
+        swarms[i].set_pattern(pattern)
+
+    for _ in range(20):
+        fleet.update(0.05)
+        for swarm in swarms:
+            swarm.update(0.05)
+
+    for handle, swarm in zip(fleet, swarms):
+        np.testing.assert_allclose(handle.get_positions(), swarm.get_positions(), atol=1e-12)
+        np.testing.assert_allclose(handle.get_velocities(), swarm.get_velocities(), atol=1e-12)
+    assert fleet.positions.shape == (3, 6, 2)
+    assert fleet.tick == 20
+
+def test_handle_update_advances_only_its_swarm(workdir):
+    """A handle's update leaves the other swarms untouched"""
+    fleet = SwarmFleet(2, rows=2, cols=2)
+    before = fleet.positions.copy()
+    fleet[1].set_pattern(1)
+    fleet[1].update(0.1)
+    np.testing.assert_array_equal(fleet.positions[0], before[0])
+    assert not np.array_equal(fleet.positions[1], before[1])
+    assert fleet[1].positions.base is not None  # View into the fleet tensor
+
+def test_handle_update_advances_its_tick(workdir):
+    fleet = SwarmFleet(3, rows=2, cols=2)
+    fleet[0].update()
+    fleet[0].update()
+    fleet.update(swarms=[0, 2])
+    fleet.update()
+    assert [handle.tick for handle in fleet] == [4, 1, 2]
+    assert fleet.tick == 1
+
+def test_invalid_pattern_resets_to_zero(workdir):
+    fleet = SwarmFleet(2, rows=2, cols=2)
+    fleet[0].set_pattern(1)
+    fleet[0].set_pattern(7)
+    assert fleet[0].current_pattern == 0
+
+    fleet.set_pattern([0, 1], [1, -1])          # Only the invalid entry is reset
+    np.testing.assert_array_equal(fleet.current_pattern, [1, 0])
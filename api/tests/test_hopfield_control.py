@@ -31,3 +31,22 @@ def test_pattern_validation(sample_controller):
     with pytest.raises(ValueError):
         invalid_pattern = np.array([1, -1, 0, 1] * 2)  # 0 is invalid
         sample_controller.encode_patterns(invalid_pattern)
+
+def test_weights_trained_lazily(sample_controller):
+    """Weights are built on first access and rebuilt after the patterns are replaced"""
+    assert sample_controller._hopfield_weights is None
+    weights = sample_controller.hopfield_weights
+    assert weights.shape == (8, 8)
+    assert sample_controller.hopfield_weights is weights
+
+    sample_controller.generate_default_patterns(1, 2, 2)
+    assert sample_controller._hopfield_weights is None
+    assert np.array_equal(sample_controller.hopfield_weights, weights)
+
+def test_import_does_not_load_scipy():
+    """Importing the controller stays free of heavy optional dependencies"""
+    import subprocess
+    root = Path(__file__).parent.parent.parent
+    code = "import sys; import api.core.hopfield_control; print('scipy' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == 'False'
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.hopfield import create_grid_positions
+from api.core.metrics import FormationMetrics
+from api.core.swarm import Swarm
+
+def rotate(points, angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return points @ np.array([[c, s], [-s, c]])
+
+def test_rigid_motion_is_not_distortion():
+    grid = np.array(create_grid_positions(4, 5))
+    metrics = FormationMetrics(grid)
+    center = grid.mean(axis=0)
+    latest = metrics.observe(rotate(grid - center, 0.7) + center + [3.0, 4.0])
+    assert latest['centroid_drift'] == pytest.approx(5.0)
+    assert latest['rotation'] == pytest.approx(0.7)
+    assert latest['distortion'] == pytest.approx(0.0, abs=1e-6)
+    assert latest['dispersion'] == pytest.approx(np.sqrt(np.mean(np.sum((grid - center) ** 2, axis=1))))
+
+    noisy = grid + np.random.default_rng(0).normal(0, 0.1, grid.shape)
+    assert metrics.observe(noisy)['distortion'] > 0.05
+
+def test_running_aggregates_and_window_match_offline():
+    grid = np.array(create_grid_positions(3, 3))
+    rng = np.random.default_rng(1)
+    frames = [grid + rng.normal(0, 0.2, grid.shape) for _ in range(20)]
+    metrics = FormationMetrics(grid, window=8)
+    values = [metrics.observe(frame, tick) for tick, frame in enumerate(frames)]
+
+    dispersion = np.array([v['dispersion'] for v in values])
+    summary = metrics.summary()['dispersion']
+    assert summary['count'] == 20
+    assert summary['mean'] == pytest.approx(dispersion.mean())
+    assert summary['std'] == pytest.approx(dispersion.std())
+    assert summary['max'] == pytest.approx(dispersion.max())
+
+    ticks, history = metrics.history()
+    np.testing.assert_array_equal(ticks, np.arange(12, 20))
+    np.testing.assert_allclose(history['dispersion'], dispersion[12:])
+
+def test_hook_follows_swarm_updates(workdir):
+    swarm = Swarm(rows=3, cols=3)
+    metrics = FormationMetrics.from_swarm(swarm).attach(swarm)
+    for _ in range(5):
+        swarm.update(0.05)
+    latest = metrics.latest()
+    assert metrics.count == 5 and latest['tick'] == swarm.tick
+    np.testing.assert_allclose(latest['centroid'], swarm.positions.mean(axis=0))
+    offline = FormationMetrics(create_grid_positions(3, 3)).observe(swarm.positions)
+    for name in ('centroid_drift', 'dispersion', 'rotation', 'distortion'):
+        assert latest[name] == pytest.approx(offline[name])
+
+def test_rotation_unwraps_past_pi(workdir):
+    swarm = Swarm(rows=3, cols=3)
+    swarm.set_pattern(1)                        # Turns continuously
+    metrics = FormationMetrics.from_swarm(swarm, window=500).attach(swarm)
+    for _ in range(500):
+        swarm.update(0.05)
+    _, history = metrics.history()
+    rotation = history['rotation']
+    assert np.abs(np.diff(rotation)).max() < 0.1        # No jumps of 2*pi between ticks
+    assert abs(rotation[-1]) > np.pi
+    summary = metrics.summary()['rotation']
+    assert summary['mean'] == pytest.approx(rotation.mean())
+    assert min(abs(summary['min']), abs(summary['max'])) < 0.1  # Monotonic from ~0
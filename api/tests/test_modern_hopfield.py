@@ -0,0 +1,36 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.modern_hopfield import ModernHopfieldNetwork
+from api.core.hopfield_control import SwarmHopfieldControl
+
+def test_one_step_retrieval_of_noisy_pattern():
+    """A corrupted probe is restored in a single step from a large library"""
+    rng = np.random.default_rng(1)
+    patterns = rng.choice([-1, 1], size=(500, 64))
+    probe = patterns[42].copy()
+    probe[:10] *= -1
+
+    retrieved, attention = ModernHopfieldNetwork(patterns, beta=0.5).retrieve(probe, max_iter=1)
+    assert np.array_equal(np.sign(retrieved), patterns[42])
+    assert np.argmax(attention) == 42
+    assert np.isclose(attention.sum(), 1.0)
+
+def test_batch_retrieval():
+    """Batches of probes are retrieved together"""
+    patterns = np.array([[1, -1, 1, -1], [1, 1, -1, -1]])
+    retrieved, attention = ModernHopfieldNetwork(patterns, beta=4.0).retrieve([[1, -1, 1, 1], [1, 1, -1, 1]])
+    assert attention.shape == (2, 2)
+    assert np.array_equal(np.sign(retrieved), patterns)
+
+def test_modern_backend_behind_recall_interface():
+    """recall_pattern returns the stored ±1 pattern and records its attention"""
+    controller = SwarmHopfieldControl([[0, 0], [1, 1]], backend='modern', beta=2.0)
+    probe = controller.encoded_patterns[1].copy()
+    probe[0] *= -1
+    assert np.array_equal(controller.recall_pattern(probe), controller.encoded_patterns[1])
+    assert np.argmax(controller.last_attention) == 1
+    assert controller._hopfield_weights is None
@@ -0,0 +1,36 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.pattern_index import PatternIndex
+
+def test_matches_equal_elementwise_count():
+    """Vectorized match counts agree with the per-pattern np.sum(a == b) loop"""
+    rng = np.random.default_rng(0)
+    patterns = rng.choice([-1, 1], size=(50, 32))
+    probes = rng.choice([-1, 0, 1], size=(10, 32))
+    index = PatternIndex(patterns)
+    expected = np.array([[np.sum(p == s) for s in patterns] for p in probes])
+    assert np.array_equal(index.matches(probes), expected)
+    assert np.array_equal(index.matches(probes[0]), expected[0])
+
+def test_topk_single_and_batch():
+    """top-k returns the best patterns ordered by score, lowest index first on ties"""
+    patterns = np.array([[1, 1, 1, 1], [1, 1, 1, -1], [-1, -1, -1, -1], [1, 1, -1, -1]])
+    index = PatternIndex(patterns)
+    indices, scores = index.topk([1, 1, 1, 1], k=2)
+    assert list(indices) == [0, 1]
+    assert list(scores) == [4, 3]
+
+    indices, scores = index.topk([[1, 1, 1, 1], [-1, -1, -1, -1]], k=3)
+    assert indices.shape == (2, 3)
+    assert list(indices[1]) == [2, 3, 1]
+
+def test_cosine_best():
+    """Cosine scoring picks the closest pattern with score 1 for an exact match"""
+    patterns = np.array([[1, -1, 1, -1], [1, -1, -1, 1]])
+    idx, score = PatternIndex(patterns).best([1, -1, -1, 1], metric='cosine')
+    assert idx == 1
+    assert np.isclose(score, 1.0)
@@ -0,0 +1,59 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.profiling import StageProfiler, ProfiledProxy
+from api.core.swarm import Swarm
+
+def test_stage_histograms():
+    """Stages accumulate counts and ordered percentiles"""
+    profiler = StageProfiler()
+    for elapsed in range(1, 101):
+        profiler.record('lookup', elapsed * 1000)
+    stats = profiler.stats()['lookup']
+    assert stats['count'] == 100
+    assert stats['p50'] <= stats['p99'] <= stats['max']
+    assert stats['mean'] == pytest.approx(50.5e-6)
+
+def test_proxy_times_each_call():
+    """Every proxied API call is counted under its own name"""
+    class FakeSim:
+        def getObject(self, path):
+            return 7
+    profiler = StageProfiler()
+    sim = ProfiledProxy(FakeSim(), profiler)
+    assert sim.getObject('/Robot0_0') == 7
+    sim.getObject('/Robot0_1')
+    assert profiler.stats()['rpc.getObject']['count'] == 2
+
+def test_swarm_stats(swarm):
+    """Swarm.update reports lookup, velocity mapping and integration stages"""
+    for _ in range(3):
+        swarm.update()
+    stats = swarm.stats()
+    for stage in ('pattern_lookup', 'velocity_mapping', 'integration'):
+        assert stats[stage]['count'] == 3
+
+def test_stats_while_recording_from_another_thread():
+    profiler = StageProfiler(window=64)
+    stop = threading.Event()
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)                         # Switch threads as often as possible
+    def worker():
+        i = 0
+        while not stop.is_set():
+            profiler.record(f'stage{i % 10}', 1000)     # Keeps adding stages and samples
+            i += 1
+    thread = threading.Thread(target=worker)
+    thread.start()
+    try:
+        for _ in range(50):
+            profiler.stats()
+    finally:
+        sys.setswitchinterval(interval)
+        stop.set()
+        thread.join()
+    assert sum(s['count'] for s in profiler.stats().values()) > 0
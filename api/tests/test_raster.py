@@ -0,0 +1,37 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.ui.raster import RasterRenderer, to_pixels
+
+def test_to_pixels_matches_scale_position():
+    """Same mapping as SwarmVisualizer.scale_position for a 600px canvas over [-10, 10]"""
+    positions = np.array([[0.0, 0.0], [10.0, -10.0], [-2.5, 4.0]])
+    scale = 600 / 20
+    expected = [(p[0] * scale + 300, 300 - p[1] * scale) for p in positions]
+    np.testing.assert_allclose(to_pixels(positions, 600), expected)
+
+def test_separate_robots_drawn_as_discs():
+    renderer = RasterRenderer(100, robot_radius=2)
+    frame = renderer.render(np.array([[10.0, 10.0], [50.0, 60.0], [500.0, 5.0]]))  # Last is off-screen
+    assert renderer.mode == 'discs'
+    assert tuple(frame[10, 10]) == (0, 0, 255) and tuple(frame[60, 52]) == (0, 0, 255)
+    assert tuple(frame[0, 0]) == (255, 255, 255)
+    assert (frame == [0, 0, 255]).all(axis=2).sum() == 2 * len(renderer.offsets)
+
+def test_overlapping_robots_switch_to_density():
+    renderer = RasterRenderer(100, robot_radius=5)
+    pixels = np.array([[20.0, 20.0]] * 9 + [[21.0, 20.0], [80.0, 80.0]])
+    frame = renderer.render(pixels)
+    assert renderer.mode == 'density'
+    assert tuple(frame[20, 20]) == tuple(renderer.lut[255])    # Densest pixel maps to the top of the ramp
+    assert tuple(frame[80, 80]) != (255, 255, 255)              # A lone robot is still visible
+
+def test_large_swarm_ppm_frame():
+    renderer = RasterRenderer(600)
+    positions = np.random.default_rng(0).normal(scale=3.0, size=(100_000, 2))
+    data = renderer.ppm(to_pixels(positions, 600))
+    assert renderer.mode == 'density'
+    assert data.startswith(b'P6 600 600 255 ') and len(data) == len(renderer.header) + 600 * 600 * 3
@@ -0,0 +1,91 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.hopfield import HopfieldNetwork, create_grid_positions
+from api.core.hopfield_control import SwarmHopfieldControl
+from api.core.recall_cache import RecallCache, probe_key
+
+def test_probe_key_packs_signs():
+    probe = np.array([1, -1, -1, 1, 1, 1, -1, -1, 1])
+    assert probe_key(probe, 10) == probe_key(probe.astype(float), 10)
+    assert probe_key(probe, 10) != probe_key(probe, 5)
+    flipped = probe.copy()
+    flipped[-1] = -1
+    assert probe_key(probe, 10) != probe_key(flipped, 10)
+    assert probe_key(np.array([0.5, -1.0]), 1) != probe_key(np.array([1.0, -1.0]), 1)
+
+def test_lru_eviction_and_source_invalidation():
+    cache = RecallCache(maxsize=2)
+    weights = np.eye(2)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.lookup(key, (weights,), lambda: key)
+    assert list(cache.entries) == ['a', 'c'] and (cache.hits, cache.misses) == (1, 3)
+    cache.lookup('a', (np.eye(2),), lambda: 'new')            # Replaced weights empty the cache
+    assert len(cache) == 1 and cache.misses == 4
+
+def test_control_cache_matches_and_invalidates():
+    control = SwarmHopfieldControl(robot_positions=create_grid_positions(3, 3))
+    control.generate_default_patterns(3, 3, 2)
+    probe = control.encoded_patterns[1].astype(float)
+    probe[:6] *= -1
+    expected = control.recall_pattern(probe)
+    control.use_recall_cache(maxsize=8)
+    for _ in range(4):
+        np.testing.assert_array_equal(control.recall_pattern(probe), expected)
+    assert control.infer_direction(probe)[0] == 1               # Built on recall_pattern, so also cached
+    assert control.recall_cache.stats()['hits'] == 4
+
+    control.hopfield_weights = -control.hopfield_weights
+    assert len(control.recall_cache) == 0
+    np.testing.assert_array_equal(control.recall_pattern(probe), control._recall(probe, 10))
+
+    result = control.recall_pattern(probe)
+    result[:] = 0                                              # Callers get copies
+    assert np.all(control.recall_pattern(probe) != 0)
+
+def test_network_cache_cleared_by_training():
+    rng = np.random.default_rng(2)
+    patterns = rng.choice([-1, 1], size=(3, 32))
+    network = HopfieldNetwork(32)
+    network.train(patterns[:1])
+    network.use_recall_cache()
+    probe = patterns[1]
+    first = network.recall(probe)
+    np.testing.assert_array_equal(network.recall(probe), first)
+    assert network.recall_cache.hits == 1
+    network.train(patterns[1:])
+    assert len(network.recall_cache) == 0
+    uncached = HopfieldNetwork(32)
+    uncached.train(patterns[:1])
+    uncached.train(patterns[1:])
+    np.testing.assert_array_equal(network.recall(probe), uncached.recall(probe))
+
+def test_network_cache_follows_weight_edits():
+    rng = np.random.default_rng(5)
+    patterns = rng.choice([-1, 1], size=(2, 24))
+    network = HopfieldNetwork(24)
+    network.train(patterns)
+    network.use_recall_cache()
+    probe = patterns[0]
+
+    def fresh():
+        return network._recall(probe, 5)
+
+    network.recall(probe)
+    network.weights = -network.weights                          # Assignment clears the cache
+    assert len(network.recall_cache) == 0
+    np.testing.assert_array_equal(network.recall(probe), fresh())
+
+    network.weights *= -1                                       # So does augmented assignment
+    assert len(network.recall_cache) == 0
+    np.testing.assert_array_equal(network.recall(probe), fresh())
+
+    stale = network.recall(probe)
+    network.weights[:] = -network.weights                       # Element edits need invalidate()
+    np.testing.assert_array_equal(network.recall(probe), stale)
+    network.recall_cache.invalidate()
+    np.testing.assert_array_equal(network.recall(probe), fresh())
+    assert not np.array_equal(fresh(), stale)
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.scheduler import TickScheduler
+
+class FakeClock:
+    """Manual clock: work advances it explicitly, sleep advances it by the slept time"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def make(clock, recall_cost=0.0, step_cost=0.0, **kwargs):
+    log = {'recalls': 0, 'decisions': []}
+    def recall():
+        clock.now += recall_cost
+        log['recalls'] += 1
+        return log['recalls']
+    def step(dt, decision):
+        clock.now += step_cost
+        log['decisions'].append(decision)
+    scheduler = TickScheduler(step, recall, clock=clock, sleep=clock.sleep, **kwargs)
+    return scheduler, log
+
+def test_fixed_grid_and_decimation():
+    clock = FakeClock()
+    scheduler, log = make(clock, recall_cost=0.01, step_cost=0.01, period=0.05, recall_every=3)
+    scheduler.run(ticks=9)
+    assert log['recalls'] == 3
+    assert log['decisions'] == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+    assert abs(clock.now - (8 * 0.05 + 0.01)) < 1e-9        # Ticks start exactly on the 50 ms grid
+    assert scheduler.stats()['counters']['overruns'] == 0
+    assert scheduler.stats()['jitter']['max'] < 1e-9
+
+def test_slow_recall_is_skipped_and_decision_reused():
+    clock = FakeClock()
+    scheduler, log = make(clock, recall_cost=0.08, step_cost=0.01, period=0.05, decision=0)
+    scheduler.run(ticks=6)
+    counters = scheduler.stats()['counters']
+    assert log['recalls'] == 1                              # The first recall overran; later ones were skipped
+    assert log['decisions'] == [1] * 6
+    assert counters['overruns'] == 1 and counters['dropped_slots'] == 0
+    assert counters['skipped_recalls'] == 5
+
+def test_long_tick_drops_missed_slots():
+    clock = FakeClock()
+    costs = iter([0.01, 0.17, 0.01, 0.01])
+    scheduler = TickScheduler(lambda dt, d: setattr(clock, 'now', clock.now + next(costs)),
+                              period=0.05, clock=clock, sleep=clock.sleep)
+    scheduler.run(ticks=4)
+    counters = scheduler.stats()['counters']
+    assert counters['overruns'] == 1 and counters['dropped_slots'] == 2
+    assert abs(clock.now - (0.25 + 0.01)) < 1e-9            # Back on the grid, no catch-up burst
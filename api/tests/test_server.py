@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.server.app import SwarmServer, ClientStream, decode_snapshot, ws_read_frame
+
+async def http_request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(data)
+
+def test_http_commands(swarm):
+    """Pattern and step commands are applied to the hosted swarm"""
+    async def scenario():
+        server = SwarmServer(port=0)
+        server.add_swarm('main', swarm, running=False)
+        await server.start()
+        try:
+            status, reply = await http_request(server.port, 'POST', '/swarms/main/pattern', {'pattern': 1})
+            assert status == 200 and reply['pattern'] == 1
+            status, reply = await http_request(server.port, 'POST', '/swarms/main/step', {'steps': 3})
+            assert reply['tick'] == 3
+            status, reply = await http_request(server.port, 'POST', '/swarms/main/step', {'steps': 10 ** 8})
+            assert status == 400 and swarm.tick == 3        # Oversized batches never reach the tick loop
+            status, _ = await http_request(server.port, 'GET', '/swarms/missing')
+            assert status == 404
+        finally:
+            await server.stop()
+    asyncio.run(scenario())
+
+def test_websocket_stream(swarm):
+    """An attached client receives binary snapshots and can send JSON commands"""
+    async def scenario():
+        server = SwarmServer(port=0)
+        server.add_swarm('main', swarm, tick_rate=100, frame_rate=100)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            key = base64.b64encode(os.urandom(16)).decode()
+            writer.write(("GET /swarms/main/stream HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                          f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+            assert b'101' in await reader.readuntil(b'\r\n\r\n')
+
+            opcode, frame = await ws_read_frame(reader)
+            _, _, positions = decode_snapshot(frame)
+            assert opcode == 0x2 and positions.shape == (4, 2)
+
+            for command in ({'cmd': 'pause'}, {'cmd': 'pattern', 'pattern': 1}):
+                payload = json.dumps(command).encode()
+                mask = os.urandom(4)
+                masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+                writer.write(struct.pack('!BB', 0x81, 0x80 | len(payload)) + mask + masked)
+                while True:
+                    opcode, frame = await ws_read_frame(reader)
+                    if opcode == 0x1:
+                        reply = json.loads(frame)
+                        break
+                assert reply['running'] is False
+            assert reply['pattern'] == 1                    # Same payload fields as HTTP
+            writer.close()
+        finally:
+            await server.stop()
+    asyncio.run(scenario())
+
+def test_tick_loop_survives_stalls_and_errors(swarm):
+    """A stalled tick drops missed slots; a failing tick pauses the swarm and is reported"""
+    calls = []
+    update = swarm.update
+    def flaky_update(dt):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(0.1)                             # Stall for ten periods
+        if len(calls) == 5:
+            raise RuntimeError('boom')
+        update(dt)
+    swarm.update = flaky_update
+
+    async def scenario():
+        server = SwarmServer(port=0)
+        hosted = server.add_swarm('main', swarm, tick_rate=100)
+        await server.start()
+        try:
+            for _ in range(200):
+                if not hosted.running:
+                    break
+                await asyncio.sleep(0.01)
+            description = hosted.describe()
+            assert description['running'] is False and 'boom' in description['error']
+            assert not hosted._task.done()              # The loop survives, paused
+            assert hosted.late_ticks >= 1
+            gaps = [b - a for a, b in zip(calls[1:], calls[2:])]
+            assert min(gaps) > 0.005                    # Paced ticks, no catch-up burst
+            await asyncio.sleep(0.05)
+            assert len(calls) == 5
+        finally:
+            await server.stop()
+    asyncio.run(scenario())
+
+def test_failed_send_detaches_client(swarm):
+    """A peer reset seen by the sender removes the client without waiting for the reader"""
+    class ResetWriter:
+        def __init__(self, reader):
+            self.reader = reader
+            self.drains = 0
+        def write(self, data):
+            pass
+        async def drain(self):
+            self.drains += 1
+            if self.drains > 1:                         # After the handshake
+                raise ConnectionResetError('peer reset')
+        def close(self):
+            self.reader.feed_eof()
+
+    async def scenario():
+        server = SwarmServer(port=0)
+        hosted = server.add_swarm('main', swarm, running=False)
+        reader = asyncio.StreamReader()
+        await asyncio.wait_for(server._handle_websocket('/swarms/main/stream', {'sec-websocket-key': 'key'},
+                                                        reader, ResetWriter(reader)), timeout=1.0)
+        assert not hosted.clients
+    asyncio.run(scenario())
+
+def test_slow_client_gets_latest_frame_only():
+    """Frames published faster than a client drains replace each other"""
+    async def scenario():
+        client = ClientStream(writer=None)
+        for frame in (b'a', b'b', b'c'):
+            client.publish(frame)
+        assert client.pending == b'c'
+        assert client.dropped == 2
+    asyncio.run(scenario())
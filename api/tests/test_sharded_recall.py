@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.sharded_recall import ShardedRecallEngine
+from api.core.hopfield import HopfieldNetwork
+
+@pytest.mark.parametrize('num_shards', [2, 3, 4, 7])
+@pytest.mark.parametrize('num_neurons', [301, 1003])
+def test_sharded_recall_matches_single_process(num_shards, num_neurons):
+    """Sharded fields match up to rounding, and signs match away from zero"""
+    rng = np.random.default_rng(num_neurons + num_shards)
+    weights = rng.normal(size=(num_neurons, num_neurons))
+    probe = rng.choice([-1.0, 1.0], size=num_neurons)
+
+    with ShardedRecallEngine(weights, num_shards=num_shards) as engine:
+        state = probe
+        all_clear = True
+        for _ in range(5):
+            expected = weights @ state
+            field = engine.local_field(state)
+            np.testing.assert_allclose(field, expected, rtol=1e-9, atol=1e-9 * np.abs(expected).max())
+            clear = np.abs(expected) > 1e-6 * np.abs(expected).max()
+            assert np.array_equal(np.sign(field[clear]), np.sign(expected[clear]))
+            all_clear &= bool(clear.all())
+            state = np.sign(expected)
+
+        # Along this trajectory no field is near zero, so whole recalls agree too
+        if all_clear:
+            assert np.array_equal(engine.recall(probe, steps=5), state)
+
+def test_network_uses_sharded_engine():
+    """HopfieldNetwork recall matches with and without sharding"""
+    rng = np.random.default_rng(4)
+    patterns = list(rng.choice([-1, 1], size=(3, 40)))
+    network = HopfieldNetwork(40)
+    network.train(patterns)
+    probe = patterns[0].copy()
+    probe[:4] *= -1
+    expected = network.recall(probe)
+
+    network.use_sharded_recall(2)
+    try:
+        assert np.array_equal(network.recall(probe), expected)
+    finally:
+        network.use_sharded_recall(0)
@@ -0,0 +1,55 @@
+import time
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.swarm import Swarm
+from api.core.sim_worker import SwarmWorker
+
+def wait_for_tick(worker, tick, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while worker.latest().tick < tick:
+        assert time.perf_counter() < deadline, "worker did not advance"
+        time.sleep(0.005)
+
+def test_snapshots_are_frozen_copies(swarm):
+    worker = SwarmWorker(swarm, tick_rate=200.0, running=True).start()
+    try:
+        wait_for_tick(worker, 3)
+        snapshot = worker.latest()
+        with pytest.raises(ValueError):
+            snapshot.positions[0, 0] = 1.0
+        held = snapshot.positions.copy()
+        wait_for_tick(worker, snapshot.tick + 3)
+        np.testing.assert_array_equal(snapshot.positions, held)  # Unchanged by later ticks
+    finally:
+        worker.stop()
+
+def test_commands_run_on_worker_thread(swarm):
+    worker = SwarmWorker(swarm, tick_rate=200.0).start()
+    try:
+        assert worker.call(lambda s: s.tick, timeout=5) == 0       # Paused: no ticks yet
+        worker.call(lambda s: s.set_pattern(1), timeout=5)
+        assert worker.latest().current_pattern == 1
+        worker.resume()
+        wait_for_tick(worker, 2)
+        worker.pause()
+        paused_at = worker.call(lambda s: s.tick, timeout=5)
+        time.sleep(0.05)
+        assert worker.latest().tick == paused_at
+    finally:
+        worker.stop()
+
+def test_replace_swarm(swarm):
+    worker = SwarmWorker(swarm, tick_rate=200.0).start()
+    try:
+        replaced = worker.replace_swarm(lambda: Swarm(rows=3, cols=3)).result(timeout=5)
+        assert worker.swarm is replaced
+        assert worker.latest().positions.shape == (9, 2)
+        with pytest.raises(ZeroDivisionError):
+            worker.call(lambda s: 1 / 0, timeout=5)
+    finally:
+        worker.stop()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.hopfield import create_grid_positions
+from api.core.hopfield_control import SwarmHopfieldControl
+from api.core.async_engine import AsyncRecallEngine
+from api.core.sparse_hopfield import robot_neighbours
+
+def controller(rows, cols):
+    return SwarmHopfieldControl(robot_positions=create_grid_positions(rows, cols), speed=0.2, angular_speed=0.1)
+
+def test_neighbourhoods():
+    positions = create_grid_positions(3, 3)
+    pairs = robot_neighbours(positions, radius=1)
+    centre = pairs[pairs[:, 0] == 4, 1]
+    assert sorted(centre) == list(range(9))                     # 8-neighbourhood plus itself
+    assert len(pairs[pairs[:, 0] == 0]) == 4                    # Corner: 3 neighbours plus itself
+    knn = robot_neighbours(positions, k=1)
+    assert {(i, j) for i, j in knn} == {(j, i) for i, j in knn}  # Symmetric
+    with pytest.raises(ValueError):
+        robot_neighbours(positions, radius=1, k=2)
+
+def test_full_radius_matches_dense():
+    control = controller(3, 4)
+    dense = control.hopfield_weights.copy()
+    control.use_sparse_weights(radius=10)
+    np.testing.assert_allclose(control.hopfield_weights.toarray(), dense)
+
+def test_sparse_recall_and_linear_storage():
+    control = controller(20, 20)
+    control.use_sparse_weights(radius=1)
+    weights = control.hopfield_weights
+    assert weights.nnz < 9 * 16 * control.num_robots              # At most 9 robot blocks per robot
+    probe = control.encoded_patterns[1].astype(float)
+    probe[:40] *= -1
+    np.testing.assert_array_equal(control.recall_pattern(probe, max_iter=5), control.encoded_patterns[1])
+
+def test_async_engine_accepts_csr():
+    control = controller(6, 6)
+    control.use_sparse_weights(k=4)
+    probe = control.encoded_patterns[0].astype(float)
+    probe[::7] *= -1
+    engine = AsyncRecallEngine(control.hopfield_weights, order='sequential')
+    state, flips, converged = engine.run(probe)
+    assert converged and flips > 0
+    np.testing.assert_allclose(engine.field, control.hopfield_weights @ state)
+    np.testing.assert_array_equal(state, control.encoded_patterns[0])
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.hopfield import HopfieldNetwork
+from api.core.streaming_trainer import HebbianAccumulator, iter_pattern_chunks
+
+def outer_weights(patterns, num_neurons):
+    """Reference: one padded outer product per pattern"""
+    weights = np.zeros((num_neurons, num_neurons))
+    for p in patterns:
+        p = np.pad(p, (0, num_neurons - len(p)), 'constant', constant_values=-1)
+        weights += np.outer(p, p)
+    np.fill_diagonal(weights, 0)
+    return weights
+
+@pytest.fixture
+def patterns():
+    return np.random.default_rng(3).choice([-1.0, 1.0], size=(1000, 12))
+
+def test_train_matches_outer_products(patterns):
+    network = HopfieldNetwork(16)
+    network.train(list(patterns[:50]))
+    np.testing.assert_allclose(network.weights, outer_weights(patterns[:50], 16))
+    assert network.pattern_size == 12
+
+def test_train_rejects_mismatched_patterns():
+    with pytest.raises(ValueError, match="must have 3 elements"):
+        HopfieldNetwork(4).train([[1, -1, 1], [1, -1]])
+
+def test_stream_sources_agree(tmp_path, patterns):
+    expected = outer_weights(patterns, 12)
+    np.save(tmp_path / 'states.npy', patterns)
+    np.savez(tmp_path / 'states.npz', a=patterns[:400], b=patterns[400:])
+    np.savez_compressed(tmp_path / 'packed.npz', a=patterns[:400], b=np.asfortranarray(patterns[400:]))
+    sources = [iter(patterns), (patterns[i:i + 64] for i in range(0, 1000, 64)),
+               str(tmp_path / 'states.npy'), tmp_path / 'states.npz', tmp_path / 'packed.npz']
+    for source in sources:
+        network = HopfieldNetwork(12)
+        network.train_stream(source, chunk_size=128)
+        np.testing.assert_allclose(network.weights, expected)
+
+def test_npz_members_stream_in_chunks(tmp_path, patterns):
+    np.savez_compressed(tmp_path / 'states.npz', a=patterns)
+    chunks = list(iter_pattern_chunks(tmp_path / 'states.npz', chunk_size=128))
+    assert [len(chunk) for chunk in chunks] == [128] * 7 + [104]
+    np.testing.assert_array_equal(np.concatenate(chunks), patterns)
+
+def test_checkpoint_resume(tmp_path, patterns):
+    checkpoint = str(tmp_path / 'acc.npz')
+    partial = HebbianAccumulator(12)
+    partial.update(patterns[:300], chunk_size=100, checkpoint=checkpoint)
+
+    network = HopfieldNetwork(12)
+    accumulator = network.train_stream(patterns, chunk_size=100, checkpoint=checkpoint)
+    assert accumulator.count == 1000
+    np.testing.assert_allclose(network.weights, outer_weights(patterns, 12))
+    assert HebbianAccumulator.load(checkpoint).count == 1000
@@ -0,0 +1,50 @@
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from api.core.hopfield import create_grid_positions
+from api.core.hopfield_control import SwarmHopfieldControl
+from api.core.async_engine import AsyncRecallEngine
+from api.core.tiled_weights import TiledWeights
+
+def controller(rows, cols):
+    return SwarmHopfieldControl(robot_positions=create_grid_positions(rows, cols), speed=0.2, angular_speed=0.1)
+
+def test_factors_velocity_patterns_exactly():
+    control = controller(3, 4)
+    dense = control.hopfield_weights.copy()
+    control.use_tiled_weights()
+    weights = control.hopfield_weights
+    assert isinstance(weights, TiledWeights)
+    np.testing.assert_allclose(weights.toarray(), dense)
+    x = np.random.default_rng(0).normal(size=dense.shape[0])
+    np.testing.assert_allclose(weights @ x, dense @ x)
+    for j in (0, 5, dense.shape[0] - 1):
+        np.testing.assert_allclose(weights.column(j), dense[:, j])
+
+def test_signed_couplings_and_non_tiled_patterns():
+    motif = np.array([1, -1, -1, 1])
+    signs = np.array([1, -1, 1])
+    patterns = [np.kron(signs, motif), np.kron(np.ones(3), [1, 1, -1, -1])]
+    weights = TiledWeights.from_patterns(patterns)
+    np.testing.assert_array_equal(weights.patterns(), patterns)
+    assert TiledWeights.from_patterns([[1, -1, 1, 1, 1, 1, -1, -1]]) is None   # Blocks are not multiples of one motif
+
+def test_recall_without_expanding():
+    control = controller(30, 30)
+    control.use_tiled_weights()
+    weights = control.hopfield_weights
+    assert weights.nbytes < 100 * control.num_robots                   # O(N), dense would be 16·N² bytes
+    probe = control.encoded_patterns[0].astype(float)
+    probe[::5] *= -1
+    np.testing.assert_array_equal(control.recall_pattern(probe, max_iter=3), control.encoded_patterns[0])
+    state, _, converged = AsyncRecallEngine(weights).run(probe[:])
+    assert converged
+
+def test_fallback_to_dense_for_untiled_patterns():
+    control = controller(2, 2)
+    control.encoded_patterns = np.random.default_rng(1).choice([-1, 1], size=(2, 16))
+    control.use_tiled_weights()
+    assert isinstance(control.hopfield_weights, np.ndarray)
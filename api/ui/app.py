@@ -3,22 +3,42 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))  # Add project root to Python path
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 import sys
 import os
 
 # Add parent directory to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from api.core.swarm import Swarm
-from api.core.hopfield import HopfieldNetwork
 import numpy as np
+from api.ui.raster import RasterRenderer, to_pixels
 
 class SwarmVisualizer:
-    def __init__(self, master, swarm, rows=5, cols=3):
+    def __init__(self, master, swarm, rows=5, cols=3, threaded=False, tick_rate=20.0, frame_rate=20.0,
+                 renderer='canvas'):
+        """
+        Args:
+            threaded: Run the swarm on a SwarmWorker thread at tick_rate and redraw the
+                latest snapshot at frame_rate, instead of ticking inside the Tk loop.
+            renderer: 'canvas' draws one oval per robot; 'raster' rasterizes all robots
+                into a single PhotoImage (density heatmap once they overlap).
+        """
         self.master = master
         self.swarm = swarm
         self.canvas_size = 600
+        self.view_extent = 20.0  # Swarm units across the canvas, centered on the origin
+        self.frame_rate = frame_rate
+        self.renderer = renderer
+        self.raster = None
+        self.worker = None
+        from api.core.scheduler import TickScheduler
+        self.scheduler = TickScheduler(lambda dt, _: self.swarm.update(dt), period=0.05)
+        # Formation quality, folded in on every Swarm.update (on the worker thread when threaded)
+        from api.core.metrics import FormationMetrics
+        self.metrics = FormationMetrics.from_swarm(swarm).attach(swarm)
+        if threaded:
+            from api.core.sim_worker import SwarmWorker
+            self.worker = SwarmWorker(swarm, tick_rate=tick_rate).start()
         
         # Store grid dimensions
         self.rows = rows
@@ -86,6 +106,24 @@ class SwarmVisualizer:
         self.stop_sim_btn.pack(side=tk.LEFT, padx=2)
         self.reset_btn.pack(side=tk.LEFT, padx=2)
         self.train_btn.pack(side=tk.LEFT, padx=2)
+
+        # Replay controls
+        self.replay_frame = tk.Frame(self.controls)
+        self.replay_frame.pack(side=tk.TOP, pady=5)
+        self.load_replay_btn = tk.Button(self.replay_frame, text="Load Replay", command=self.load_replay)
+        self.close_replay_btn = tk.Button(self.replay_frame, text="Close Replay", command=self.close_replay)
+        self.replay_scale = tk.Scale(self.replay_frame, from_=0, to=0, orient=tk.HORIZONTAL,
+                                     length=300, label="Tick", command=self.seek_replay)
+        self.load_replay_btn.pack(side=tk.LEFT, padx=2)
+        self.close_replay_btn.pack(side=tk.LEFT, padx=2)
+        self.replay_scale.pack(side=tk.LEFT, padx=2)
+        self.replay = None
+        self.replay_tick = 0
+
+        # Formation metrics readout
+        self.metrics_text = tk.StringVar(value=self.metrics.format())
+        self.metrics_label = tk.Label(self.controls, textvariable=self.metrics_text, font=('TkFixedFont', 9))
+        self.metrics_label.pack(side=tk.TOP, pady=2)
         
         # Initialize center trail
         self.center_trail = []
@@ -95,14 +133,20 @@ class SwarmVisualizer:
         self.robot_color = 'blue'
         self.running = False
         
-        # Initialize patterns
-        self.swarm._initialize_patterns()
-        
         # Initial draw
         self.draw_robots()
 
     def draw_robots(self):
         """Draw robots and formation center with trail"""
+        with self.swarm.profiler.stage('render'):
+            self._draw_robots()
+            if self.replay is None:
+                self.metrics_text.set(self.metrics.format())
+
+    def _draw_robots(self):
+        if self.renderer == 'raster':
+            self._draw_raster()
+            return
         self.canvas.delete("all")
         
         # Draw trail
@@ -112,18 +156,16 @@ class SwarmVisualizer:
             self.canvas.create_line(x1, y1, x2, y2, fill='red', dash=(4, 2))
         
         # Draw robots
-        positions = []
-        for robot in self.swarm.robots:
-            x, y = self.scale_position(robot.position)
-            positions.append(robot.position)
+        positions = np.asarray(self.current_positions(), dtype=np.float64).reshape(-1, 2)
+        for x, y in self.scale_positions(positions).tolist():
             self.canvas.create_oval(
                 x - self.robot_radius, y - self.robot_radius,
                 x + self.robot_radius, y + self.robot_radius,
                 fill=self.robot_color
             )
         
-        # Calculate and draw formation center
-        center = np.mean(positions, axis=0)
+        # Draw formation center
+        center = self.formation_center(positions)
         x, y = self.scale_position(center)
         self.canvas.create_oval(
             x - 3, y - 3,
@@ -137,19 +179,102 @@ class SwarmVisualizer:
         if len(self.center_trail) > 50:
             self.center_trail.pop(0)
 
+    def _draw_raster(self):
+        if self.raster is None:
+            self.raster = RasterRenderer(self.canvas_size, self.robot_radius, self.robot_color)
+            self.photo = tk.PhotoImage(width=self.canvas_size, height=self.canvas_size)
+            self.canvas.create_image(0, 0, image=self.photo, anchor=tk.NW, tags='frame')
+        self.canvas.delete('overlay')
+
+        positions = np.asarray(self.current_positions(), dtype=np.float64).reshape(-1, 2)
+        self.photo.configure(data=self.raster.ppm(self.scale_positions(positions)), format='PPM')
+
+        # Trail and formation center stay vector items on top of the frame
+        center = self.formation_center(positions)
+        self.center_trail.append(center)
+        if len(self.center_trail) > 50:
+            self.center_trail.pop(0)
+        if len(self.center_trail) > 1:
+            trail = self.scale_positions(np.array(self.center_trail))
+            self.canvas.create_line(*trail.ravel().tolist(), fill='red', dash=(4, 2), tags='overlay')
+        x, y = self.scale_position(center)
+        self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill='red', tags='overlay')
+
+    def current_positions(self):
+        """Positions to draw: the replayed tick in replay mode, otherwise the live swarm"""
+        if self.replay is not None:
+            return self.replay.positions(self.replay_tick)
+        if self.worker is not None:
+            return self.worker.latest().positions
+        return self.swarm.positions
+
+    def formation_center(self, positions):
+        """Centroid of the drawn positions, reusing the metrics' centroid when it is for the same tick"""
+        latest = self.metrics.latest()
+        if self.replay is None and self.worker is None and latest is not None and latest['tick'] == self.swarm.tick:
+            return latest['centroid']
+        return positions.mean(axis=0)
+
+    def load_replay(self, filename=None):
+        """Open a recorded trajectory log and switch to replay mode"""
+        filename = filename or filedialog.askopenfilename(title="Open trajectory log")
+        if not filename:
+            return
+        from api.core.recorder import TrajectoryLog
+        try:
+            replay = TrajectoryLog(filename)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay Error", f"Failed to open replay: {str(e)}")
+            return
+        if len(replay) == 0:
+            messagebox.showerror("Replay Error", "Trajectory log contains no ticks")
+            return
+        self.stop()
+        self.replay = replay
+        self.replay_tick = 0
+        self.replay_scale.configure(to=len(replay) - 1)
+        self.replay_scale.set(0)
+        self.center_trail = []
+        self.draw_robots()
+
+    def close_replay(self):
+        """Leave replay mode and show the live swarm again"""
+        self.running = False
+        self.replay = None
+        self.replay_scale.configure(to=0)
+        self.center_trail = []
+        self.draw_robots()
+
+    def seek_replay(self, tick):
+        """Jump straight to a recorded tick without simulating"""
+        if self.replay is None or int(tick) == self.replay_tick:
+            return
+        self.replay_tick = min(max(int(tick), 0), len(self.replay) - 1)
+        self.center_trail = []
+        self.draw_robots()
+
     def scale_position(self, pos):
         """Scale swarm coordinates to canvas pixels"""
-        scale = self.canvas_size / 20  # Assuming swarm operates in [-10,10] space
+        scale = self.canvas_size / self.view_extent
         return (
             pos[0] * scale + self.canvas_size/2,
             self.canvas_size/2 - pos[1] * scale
         )
 
+    def scale_positions(self, positions):
+        """Vectorized scale_position: (N, 2) swarm coordinates to (N, 2) canvas pixels"""
+        return to_pixels(positions, self.canvas_size, self.view_extent)
+
     def set_pattern(self):
         """Set the movement pattern (left/right turn)"""
         try:
             pattern = 0 if self.pattern_var.get() == "Left" else 1
             print(f"[DEBUG] Setting pattern to: {'Left' if pattern == 0 else 'Right'}")
+            if self.worker is not None:
+                future = self.worker.submit(lambda swarm: (swarm.set_pattern(pattern), swarm.current_pattern)[1])
+                self.when_done(future, lambda current: self.pattern_var.set("Left" if current == 0 else "Right"))
+                self.start()
+                return
             self.swarm.set_pattern(pattern)
             # Update UI to match actual pattern index after validation
             self.pattern_var.set("Left" if self.swarm.current_pattern == 0 else "Right")
@@ -162,39 +287,108 @@ class SwarmVisualizer:
             self.running = False
 
     def start(self):
+        already_running = self.running
         self.running = True
+        if not already_running:
+            self.scheduler.restart()
+        if self.worker is not None and self.replay is None:
+            self.worker.resume()
+            if already_running:
+                return  # The redraw loop is already scheduled
         self.update()
 
     def stop(self):
         self.running = False
+        if self.worker is not None:
+            self.worker.pause()
 
     def reset(self):
         """Reset swarm"""
-        self.swarm = Swarm(rows=self.rows, cols=self.cols)
-        self.swarm._initialize_patterns()  # Ensure patterns are initialized
+        from api.core.swarm import Swarm
+        if self.worker is not None:
+            # Built on the worker so a large swarm doesn't block the UI
+            future = self.worker.replace_swarm(lambda: self._new_swarm(Swarm))
+            self.when_done(future, self._swarm_replaced)
+            return
+        self._swarm_replaced(self._new_swarm(Swarm))
+
+    def _new_swarm(self, swarm_cls):
+        """Build a fresh swarm with its own formation metrics attached"""
+        from api.core.metrics import FormationMetrics
+        swarm = swarm_cls(rows=self.rows, cols=self.cols)
+        FormationMetrics.from_swarm(swarm).attach(swarm)
+        return swarm
+
+    def _swarm_replaced(self, swarm):
+        from api.core.metrics import FormationMetrics
+        self.swarm = swarm
+        self.metrics = next(hook for hook in swarm.update_hooks if isinstance(hook, FormationMetrics))
         self.center_trail = []
         self.draw_robots()
 
+    def when_done(self, future, callback, poll_ms=20):
+        """Call callback(result) on the Tk thread once a worker future completes"""
+        if not future.done():
+            self.master.after(poll_ms, self.when_done, future, callback, poll_ms)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Worker Error", str(e))
+            return
+        callback(result)
+
+    def close(self):
+        """Stop the background worker, if any"""
+        if self.worker is not None:
+            self.worker.stop()
+
     def update(self):
         if self.running:
             print("[DEBUG] UI Update tick")
-            self.swarm.update()
+            if self.replay is not None:
+                if self.replay_tick >= len(self.replay) - 1:
+                    self.running = False
+                    return
+                self.replay_tick += 1
+                self.replay_scale.set(self.replay_tick)
+            elif self.worker is not None:
+                # The worker ticks on its own; only redraw its latest snapshot
+                self.draw_robots()
+                self.master.after(int(1000 / self.frame_rate), self.update)
+                return
+            else:
+                # Fixed-period ticks: the wait shrinks by however long update and draw took
+                self.scheduler.tick()
+                self.draw_robots()
+                self.master.after(int(self.scheduler.time_to_next() * 1000), self.update)
+                return
             self.draw_robots()
             self.master.after(50, self.update)
 
     def auto_train_patterns(self):
         """Train patterns for left and right turns"""
         # Force pattern reinitialization
+        if self.worker is not None:
+            future = self.worker.submit(lambda swarm: swarm._initialize_patterns())
+            self.when_done(future, lambda _: messagebox.showinfo(
+                "Success", "Patterns initialized for left and right turns"))
+            return
         self.swarm._initialize_patterns()
         messagebox.showinfo("Success", "Patterns initialized for left and right turns")
 
 if __name__ == '__main__':
+    from api.core.swarm import Swarm
+
     root = tk.Tk()
     root.title("Swarm Visualization")
     
     # Configure grid size
     rows, cols = 2, 2
     swarm = Swarm(rows=rows, cols=cols)
-    visualizer = SwarmVisualizer(root, swarm, rows=rows, cols=cols)
-    
+    visualizer = SwarmVisualizer(root, swarm, rows=rows, cols=cols,
+                                 threaded='--threaded' in sys.argv,
+                                 renderer='raster' if '--raster' in sys.argv else 'canvas')
+
     root.mainloop()
+    visualizer.close()
@@ -0,0 +1,400 @@
+"""In-process stand-in for the CoppeliaSim ZMQ remote API.
+
+Implements the subset of `sim` and `simUI` used by phase1/phase2 on a small
+object-tree scene model, counts every call per API name and can inject a
+per-call latency, so setup and control loops can be benchmarked and tested
+without a running simulator.
+"""
+import ast
+import functools
+import os
+import re
+import time
+from collections import Counter
+
+ROBOT_TEMPLATE = ('Robot0_0', [
+    ('Turn_joint', [
+        ('Speed_joint', [
+            ('Wheel', []),
+        ]),
+    ]),
+    ('dummyL', []),
+    ('dummyR', []),
+    ('dummyF', []),
+    ('dummyB', []),
+])
+WHEEL_DIAMETER = 0.05
+TEXT_DUMMY_TYPE = 8
+LUA_LOCAL = re.compile(r'^local ([\w, ]+?) = (.+)$', re.MULTILINE)
+LUA_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|[{}]')
+
+
+def lua_locals(code):
+    """Top-level `local a, b = <literals>` assignments of a Lua snippet; other lines are ignored"""
+    values = {}
+    for names, expr in LUA_LOCAL.findall(code):
+        expr = LUA_TOKEN.sub(lambda m: {'{': '[', '}': ']'}.get(m.group(), m.group()), expr)
+        try:
+            value = ast.literal_eval(f'({expr},)')
+        except (ValueError, SyntaxError):
+            continue
+        values.update(zip([name.strip() for name in names.split(',')], value))
+    return values
+
+
+def rpc(fn):
+    """Count the call under its API name and apply the configured latency"""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        self.calls[fn.__name__] += 1
+        latency = self.latency.get(fn.__name__, self.latency.get('*', 0.0))
+        if latency:
+            time.sleep(latency)
+        return fn(self, *args, **kwargs)
+    return wrapper
+
+
+class FakeObject:
+    def __init__(self, handle, alias, parent=-1, kind='dummy'):
+        self.handle = handle
+        self.alias = alias
+        self.parent = parent
+        self.kind = kind
+        self.children = []
+        self.position = [0.0, 0.0, 0.0]
+        self.orientation = [0.0, 0.0, 0.0]
+        self.dummy_type = 0
+        self.link = -1
+        self.target_velocity = 0.0
+        self.interval = (False, [0.0, 0.0])
+
+
+class FakeRemoteObject:
+    def __init__(self, latency=None):
+        """
+        :param latency: seconds added to every call, or a dict of per-API latencies ('*' for the default)
+        """
+        if latency is None:
+            latency = float(os.environ.get('SWARM_SIM_LATENCY', 0.0))
+        self.latency = latency if isinstance(latency, dict) else {'*': latency}
+        self.calls = Counter()
+
+    def rpc_count(self):
+        return sum(self.calls.values())
+
+    def reset_counts(self):
+        self.calls.clear()
+
+
+class FakeSim(FakeRemoteObject):
+    scripttype_sandboxscript = 6
+    handle_world = -1
+
+    def __init__(self, latency=None, dt=0.05):
+        super().__init__(latency)
+        self.dt = dt
+        self.objects = {}
+        self.next_handle = 1
+        self.time = 0.0
+        self.state = 'stopped'
+        self.stepping = False
+        self.build(ROBOT_TEMPLATE)
+
+    # Scene model helpers (not counted as RPCs)
+
+    def new_object(self, alias, parent=-1, kind='dummy'):
+        obj = FakeObject(self.next_handle, alias, kind=kind)
+        self.objects[obj.handle] = obj
+        self.next_handle += 1
+        self.reparent(obj.handle, parent)
+        return obj
+
+    def build(self, template, parent=-1):
+        alias, children = template
+        kind = 'joint' if alias.endswith('_joint') else 'shape' if alias == 'Wheel' else 'dummy'
+        obj = self.new_object(alias, parent, kind)
+        for child in children:
+            self.build(child, obj.handle)
+        return obj.handle
+
+    def reparent(self, handle, parent):
+        obj = self.objects[handle]
+        if obj.parent in self.objects:
+            self.objects[obj.parent].children.remove(handle)
+        obj.parent = parent
+        if parent in self.objects:
+            self.objects[parent].children.append(handle)
+
+    def subtree(self, handle):
+        handles = [handle]
+        for child in self.objects[handle].children:
+            handles += self.subtree(child)
+        return handles
+
+    def descendants(self, handle):
+        return self.subtree(handle)[1:]
+
+    def resolve(self, path):
+        """Resolve '/a/b/c' paths: the first alias is searched among orphans, then anywhere;
+        later aliases among direct children, then any descendant"""
+        parts = [p for p in path.split('/') if p]
+        if not parts:
+            return -1
+        orphans = [h for h, o in self.objects.items() if o.parent == -1]
+        candidates = [h for h in orphans if self.objects[h].alias == parts[0]] or \
+                     [h for h, o in self.objects.items() if o.alias == parts[0]]
+        if not candidates:
+            return -1
+        current = candidates[0]
+        for part in parts[1:]:
+            obj = self.objects[current]
+            matches = [h for h in obj.children if self.objects[h].alias == part] or \
+                      [h for h in self.descendants(current) if self.objects[h].alias == part]
+            if not matches:
+                return -1
+            current = matches[0]
+        return current
+
+    def _copy(self, handle, parent):
+        source = self.objects[handle]
+        obj = self.new_object(source.alias, parent, source.kind)
+        obj.position = list(source.position)
+        obj.orientation = list(source.orientation)
+        obj.dummy_type = source.dummy_type
+        for child in source.children:
+            self._copy(child, obj.handle)
+        return obj.handle
+
+    # sim API
+
+    @rpc
+    def setStepping(self, enabled):
+        self.stepping = enabled
+
+    @rpc
+    def getObject(self, path, options=None):
+        handle = self.resolve(path)
+        if handle == -1 and not (options or {}).get('noError'):
+            raise Exception(f'object does not exist: {path}')
+        return handle
+
+    @rpc
+    def createDummy(self, size):
+        return self.new_object('Dummy').handle
+
+    @rpc
+    def setObjectAlias(self, handle, alias):
+        self.objects[handle].alias = alias
+
+    @rpc
+    def getObjectAlias(self, handle, options=-1):
+        return self.objects[handle].alias
+
+    @rpc
+    def setObjectParent(self, handle, parent, keep_in_place=True):
+        self.reparent(handle, parent)
+
+    @rpc
+    def getObjectChild(self, handle, index):
+        children = self.objects[handle].children
+        return children[index] if index < len(children) else -1
+
+    @rpc
+    def removeModel(self, handle):
+        for h in reversed(self.subtree(handle)):
+            self.reparent(h, -1)
+            del self.objects[h]
+
+    @rpc
+    def removeObject(self, handle):
+        obj = self.objects[handle]
+        for child in list(obj.children):
+            self.reparent(child, obj.parent)
+        self.reparent(handle, -1)
+        del self.objects[handle]
+
+    @rpc
+    def copyPasteObjects(self, handles, options=0):
+        return [self._copy(h, -1) for h in handles]
+
+    @rpc
+    def setObjectPosition(self, handle, relative_to, position):
+        self.objects[handle].position = list(position)
+
+    @rpc
+    def getObjectPosition(self, handle, relative_to=-1):
+        return list(self.objects[handle].position)
+
+    @rpc
+    def setObjectOrientation(self, handle, relative_to, orientation):
+        self.objects[handle].orientation = list(orientation)
+
+    @rpc
+    def getObjectOrientation(self, handle, relative_to=-1):
+        return list(self.objects[handle].orientation)
+
+    @rpc
+    def alphaBetaGammaToYawPitchRoll(self, alpha, beta, gamma):
+        return gamma, beta, alpha
+
+    @rpc
+    def getShapeGeomInfo(self, handle):
+        return 0, 0, [WHEEL_DIAMETER, WHEEL_DIAMETER, 0.02, 0.0]
+
+    @rpc
+    def setLinkDummy(self, dummy, other):
+        self.objects[dummy].link = other
+        if other != -1:
+            self.objects[other].link = dummy
+
+    @rpc
+    def setJointInterval(self, handle, cyclic, interval):
+        self.objects[handle].interval = (cyclic, list(interval))
+
+    @rpc
+    def setJointTargetVelocity(self, handle, velocity):
+        self.objects[handle].target_velocity = velocity
+
+    @rpc
+    def getJointTargetVelocity(self, handle):
+        return self.objects[handle].target_velocity
+
+    @rpc
+    def getProperty(self, handle, name, options=None):
+        if name == 'dummyType':
+            return self.objects[handle].dummy_type
+        if not (options or {}).get('noError'):
+            raise Exception(f'unknown property {name}')
+        return None
+
+    @rpc
+    def generateTextShape(self, text, color, height, centered):
+        dummy = self.new_object(f'text_{text}')
+        dummy.dummy_type = TEXT_DUMMY_TYPE
+        self.new_object('textShape', dummy.handle, 'shape')
+        return dummy.handle
+
+    @rpc
+    def startSimulation(self):
+        self.state = 'running'
+
+    @rpc
+    def pauseSimulation(self):
+        self.state = 'paused'
+
+    @rpc
+    def stopSimulation(self):
+        self.state = 'stopped'
+        self.time = 0.0
+
+    @rpc
+    def getSimulationTime(self):
+        return self.time
+
+    @rpc
+    def step(self):
+        self.time += self.dt
+
+    @rpc
+    def executeScriptString(self, code, script_type):
+        # Recognizes the bulk-setup snippets Robot_Swarm sends by the API they call
+        values = lua_locals(code)
+        if 'sim.removeModel' in code:
+            self._swarm_cull(values['swarm'], values['keep'])
+        elif 'sim.setObjectAlias' in code:
+            self._swarm_place(values['swarm'], values['handles'], values['poses'], values['aliases'])
+        elif 'sim.setLinkDummy' in code:
+            self._swarm_link(values['base'], values['rows'], values['cols'], values['front'],
+                             values['back'], values['left'], values['right'])
+        else:
+            # Fail loudly so a new snippet isn't silently treated as having run
+            first_line = next((line.strip() for line in code.splitlines() if line.strip()), '')
+            raise NotImplementedError(f'FakeSim cannot run script: {first_line}')
+        return 0, None
+
+    # Script-side helpers mirroring the Lua snippets of Robot_Swarm's bulk methods (one RPC each)
+
+    def _swarm_cull(self, swarm, keep):
+        for child in list(self.objects[swarm].children):
+            if self.objects[child].alias != keep:
+                for h in reversed(self.subtree(child)):
+                    self.reparent(h, -1)
+                    del self.objects[h]
+
+    def _swarm_place(self, swarm, handles, poses, aliases):
+        for handle, pose, alias in zip(handles, poses, aliases):
+            self.reparent(handle, swarm)
+            self.objects[handle].position = list(pose)
+            self.objects[handle].alias = alias
+
+    def _swarm_link(self, base, rows, cols, front, back, left, right):
+        for i in range(rows):
+            for j in range(cols):
+                if i != 0:
+                    dummy = self.resolve(f'{base}{i}_{j}/{right}')
+                    other = self.resolve(f'{base}{i - 1}_{j}/{left}')
+                    self.objects[dummy].link, self.objects[other].link = other, dummy
+                if j != 0:
+                    dummy = self.resolve(f'{base}{i}_{j}/{back}')
+                    other = self.resolve(f'{base}{i}_{j - 1}/{front}')
+                    self.objects[dummy].link, self.objects[other].link = other, dummy
+
+
+class FakeSimUI(FakeRemoteObject):
+    def __init__(self, latency=None):
+        super().__init__(latency)
+        self.windows = {}
+        self.next_handle = 1
+
+    @rpc
+    def create(self, xml):
+        handle = self.next_handle
+        self.next_handle += 1
+        self.windows[handle] = {'xml': xml, 'labels': {}, 'position': (0, 0)}
+        return handle
+
+    @rpc
+    def getSize(self, handle):
+        return 300, 150
+
+    @rpc
+    def setPosition(self, handle, x, y):
+        self.windows[handle]['position'] = (x, y)
+
+    @rpc
+    def setLabelText(self, handle, label_id, text):
+        self.windows[handle]['labels'][label_id] = text
+
+    @rpc
+    def destroy(self, handle):
+        self.windows.pop(int(handle), None)
+
+
+class FakeRemoteAPIClient:
+    """Drop-in replacement for coppeliasim_zmqremoteapi_client.RemoteAPIClient"""
+
+    def __init__(self, host='localhost', port=23000, latency=None):
+        self.sim = FakeSim(latency)
+        self.simUI = FakeSimUI(latency)
+
+    def require(self, name):
+        return self.getObject(name)
+
+    def getObject(self, name):
+        if name == 'sim':
+            return self.sim
+        if name == 'simUI':
+            return self.simUI
+        raise Exception(f'unknown remote object {name}')
+
+    def rpc_counts(self):
+        """Calls per API name across sim and simUI"""
+        return Counter({f'sim.{k}': v for k, v in self.sim.calls.items()}) + \
+            Counter({f'simUI.{k}': v for k, v in self.simUI.calls.items()})
+
+    def rpc_count(self):
+        return self.sim.rpc_count() + self.simUI.rpc_count()
+
+    def reset_counts(self):
+        self.sim.reset_counts()
+        self.simUI.reset_counts()
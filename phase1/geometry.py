@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def distance_matrix(rows, cols, robot_size=0.1):
+    """Vectorized distance-from-center factors for a rows x cols robot grid.
+
+    Each element is the distance of the robot from the grid center, times its
+    directionality (0 for robots on the center row) and 1 / cos of its angle
+    to the center, matching the per-robot loop it replaces.
+    """
+    center = np.array([rows * robot_size / 2, cols * robot_size / 2])
+    i, j = np.meshgrid(np.arange(rows), np.arange(cols), indexing='ij')
+    dx = i * robot_size + robot_size / 2 - center[0]
+    dy = j * robot_size + robot_size / 2 - center[1]
+
+    distance_to_center = np.hypot(dx, dy)
+    direction = (dx != 0).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        product = 1 / np.cos(np.arctan2(dy, dx))
+    return np.where(direction == 0, 0.0, distance_to_center * direction * product)
@@ -0,0 +1,107 @@
+import importlib
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from phase1.fake_sim import FakeSim
+
+@pytest.fixture
+def utils(monkeypatch):
+    # phase1.utils connects to the simulator on import; select the in-process one
+    monkeypatch.setenv('SWARM_SIM', 'fake')
+    return importlib.import_module('phase1.utils')
+
+@pytest.fixture
+def sim(utils, monkeypatch):
+    fake = FakeSim()
+    monkeypatch.setattr(utils, 'sim', fake)
+    return fake
+
+def build(utils, rows, cols, bulk):
+    swarm = utils.Robot_Swarm('/Robot0_0', rows, cols, 0.12)
+    swarm.create_swarm(bulk=bulk)
+    return swarm
+
+def test_bulk_construction_matches_per_robot(utils, sim, monkeypatch):
+    """Bulk setup builds the same scene with log2(n) copies and no per-robot RPCs"""
+    build(utils, 4, 5, bulk=True)
+    assert sim.calls['copyPasteObjects'] == 5
+    assert sim.calls['setObjectPosition'] == 0
+    for i in range(4):
+        for j in range(5):
+            robot = sim.resolve(f'/Swarm/Robot{i}_{j}')
+            assert robot != -1
+            assert sim.objects[robot].position[:2] == [j * 0.12, i * 0.12] or (i, j) == (0, 0)
+    dummy = sim.resolve('/Swarm/Robot2_3/dummyR')
+    assert sim.objects[dummy].link == sim.resolve('/Swarm/Robot1_3/dummyL')
+    bulk_calls = sim.rpc_count()
+
+    per_robot = FakeSim()
+    monkeypatch.setattr(utils, 'sim', per_robot)
+    build(utils, 4, 5, bulk=False)
+    assert per_robot.rpc_count() > 3 * bulk_calls
+
+def test_rebuild_culls_previous_swarm(utils, sim):
+    """Creating the swarm again leaves exactly one robot per grid slot"""
+    build(utils, 3, 3, bulk=True)
+    build(utils, 2, 2, bulk=True)
+    swarm_handle = sim.resolve('/Swarm')
+    assert len(sim.objects[swarm_handle].children) == 4
+
+def test_control_loop_reads_from_mirror(utils, sim):
+    """Steady-state velocity reads issue no RPCs; reconciliation detects drift"""
+    swarm = build(utils, 3, 3, bulk=True)
+    swarm.set_all_velocities([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    sim.reset_counts()
+    for _ in range(10):
+        assert swarm.get_all_velocities()[1][2] == 6
+    assert sim.rpc_count() == 0
+
+    sim.objects[sim.resolve('/Swarm/Robot0_1/Turn_joint/Speed_joint')].target_velocity = 0.5
+    assert swarm.reconcile() == [(0, 1, 2, 0.5)]
+    assert swarm.get_robot_velocity(0, 1) == 0.5
+
+def test_latency_injection():
+    """Configured per-API latency is applied to each call"""
+    sim = FakeSim(latency={'getObject': 0.02})
+    start = time.perf_counter()
+    sim.getObject('/Robot0_0')
+    sim.getSimulationTime()
+    assert 0.02 <= time.perf_counter() - start < 0.5
+    assert sim.calls['getObject'] == 1
+
+def test_unknown_script_is_rejected():
+    """Snippets the fake cannot interpret raise instead of silently succeeding"""
+    sim = FakeSim()
+    with pytest.raises(NotImplementedError, match='sim.setObjectColor'):
+        sim.executeScriptString('\nsim.setObjectColor(h, 0, 0, {1, 0, 0})\nreturn 1', 'sim.scripttype_main')
+
+def test_overlay_draws_last_speeds_of_a_burst(utils, sim):
+    """Speeds arriving inside the rate window are drawn once a refresh is due"""
+    swarm = build(utils, 2, 2, bulk=True)
+    now = [0.0]
+    overlay = utils.SpeedOverlay(swarm, clock=lambda: now[0])
+    assert overlay.update([[1, 1], [1, 1]]) == 4
+    now[0] = 0.1
+    assert overlay.update([[2, 1], [1, 1]]) == 0
+    assert overlay.flush() == 0                 # Still inside the window
+    now[0] = 1.0
+    assert overlay.flush() == 1
+    assert overlay.values[(0, 0)] == 2 and overlay.pending is None
+
+def test_failed_bulk_copy_leaves_no_extra_robots(utils, sim, monkeypatch):
+    """Copies pasted before a bulk copy failure are removed before the per-robot fallback"""
+    paste = sim.copyPasteObjects
+    batches = []
+    def flaky_paste(handles, options=0):
+        batches.append(len(handles))
+        if len(batches) == 3:
+            raise Exception('paste failed')
+        return paste(handles, options)
+    monkeypatch.setattr(sim, 'copyPasteObjects', flaky_paste)
+    build(utils, 3, 3, bulk=True)
+    assert len(sim.objects[sim.resolve('/Swarm')].children) == 9
+    assert not [obj for obj in sim.objects.values() if obj.parent == -1 and obj.alias.startswith('Robot')]
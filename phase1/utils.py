@@ -1,16 +1,29 @@
-from time import sleep
-from math import dist, cos, atan2, pi
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
+import os
+from time import sleep, monotonic
+from math import pi
+
+from api.core.profiling import StageProfiler, ProfiledProxy
+from phase1.geometry import distance_matrix
+
+# SWARM_SIM=fake runs against the in-process stand-in (SWARM_SIM_LATENCY seconds per call)
+SIM_BACKEND = os.environ.get('SWARM_SIM', 'coppelia')
+if SIM_BACKEND == 'fake':
+    from phase1.fake_sim import FakeRemoteAPIClient as RemoteAPIClient
+else:
+    from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 
 MAX_SPEED = 5
 MAX_TURN = 90
 INC = 100
 DRAW_TEXT = False
+TEXT_THRESHOLD = 0.05   # Minimum change of a displayed speed before its label is regenerated
+TEXT_RATE = 2.0         # Maximum label refreshes per second
 
 swarm = None
+profiler = StageProfiler()  # Times every CoppeliaSim RPC issued through sim
 client = RemoteAPIClient()
 client.require('simUI')
-sim = client.getObject('sim')
+sim = ProfiledProxy(client.getObject('sim'), profiler)
 simUI = client.getObject('simUI')
 sim.setStepping(True)
 
@@ -45,13 +58,129 @@ def right_click(arg1, button_id, val):
     simUI.setLabelText(window_handle, 1, f"Forward: {last_forward}\nRight: {last_right}")
 
 
+class SpeedOverlay:
+    def __init__(self, robot_swarm, threshold=TEXT_THRESHOLD, max_rate=TEXT_RATE, clock=monotonic):
+        """
+        Live speed labels above each robot, keeping one text shape per robot
+        and regenerating it only when its value changes noticeably.
+        :param robot_swarm: Robot_Swarm whose robots get labels
+        :param threshold: minimum change of the displayed value before a label is regenerated
+        :param max_rate: maximum number of refreshes per second
+        :param clock: monotonic time source in seconds
+        """
+        self.robot_swarm = robot_swarm
+        self.threshold = threshold
+        self.max_rate = max_rate
+        self.clock = clock
+        self.parents = {}       # (i, j) -> robot handle
+        self.handles = {}       # (i, j) -> text shape handle
+        self.values = {}        # (i, j) -> displayed value
+        self.last_refresh = None
+        self.pending = None     # Latest speeds that arrived while not due, drawn by flush()
+        self.purged = False
+
+    def _parent(self, i, j):
+        if (i, j) not in self.parents:
+            self.parents[(i, j)] = sim.getObject(f'{self.robot_swarm.base_name}{i}_{j}')
+        return self.parents[(i, j)]
+
+    def purge(self):
+        """Remove text shapes left over from earlier runs (walks each robot's children once)"""
+        for i in range(self.robot_swarm.rows):
+            for j in range(self.robot_swarm.cols):
+                parent = self._parent(i, j)
+                index = 0
+                obj = sim.getObjectChild(parent, index)
+                while obj != -1:
+                    if sim.getProperty(obj, 'dummyType', {'noError': True}) == 8:
+                        obj2 = sim.getObjectChild(obj, 0)
+                        sim.removeObject(obj2)
+                        sim.removeObject(obj)
+                    else:
+                        index += 1
+                    obj = sim.getObjectChild(parent, index)
+        self.purged = True
+
+    def due(self):
+        """Whether the refresh rate allows another update now"""
+        return self.last_refresh is None or self.clock() - self.last_refresh >= 1 / self.max_rate
+
+    def update(self, speeds):
+        """
+        :param speeds: 2d list of joint target speeds, one per robot
+        :return: number of labels regenerated; 0 when not due, in which case the speeds are
+                 kept as pending and drawn by the next update() or flush() that is due
+        """
+        if not self.due():
+            self.pending = speeds
+            return 0
+        self.pending = None
+        if not self.purged:
+            self.purge()
+        self.last_refresh = self.clock()
+
+        regenerated = 0
+        for i, row in enumerate(speeds):
+            for j, speed in enumerate(row):
+                last = self.values.get((i, j))
+                if last is not None and abs(speed - last) < self.threshold:
+                    continue
+                self.draw(i, j, speed)
+                regenerated += 1
+        return regenerated
+
+    def flush(self):
+        """Draw speeds held back by the rate limit once a refresh is due; call regularly, e.g. every step
+        :return: number of labels regenerated
+        """
+        if self.pending is None or not self.due():
+            return 0
+        return self.update(self.pending)
+
+    def draw(self, i, j, speed):
+        parent = self._parent(i, j)
+        old = self.handles.pop((i, j), None)
+        if old is not None:
+            self._remove(old)
+
+        # Create a 3D text shape
+        text_handle = sim.generateTextShape(f'{"minus" if speed < 0 else ""}{speed:.2f}', [1, 1, 1], 0.01, True)
+
+        # Parent the shape to the robot, a bit above it
+        sim.setObjectParent(text_handle, parent, True)
+        sim.setObjectPosition(text_handle, parent, [0, 0, 0.026])
+        sim.setObjectOrientation(text_handle, parent, [0, 0, 0])
+
+        self.handles[(i, j)] = text_handle
+        self.values[(i, j)] = speed
+
+    @staticmethod
+    def _remove(handle):
+        shape = sim.getObjectChild(handle, 0)
+        if shape != -1:
+            sim.removeObject(shape)
+        sim.removeObject(handle)
+
+    def clear(self):
+        """Remove all labels"""
+        for handle in self.handles.values():
+            self._remove(handle)
+        self.handles.clear()
+        self.values.clear()
+        self.pending = None
+
+
 class Robot_Swarm:
-    def __init__(self, base, rows, cols, spacing, left_dummy='dummyL', right_dummy='dummyR', front_dummy='dummyF', back_dummy='dummyB'):
+    def __init__(self, base, rows, cols, spacing, left_dummy='dummyL', right_dummy='dummyR', front_dummy='dummyF', back_dummy='dummyB',
+                 reconcile_every=0, drift_tolerance=1e-6):
         """
         :param base: base robot name,should include 00 at the end
         :param rows: number of rows for the robotic grid
         :param cols: number of columns for the robotic grid
         :param spacing: spacing to create the robots with
+        :param reconcile_every: compare the local joint target mirror with the simulator every this many
+                                get_all_velocities calls (0 disables periodic reconciliation)
+        :param drift_tolerance: difference between mirror and simulator reported as drift
         """
         self.base_name = base.split('0_0')[0].split('/')[1]
         print(f'Robot Name:{self.base_name}')
@@ -66,13 +195,22 @@ class Robot_Swarm:
         self.left_dummy = left_dummy
         self.swarm = None
         self.wheel_size = None      # Wheel Diameter
+        self.overlay = None         # Speed labels, created on the first move with draw_text
+        self.handles = {}           # Object path -> handle cache
+        self.joint_targets = [[None for _ in range(cols)] for _ in range(rows)]  # Mirror of commanded speeds
+        self.reconcile_every = reconcile_every
+        self.drift_tolerance = drift_tolerance
+        self.reads = 0
+        self.drift = []             # (i, j, mirrored, actual) found by the last reconciliation
 
     def figure_wheel_size(self):
         wheel_handle = sim.getObject(f'{self.base_name}0_0/Turn_joint/Speed_joint/Wheel')
         self.wheel_size = sim.getShapeGeomInfo(wheel_handle)[2][0]  # Get the x dimension of the wheel shape (wheel diameter)
 
-    def create_swarm(self):
-        """Creates the swarm with the given params on init"""
+    def create_swarm(self, bulk=True):
+        """Creates the swarm with the given params on init
+        :param bulk: build with batched copies and script-side setup instead of per-robot RPCs
+        """
         self.swarm = sim.getObject('/Swarm', {'noError': True})
         #  No Swarm
         if self.swarm < 0:
@@ -80,12 +218,20 @@ class Robot_Swarm:
             self.swarm = sim.createDummy(0.01)
             sim.setObjectAlias(self.swarm, 'Swarm')
             sim.setObjectParent(self.base, self.swarm, True)
+        elif bulk:
+            self.bulk_cull()
         else:
             self.cull()
 
         self.base_name = f'/Swarm/{self.base_name}'
-        self.duplicate()
-        self.link()
+        self.handles = {}
+        self.joint_targets = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        if bulk:
+            self.bulk_duplicate()
+            self.bulk_link()
+        else:
+            self.duplicate()
+            self.link()
         self.calc_distance_center()
         self.figure_wheel_size()
 
@@ -140,6 +286,112 @@ class Robot_Swarm:
 
         print("Done creating robot swarm.")
 
+    @staticmethod
+    def run_script(code):
+        """Execute a Lua snippet inside the simulator in a single RPC"""
+        return sim.executeScriptString(code, sim.scripttype_sandboxscript)
+
+    @staticmethod
+    def lua_literal(value):
+        """Format numbers, strings and (nested) lists as a Lua literal"""
+        if isinstance(value, (list, tuple)):
+            return '{' + ','.join(Robot_Swarm.lua_literal(v) for v in value) + '}'
+        if isinstance(value, str):
+            return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        return repr(value)
+
+    def bulk_cull(self):
+        """Remove every robot in the swarm except the original with one script-side call"""
+        code = f"""
+local swarm = {self.swarm}
+local keep = {self.lua_literal(f'{self.base_name}0_0')}
+local index = 0
+local robot = sim.getObjectChild(swarm, index)
+while robot ~= -1 do
+    if sim.getObjectAlias(robot) ~= keep then
+        sim.removeModel(robot)
+    else
+        index = index + 1
+    end
+    robot = sim.getObjectChild(swarm, index)
+end
+"""
+        try:
+            self.run_script(code)
+        except Exception as e:
+            print(f'Bulk cull failed ({e}), culling one robot at a time')
+            self.cull()
+            return
+        print('Done Culling')
+
+    def bulk_duplicate(self):
+        """Duplicates the base robot in exponentially growing batches (log2(n) copy RPCs),
+        then parents, positions and renames every copy with one script-side call"""
+        slots = [(i, j) for i in range(self.rows) for j in range(self.cols) if (i, j) != (0, 0)]
+        if not slots:
+            return
+        try:
+            handles = [self.base]
+            while len(handles) < len(slots) + 1:
+                batch = handles[:len(slots) + 1 - len(handles)]
+                handles += list(sim.copyPasteObjects(batch, 1))
+        except Exception as e:
+            print(f'Bulk copy failed ({e}), duplicating one robot at a time')
+            for handle in handles[1:]:  # Copies pasted before the failure
+                sim.removeModel(handle)
+            self.duplicate()
+            return
+
+        copies = handles[1:]
+        base_alias = self.base_name.split("/Swarm/")[1]
+        poses = [[j * self.spacing, i * self.spacing, 0.05] for i, j in slots]
+        aliases = [f'{base_alias}{i}_{j}' for i, j in slots]
+        code = f"""
+local swarm = {self.swarm}
+local handles = {self.lua_literal(copies)}
+local poses = {self.lua_literal(poses)}
+local aliases = {self.lua_literal(aliases)}
+for k = 1, #handles do
+    sim.setObjectParent(handles[k], swarm, true)
+    sim.setObjectPosition(handles[k], -1, poses[k])
+    sim.setObjectAlias(handles[k], aliases[k])
+end
+"""
+        try:
+            self.run_script(code)
+        except Exception as e:
+            print(f'Bulk setup failed ({e}), placing robots one at a time')
+            for handle, pose, alias in zip(copies, poses, aliases):
+                sim.setObjectParent(handle, self.swarm, True)
+                sim.setObjectPosition(handle, -1, pose)
+                sim.setObjectAlias(handle, alias)
+        print("Done creating robot swarm.")
+
+    def bulk_link(self):
+        """Links all the swarm robots together via the dummies with one script-side call"""
+        code = f"""
+local base = {self.lua_literal(self.base_name)}
+local rows, cols = {self.rows}, {self.cols}
+local front, back = {self.lua_literal(self.front_dummy)}, {self.lua_literal(self.back_dummy)}
+local left, right = {self.lua_literal(self.left_dummy)}, {self.lua_literal(self.right_dummy)}
+for i = 0, rows - 1 do
+    for j = 0, cols - 1 do
+        local robot = base .. i .. '_' .. j
+        if i ~= 0 then
+            sim.setLinkDummy(sim.getObject(robot .. '/' .. right), sim.getObject(base .. (i - 1) .. '_' .. j .. '/' .. left))
+        end
+        if j ~= 0 then
+            sim.setLinkDummy(sim.getObject(robot .. '/' .. back), sim.getObject(base .. i .. '_' .. (j - 1) .. '/' .. front))
+        end
+    end
+end
+"""
+        try:
+            self.run_script(code)
+        except Exception as e:
+            print(f'Bulk link failed ({e}), linking one robot at a time')
+            self.link()
+
     def link(self):
         """Links all the swarm robots together via the dummies"""
         for i in range(self.rows):
@@ -157,57 +409,40 @@ class Robot_Swarm:
         """
         :param forward: Forward motion speed (meters/second)
         :param right: Right turn speed (degrees/second)
-        :param draw_text: Boolean flag,whether to draw the text onto the robot(Very time-consuming!)
+        :param draw_text: Boolean flag,whether to draw the speed labels onto the robots
+                          (rate limited and only regenerated when a value changes)
         """
-        if draw_text:
-            sim.pauseSimulation()
         forward_speed_wheel = forward / (self.wheel_size / 2)   # Forward speed by wheel size
         mat = []
         for i in range(self.rows):
             temp = []
             for j in range(self.cols):
-                speed_joint = sim.getObject(f'{self.base_name}{i}_{j}/Turn_joint/Speed_joint')
-                turn_joint = sim.getObject(f'{self.base_name}{i}_{j}/Turn_joint')
+                speed_joint = self.get_handle(f'{self.base_name}{i}_{j}/Turn_joint/Speed_joint')
+                turn_joint = self.get_handle(f'{self.base_name}{i}_{j}/Turn_joint')
 
                 # Stop turn joints for now
                 sim.setJointInterval(turn_joint, False, [0.0, 0.0])
 
                 turn_speed = right * self.distances[i][j]
                 sim.setJointTargetVelocity(speed_joint, forward_speed_wheel + turn_speed)
+                self.joint_targets[i][j] = forward_speed_wheel + turn_speed
                 temp.append(forward_speed_wheel + turn_speed)
 
-                if draw_text:
-
-                    parent = sim.getObject(f'{self.base_name}{i}_{j}')
-                    index = 0
-                    obj = sim.getObjectChild(parent, index)
-                    while obj != -1:
-                        if sim.getProperty(obj, 'dummyType', {'noError': True}) == 8:
-                            obj2 = sim.getObjectChild(obj, 0)
-                            sim.removeObject(obj2)
-                            sim.removeObject(obj)
-                        else:
-                            index += 1
-
-                        obj = sim.getObjectChild(parent, index)
-
-                    joint_speed = sim.getJointTargetVelocity(speed_joint)
-
-                    # Create a 3D text shape
-                    textShapeHandle = sim.generateTextShape(f'{"minus" if joint_speed < 0 else ""}{joint_speed:.2f}', [1, 1, 1], 0.01, True)
-
-                    # Parent the shape to the robot
-                    sim.setObjectParent(textShapeHandle, parent, True)
-
-                    # Position the text shape a bit above the robot
-                    sim.setObjectPosition(textShapeHandle, parent, [0, 0, 0.026])
-
-                    # Rotate the text 90° around the X axis relative to 'parent'
-                    sim.setObjectOrientation(textShapeHandle, parent, [0, 0, 0])
             mat.append(temp)
         # print(self.normalize_2d_list(mat))
+        if draw_text:
+            if self.overlay is None:
+                self.overlay = SpeedOverlay(self)
+            self.overlay.update(mat)
+        elif self.overlay is not None:
+            self.overlay.clear()
         sim.startSimulation()
 
+    @staticmethod
+    def stats():
+        """Per-RPC timing histograms (count, total, mean, p50, p99, max in seconds)"""
+        return profiler.stats()
+
     @staticmethod
     def normalize_2d_list(matrix):
         # Flatten the matrix to find global min and max
@@ -226,32 +461,29 @@ class Robot_Swarm:
         """Calculates the self.distances matrix
             each element inside self.distances is a factor of distance from center, directionality(left and right) and the column distance to center
         """
-        robot_size = 0.1  # 0.1 x 0.1
-        center = (self.rows * robot_size / 2, self.cols * robot_size / 2)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                robot_center = (i * robot_size + robot_size / 2, j * robot_size + robot_size / 2)
+        self.distances = distance_matrix(self.rows, self.cols).tolist()
 
-                distance_to_center = dist(center, robot_center)
+    def get_handle(self, path):
+        """Resolve an object path once and serve it from the cache afterwards"""
+        handle = self.handles.get(path)
+        if handle is None:
+            handle = sim.getObject(path)
+            self.handles[path] = handle
+        return handle
 
-                if center[0] - robot_center[0] == 0:
-                    direction = 0
-                else:
-                    direction = 1
-
-                # column_distance_to_center = abs((i + 0.5) * robot_size - center[0])
-                product = 1 / cos(atan2(robot_center[1] - center[1], robot_center[0] - center[0]))
-                self.distances[i][j] = (distance_to_center
-                                        * direction
-                                        * product
-                                        # * column_distance_to_center
-                                        )
+    def speed_joint(self, i, j):
+        return self.get_handle(f'{self.base_name}{i}_{j}/Turn_joint/Speed_joint')
 
     def get_robot_velocity(self, i, j):
-        speed_joint = sim.getObject(f'{self.base_name}{i}_{j}/Turn_joint/Speed_joint')
-        return sim.getJointTargetVelocity(speed_joint)
+        """Commanded joint target velocity, served from the local mirror once known"""
+        if self.joint_targets[i][j] is None:
+            self.joint_targets[i][j] = sim.getJointTargetVelocity(self.speed_joint(i, j))
+        return self.joint_targets[i][j]
 
     def get_all_velocities(self):
+        self.reads += 1
+        if self.reconcile_every and self.reads % self.reconcile_every == 0:
+            self.reconcile()
         vel_mat = []
         for i in range(self.rows):
             temp = []
@@ -260,16 +492,32 @@ class Robot_Swarm:
             vel_mat.append(temp)
         return vel_mat
 
+    def reconcile(self):
+        """
+        Read every joint target back from the simulator and resync the mirror
+        :return: list of (i, j, mirrored, actual) entries that drifted beyond drift_tolerance
+        """
+        self.drift = []
+        for i in range(self.rows):
+            for j in range(self.cols):
+                actual = sim.getJointTargetVelocity(self.speed_joint(i, j))
+                mirrored = self.joint_targets[i][j]
+                if mirrored is not None and abs(actual - mirrored) > self.drift_tolerance:
+                    self.drift.append((i, j, mirrored, actual))
+                self.joint_targets[i][j] = actual
+        if self.drift:
+            print(f'[WARNING] Joint target drift on {len(self.drift)} robots: {self.drift}')
+        return self.drift
+
     def set_robot_velocity(self, i, j, velocity):
-        speed_joint = sim.getObject(f'{self.base_name}{i}_{j}/Turn_joint/Speed_joint')
-        sim.setJointTargetVelocity(speed_joint, velocity)
+        sim.setJointTargetVelocity(self.speed_joint(i, j), velocity)
+        self.joint_targets[i][j] = velocity
 
     def set_all_velocities(self, vel_mat):
         for i in range(self.rows):
             for j in range(self.cols):
                 self.set_robot_velocity(i, j, vel_mat[i][j])
 
-
 if __name__ == '__main__':
     swarm = Robot_Swarm('/Robot0_0', 3, 3, 0.12)
     sim.stopSimulation()
@@ -297,6 +545,8 @@ if __name__ == '__main__':
             #     sim.pauseSimulation()
             #     break
             # print(f'Simulation time: {t:.2f} [s]')
+            if swarm.overlay is not None:
+                swarm.overlay.flush()   # Last label change of a slider burst
             sim.step()
     except:
         simUI.destroy(str(window_handle))
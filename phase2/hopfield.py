@@ -2,11 +2,23 @@ import random
 import time
 
 import numpy as np
-from math import dist, cos, atan2
+
+from api.core.profiling import StageProfiler
+from api.core.checkpoint import write_checkpoint, read_checkpoint
+from phase2.pattern_generator import PatternGenerator, encode_array, normalize
 
 
 class Hopfield:
     def __init__(self, rows, columns, wheel_size, bit_size):
+        self._init_runtime(rows, columns, wheel_size, bit_size)
+        self.init_patterns()
+
+        self.neurons = np.random.uniform(-1, 1, len(self.patterns[0]))  # Neuron for each robot
+        self.weights = self.train_hopfield_network()
+        # print(self.weights)
+
+    def _init_runtime(self, rows, columns, wheel_size, bit_size):
+        """Settings, profiler and pattern generator; shared by __init__ and restore"""
         self.bit_size = bit_size                        # Bit size determines max speed variance
         self.max_num = 2 ** (self.bit_size - 1) - 1
 
@@ -15,40 +27,12 @@ class Hopfield:
         self.wheel_size = wheel_size
         self.distances = [[() for _ in range(self.cols)] for _ in range(self.rows)]
         self.patterns = []
-        self.init_patterns()
-
-        self.neurons = np.random.uniform(-1, 1, len(self.patterns[0]))  # Neuron for each robot
-        self.weights = self.train_hopfield_network()
-        # print(self.weights)
-
-    def __calc_distance_center(self):
-        """Calculates the self.distances matrix
-            each element inside self.distances is a factor of distance from center, directionality(left and right) and the column distance to center
-        """
-        robot_size = 0.1  # 0.1 x 0.1
-        center = (self.rows * robot_size / 2, self.cols * robot_size / 2)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                robot_center = (i * robot_size + robot_size / 2, j * robot_size + robot_size / 2)
-
-                distance_to_center = dist(center, robot_center)
-
-                if center[0] - robot_center[0] == 0:
-                    direction = 0
-                else:
-                    direction = 1
-
-                # column_distance_to_center = abs((i + 0.5) * robot_size - center[0])
-                product = 1 / cos(atan2(robot_center[1] - center[1], robot_center[0] - center[0]))
-                self.distances[i][j] = (distance_to_center
-                                        * direction
-                                        * product
-                                        # * column_distance_to_center
-                                        )
+        self.profiler = StageProfiler()
+        self.generator = PatternGenerator(rows, columns, wheel_size, bit_size)
 
     def init_patterns(self):
         self.patterns = []
-        self.__calc_distance_center()
+        self.distances = self.generator.distances
         # self.__calculate_pattern(1, 0)  # Forward
         # self.__calculate_pattern(-1, 0)  # Backward
         self.__calculate_pattern(0, 1)  # Right
@@ -64,55 +48,38 @@ class Hopfield:
         :param forward: Forward motion speed (meters/second)
         :param right: Right turn speed (degrees/second)
         """
-        forward_speed_wheel = forward / (self.wheel_size / 2)  # Forward speed by wheel size
-        mat = []
-        for i in range(self.rows):
-            temp = []
-            for j in range(self.cols):
-                turn_speed = right * self.distances[i][j]
-                temp.append(forward_speed_wheel + turn_speed)
-            mat.append(temp)
-        self.patterns.append(self.norm_and_flatten_mat(mat))
+        self.patterns.append(self.generator.pattern(forward, right).tolist())
         print(self.patterns)
 
+    def set_command(self, forward, right):
+        """
+        Steer towards an arbitrary command without rebuilding the network:
+        the encoded pattern and its weights come from the generator's LRU cache.
+        :param forward: Forward motion speed (meters/second)
+        :param right: Right turn speed (degrees/second)
+        """
+        encoded, weights = self.generator.encoded(forward, right)
+        self.patterns = [encoded.tolist()]
+        self.weights = weights
+        self._field = None
+
     @staticmethod
     def norm_and_flatten_mat(mat):
         """
         :param mat: a 2d list to normalize
         :return: norm_flat_mat: normalized flattened(into 1D) list
         """
-        # Flatten the matrix to find global min and max
-        flat_list = [abs(item) for row in mat for item in row]
-        max_val = max(flat_list)
-        min_val = 0
-        flat_list = [item for row in mat for item in row]
-        # Define normalization function
-        normalize = lambda x: (x - min_val) / (max_val - min_val) if max_val != min_val else 0
-
-        # Apply normalization using map
-        norm_flat_mat = list(map(normalize, flat_list))
+        norm_flat_mat = normalize(mat).tolist()
 
         return norm_flat_mat
 
     def encode_pattern(self, pattern):
-        encoded_pattern = []
-        # print(pattern)
-        for number in pattern:
-            encoded_number = []
-            number = round(number * self.max_num)  # "Normalize" to the bit scale
-            num = format(number, f'0{self.bit_size - 1}b')  # Format the number into a binary string representation
-            # print(number)
-            # print(num)
-            encoded_number += [-1] if num[0] == '-' else [1]  # Parity bit
-
-            for _ in range(self.bit_size - 1 - len(num) - 1 * encoded_number[0] == 1):  # Padding with -1
-                encoded_number += [-1]
-
-            for digit in num[encoded_number[0] == -1:]:
-                encoded_number += [-1] if digit == '0' else [1]  # Add encoded bits
-
-            encoded_pattern += encoded_number
-        return encoded_pattern
+        """
+        :param pattern: normalized speeds in [-1, 1]
+        :return: per robot a sign bit followed by the magnitude bits, as -1/1
+        """
+        with self.profiler.stage('encode'):
+            return encode_array(pattern, self.bit_size).tolist()
 
     def encode_patterns(self):
         for i in range(len(self.patterns)):
@@ -120,26 +87,59 @@ class Hopfield:
 
     def train_hopfield_network(self):
         """Train the Hopfield network using Hebbian learning rule."""
-        pattern_size = len(self.patterns[0])
-        weights = np.zeros((pattern_size, pattern_size))
-
-        for pattern in self.patterns:
-            outer = np.outer(pattern, pattern)
-            weights += outer
+        patterns = np.array(self.patterns, dtype=np.float64)
+        weights = patterns.T @ patterns
 
         np.fill_diagonal(weights, 0)
         return weights / len(self.patterns)
 
+    @property
+    def neurons(self):
+        """Read-only view of the state; assign a new array to change it so the field stays in sync"""
+        view = self._neurons.view()
+        view.setflags(write=False)
+        return view
+
+    @neurons.setter
+    def neurons(self, value):
+        self._neurons = np.array(value)
+        self._field = None  # Local field W·s, rebuilt on the next update
+
+    @property
+    def field(self):
+        """Local field W·neurons, maintained incrementally by update()"""
+        if self._field is None:
+            self._field = self.weights @ self._neurons
+        return self._field
+
+    def unstable_blocks(self):
+        """Start indices of robot blocks containing a neuron that would change on update"""
+        target = np.clip(self.field, -1, 1).astype(self._neurons.dtype)
+        changed = (target != self._neurons).reshape(-1, self.bit_size).any(axis=1)
+        return np.flatnonzero(changed) * self.bit_size
+
     def update(self):
-        pick = random.randint(0, len(self.patterns[0]) / self.bit_size - 1)  # Pick random neuron to update
-        pick = pick * self.bit_size                                         # Start of the robot block
+        """
+        Update one randomly picked robot block among those that are still unstable.
 
-        for neuron in range(pick, pick + self.bit_size):
-            weight = self.weights[neuron]
-            val = np.dot(self.neurons, weight)
-            val = min(val, 1)
-            val = max(val, -1)
-            self.neurons[neuron] = val
+        :return: False when no unstable neurons remain, True otherwise
+        """
+        with self.profiler.stage('update'):
+            blocks = self.unstable_blocks()
+            if len(blocks) == 0:
+                return False
+            pick = blocks[random.randint(0, len(blocks) - 1)]      # Start of the robot block
+
+            field = self.field
+            for neuron in range(pick, pick + self.bit_size):
+                val = min(field[neuron], 1)
+                val = max(val, -1)
+                old = self._neurons[neuron]
+                self._neurons[neuron] = val
+                delta = self._neurons[neuron] - old
+                if delta:
+                    field += self.weights[neuron] * delta       # Weights are symmetric: row == column
+            return True
 
     def decode(self, r, c):
         """
@@ -165,13 +165,36 @@ class Hopfield:
         return num
 
     def get_speed_mat(self):
-        mat = []
-        for i in range(self.rows):
-            temp = []
-            for j in range(self.cols):
-                temp.append(self.to_int(i, j))
-            mat.append(temp)
-        return mat
+        with self.profiler.stage('decode'):
+            mat = []
+            for i in range(self.rows):
+                temp = []
+                for j in range(self.cols):
+                    temp.append(self.to_int(i, j))
+                mat.append(temp)
+            return mat
+
+    def stats(self):
+        """Per-stage timing histograms for encode, update and decode"""
+        return self.profiler.stats()
+
+    def checkpoint(self, path):
+        """Save neuron state, patterns and weights to a memory-mappable checkpoint"""
+        meta = {'rows': self.rows, 'cols': self.cols, 'wheel_size': self.wheel_size, 'bit_size': self.bit_size}
+        arrays = {'neurons': self._neurons, 'weights': self.weights, 'patterns': np.array(self.patterns)}
+        write_checkpoint(path, type(self).__name__, meta, arrays)
+
+    @classmethod
+    def restore(cls, path, mode='c'):
+        """Warm-start from checkpoint() without regenerating patterns or retraining"""
+        meta, arrays = read_checkpoint(path, mode, kind=cls.__name__)
+        hop = cls.__new__(cls)
+        hop._init_runtime(meta['rows'], meta['cols'], meta['wheel_size'], meta['bit_size'])
+        hop.distances = hop.generator.distances
+        hop.patterns = arrays['patterns'].tolist()
+        hop.weights = arrays['weights']
+        hop.neurons = arrays['neurons']  # Copied by the setter: small and updated in place
+        return hop
 
     def get_pattern_speed(self, index):
         temp = []
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from phase1.geometry import distance_matrix
+
+
+def encode_array(values, bit_size):
+    """
+    Vectorized form of Hopfield.encode_pattern.
+    :param values: normalized speeds in [-1, 1]
+    :param bit_size: bits per robot, the first one is the sign
+    :return: (len(values) * bit_size,) array of -1/1, per robot the sign bit followed by the magnitude bits (MSB first)
+    """
+    max_num = 2 ** (bit_size - 1) - 1
+    numbers = np.clip(np.round(np.asarray(values, dtype=np.float64) * max_num), -max_num, max_num)
+    magnitude = np.abs(numbers).astype(np.int64)
+    shifts = np.arange(bit_size - 2, -1, -1)
+    bits = (magnitude[:, None] >> shifts) & 1
+    sign = np.where(numbers < 0, -1, 1)[:, None]
+    return np.hstack([sign, bits * 2 - 1]).ravel()
+
+
+def normalize(mat):
+    """Vectorized Hopfield.norm_and_flatten_mat: divide by the largest absolute value and flatten"""
+    flat = np.asarray(mat, dtype=np.float64).ravel()
+    max_val = np.max(np.abs(flat))
+    return flat / max_val if max_val != 0 else np.zeros_like(flat)
+
+
+class PatternGenerator:
+    def __init__(self, rows, cols, wheel_size, bit_size, quantum=0.01, cache_size=128):
+        """
+        Encoded speed patterns for arbitrary (forward, right) commands.
+        The distance matrix is computed once; every command's speeds are the linear
+        combination forward * 2 / wheel_size + right * distances, so a steering
+        change costs one vectorized evaluation, and recent commands come from an LRU cache.
+        :param rows: number of rows for the robotic grid
+        :param cols: number of columns for the robotic grid
+        :param wheel_size: wheel diameter
+        :param bit_size: bits per robot in the encoded pattern
+        :param quantum: commands are rounded to multiples of this before caching
+        :param cache_size: number of commands kept in the LRU cache
+        """
+        self.rows = rows
+        self.cols = cols
+        self.wheel_size = wheel_size
+        self.bit_size = bit_size
+        self.quantum = quantum
+        self.cache_size = cache_size
+        self.distances = distance_matrix(rows, cols)
+        self.cache = OrderedDict()  # quantized command -> (encoded pattern, weights)
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, forward, right):
+        return round(forward / self.quantum), round(right / self.quantum)
+
+    def speeds(self, forward, right):
+        """Unnormalized wheel speed matrix for a command"""
+        forward_speed_wheel = forward / (self.wheel_size / 2)  # Forward speed by wheel size
+        return forward_speed_wheel + right * self.distances
+
+    def pattern(self, forward, right):
+        """Normalized, flattened speeds for a command"""
+        return normalize(self.speeds(forward, right))
+
+    def encoded(self, forward, right):
+        """
+        :return: (encoded pattern, trained weights) for the quantized command, from the cache when possible
+        """
+        key = self.quantize(forward, right)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        encoded = encode_array(self.pattern(key[0] * self.quantum, key[1] * self.quantum), self.bit_size)
+        weights = np.outer(encoded, encoded).astype(np.float64)
+        np.fill_diagonal(weights, 0)
+        encoded.setflags(write=False)
+        weights.setflags(write=False)
+
+        self.cache[key] = (encoded, weights)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return encoded, weights
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import sys
+from math import dist, cos, atan2
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from phase1.geometry import distance_matrix
+from phase2.hopfield import Hopfield
+from phase2.pattern_generator import PatternGenerator, encode_array
+
+def loop_distances(rows, cols, robot_size=0.1):
+    center = (rows * robot_size / 2, cols * robot_size / 2)
+    out = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            robot_center = (i * robot_size + robot_size / 2, j * robot_size + robot_size / 2)
+            direction = 0 if center[0] - robot_center[0] == 0 else 1
+            product = 1 / cos(atan2(robot_center[1] - center[1], robot_center[0] - center[0]))
+            row.append(dist(center, robot_center) * direction * product)
+        out.append(row)
+    return out
+
+def string_encode(values, bit_size):
+    max_num = 2 ** (bit_size - 1) - 1
+    out = []
+    for value in values:
+        number = round(value * max_num)
+        bits = ('1' if number >= 0 else '0') + format(abs(number), f'0{bit_size - 1}b')
+        out += [1 if b == '1' else -1 for b in bits]
+    return out
+
+@pytest.mark.parametrize('rows,cols', [(1, 1), (3, 3), (4, 7)])
+def test_distance_matrix_matches_loop(rows, cols):
+    np.testing.assert_allclose(distance_matrix(rows, cols), loop_distances(rows, cols), atol=1e-12)
+
+def test_encode_array_matches_string_encoding():
+    values = np.linspace(-1, 1, 41)
+    for bit_size in (2, 4, 6):
+        assert encode_array(values, bit_size).tolist() == string_encode(values, bit_size)
+
+def test_generator_cache_and_read_only_weights():
+    gen = PatternGenerator(3, 3, 0.05, 4, cache_size=2)
+    encoded, weights = gen.encoded(0.1, 1)
+    assert gen.encoded(0.1001, 1)[0] is encoded         # Same quantized command
+    assert (gen.hits, gen.misses) == (1, 1)
+    assert np.all(np.diag(weights) == 0)
+    with pytest.raises(ValueError):
+        weights[0, 1] = 0
+    gen.encoded(0.2, 1)
+    gen.encoded(0.3, 1)
+    assert len(gen.cache) == 2 and gen.quantize(0.1, 1) not in gen.cache
+
+def test_set_command_matches_rebuilt_network():
+    hop = Hopfield(3, 3, 0.05, 4)
+    initial = hop.patterns[0]
+    np.testing.assert_array_equal(hop.weights, hop.generator.encoded(0, 1)[1])
+    assert initial == hop.generator.encoded(0, 1)[0].tolist()
+
+    hop.set_command(0.02, 0.5)
+    expected = encode_array(hop.generator.pattern(0.02, 0.5), 4)
+    assert hop.patterns[0] == expected.tolist()
+    np.testing.assert_array_equal(hop.field, hop.weights @ hop.neurons)
+
+def test_neurons_view_is_read_only():
+    hop = Hopfield(3, 3, 0.05, 4)
+    with pytest.raises(ValueError):
+        hop.neurons[0] = 1
+    state = -np.ones(len(hop.neurons))
+    hop.neurons = state
+    state[0] = 1                                # The network keeps its own copy
+    np.testing.assert_array_equal(hop.field, hop.weights @ -np.ones(len(state)))